@@ -11,6 +11,8 @@ from sklearn.cluster import DBSCAN
 from sklearn.preprocessing import StandardScaler
 import colorsys
 
+from .color_engine import COLOR_RANGES, get_frame_color_map
+
 class AdvancedVideoMetadataAnalyzer:
     """고급 비디오 메타데이터 분석기 - 날씨, 시간대, 장소 등 분석"""
     
@@ -213,19 +215,7 @@ class PersonAttributeAnalyzer:
     """사람 속성 분석기 - 성별, 나이, 의상 색상 등"""
     
     def __init__(self):
-        self.color_ranges = {
-            'red': [(0, 70, 50), (10, 255, 255), (170, 70, 50), (180, 255, 255)],
-            'orange': [(11, 70, 50), (25, 255, 255)],
-            'yellow': [(26, 70, 50), (35, 255, 255)],
-            'green': [(36, 70, 50), (85, 255, 255)],
-            'blue': [(86, 70, 50), (125, 255, 255)],
-            'purple': [(126, 70, 50), (155, 255, 255)],
-            'pink': [(156, 70, 50), (169, 255, 255)],
-            'white': [(0, 0, 200), (180, 25, 255)],
-            'black': [(0, 0, 0), (180, 255, 50)],
-            'gray': [(0, 0, 51), (180, 25, 199)],
-            'brown': [(8, 60, 20), (20, 255, 200)]
-        }
+        self.color_ranges = COLOR_RANGES
     
     def analyze_person_attributes(self, frame, person_bbox):
         """사람 속성 분석"""
@@ -243,16 +233,16 @@ class PersonAttributeAnalyzer:
             if person_roi.size == 0:
                 return self._get_default_attributes()
             
-            # 상하체 분리 (상체 60%, 하체 40%)
-            person_height = y2 - y1
-            upper_body = person_roi[:int(person_height * 0.6), :]
-            lower_body = person_roi[int(person_height * 0.6):, :]
-            
-            # 상의 색상 분석
-            upper_color = self._analyze_dominant_clothing_color(upper_body)
+            # 상하체 분리 (상체 60%, 하체 40%) - 프레임 색상 맵(객체 색상 분석과 공유)에서 두 영역을 한 번에 집계
+            split_y = person_bbox[1] + (person_bbox[3] - person_bbox[1]) * 0.6
+            upper_scores, lower_scores = get_frame_color_map(frame).color_percentages([
+                [person_bbox[0], person_bbox[1], person_bbox[2], split_y],
+                [person_bbox[0], split_y, person_bbox[2], person_bbox[3]]
+            ])
             
-            # 하의 색상 분석  
-            lower_color = self._analyze_dominant_clothing_color(lower_body)
+            # 상의/하의 색상
+            upper_color = self._dominant_clothing_color(upper_scores)
+            lower_color = self._dominant_clothing_color(lower_scores)
             
             # 성별 추정 (휴리스틱 기반)
             gender_estimation = self._estimate_gender(person_roi, person_bbox)
@@ -281,32 +271,23 @@ class PersonAttributeAnalyzer:
             return self._get_default_attributes()
     
     def _analyze_dominant_clothing_color(self, clothing_roi):
-        """의상 주요 색상 분석"""
+        """의상 주요 색상 분석 (ROI 이미지 단독 입력)"""
         if clothing_roi.size == 0:
             return {'color': 'unknown', 'confidence': 0.0}
         
         try:
-            # 이미지 크기 조정
-            if clothing_roi.shape[0] > 100 or clothing_roi.shape[1] > 100:
-                clothing_roi = cv2.resize(clothing_roi, (100, 100))
-            
-            hsv = cv2.cvtColor(clothing_roi, cv2.COLOR_BGR2HSV)
-            
-            color_scores = {}
-            
-            for color_name, ranges in self.color_ranges.items():
-                mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
-                
-                if len(ranges) == 4:  # red의 경우
-                    mask1 = cv2.inRange(hsv, np.array(ranges[0]), np.array(ranges[1]))
-                    mask2 = cv2.inRange(hsv, np.array(ranges[2]), np.array(ranges[3]))
-                    mask = cv2.bitwise_or(mask1, mask2)
-                else:
-                    mask = cv2.inRange(hsv, np.array(ranges[0]), np.array(ranges[1]))
-                
-                percentage = (np.sum(mask > 0) / (hsv.shape[0] * hsv.shape[1])) * 100
-                color_scores[color_name] = percentage
-            
+            color_scores = get_frame_color_map(clothing_roi).color_percentages([[0.0, 0.0, 1.0, 1.0]])[0]
+            return self._dominant_clothing_color(color_scores)
+        except Exception as e:
+            print(f"⚠️ 의상 색상 분석 오류: {e}")
+            return {'color': 'unknown', 'confidence': 0.0}
+    
+    def _dominant_clothing_color(self, color_scores):
+        """색상별 비율(%) → 의상 주요 색상"""
+        if not color_scores:
+            return {'color': 'unknown', 'confidence': 0.0}
+        
+        try:
             # 가장 높은 점수의 색상 선택
             dominant_color = max(color_scores, key=color_scores.get)
             confidence = color_scores[dominant_color] / 100.0
@@ -445,15 +426,20 @@ class TemporalAnalyzer:
         self.temporal_data = defaultdict(list)  # 시간별 데이터
         
     def analyze_temporal_statistics(self, video_analysis_data, start_time_sec, end_time_sec):
-        """특정 시간 구간의 통계 분석"""
+        """특정 시간 구간의 통계 분석
+        
+        video_analysis_data: 분석 결과 dict 또는 analysis_cache.CachedAnalysis
+        (캐시 항목이면 공유 시간 인덱스로 구간 프레임을 바로 찾음)
+        """
         try:
             # 해당 시간 구간의 프레임들 필터링
-            relevant_frames = []
-            
-            for frame_data in video_analysis_data.get('frame_results', []):
-                timestamp = frame_data.get('timestamp', 0)
-                if start_time_sec <= timestamp <= end_time_sec:
-                    relevant_frames.append(frame_data)
+            if hasattr(video_analysis_data, 'frames_between'):
+                relevant_frames = video_analysis_data.frames_between(start_time_sec, end_time_sec)
+            else:
+                relevant_frames = [
+                    frame_data for frame_data in video_analysis_data.get('frame_results', [])
+                    if start_time_sec <= frame_data.get('timestamp', 0) <= end_time_sec
+                ]
             
             if not relevant_frames:
                 return {
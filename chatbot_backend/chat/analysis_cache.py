@@ -0,0 +1,189 @@
+# chat/analysis_cache.py - 채팅용 분석 결과 프로세스 캐시 (경로 + 수정시각 키, 메모리 상한 LRU)
+"""
+비디오 채팅(EnhancedVideoChatView)은 메시지마다 비디오의 Frame 행을 읽어 각 행의 JSON 컬럼을 다시
+파싱하며 객체/시간 범위를 훑었고, 저장된 일부 프레임만 볼 수 있었습니다.
+
+여기서는 분석 결과 파일(샘플링된 모든 프레임)을 파싱한 결과를 (절대 경로, 수정시각, 크기) 키로
+프로세스 안에 보관하고, 파생 뷰(시간순 인덱스, 객체 개수, 클래스별 프레임, 사람 트랙)는 처음
+요청될 때 한 번만 계산합니다.
+파일이 다시 저장되면 수정시각이 달라져 자동으로 새로 읽고, 분석 리셋/재시작 시에는 invalidate()로
+명시적으로 제거합니다. 캐시된 results는 여러 요청이 공유하므로 호출 측에서 수정하면 안 됩니다.
+"""
+import os
+import logging
+import threading
+from collections import Counter, OrderedDict, defaultdict
+
+from .analysis_store import load_analysis_results
+from .time_index import TimeIndex
+
+logger = logging.getLogger(__name__)
+
+# 파싱된 파이썬 객체는 디스크 크기보다 큼 (dict/str 오버헤드, float 배열 → float 리스트)
+_PARSED_SIZE_FACTOR = 4
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+class CachedAnalysis:
+    """한 분석 결과 파일의 파싱 결과 + 지연 계산되는 파생 뷰 (읽기 전용으로 공유)"""
+
+    def __init__(self, path, results, size_bytes):
+        self.path = path
+        self.results = results
+        self.size_bytes = size_bytes
+        self._derived = {}
+        self._lock = threading.Lock()
+
+    @property
+    def frame_results(self):
+        return self.results.get('frame_results', []) or []
+
+    def derived(self, name, builder):
+        """파생 뷰 name을 builder(self)로 한 번만 계산하여 보관"""
+        with self._lock:
+            if name in self._derived:
+                return self._derived[name]
+        value = builder(self)
+        with self._lock:
+            return self._derived.setdefault(name, value)
+
+    # ---------- 시간순 인덱스 ----------
+    @property
+    def time_index(self):
+        return self.derived('time_index', lambda cached: TimeIndex(cached.frame_results))
+
+    def frames_between(self, start_time, end_time):
+        """timestamp가 [start_time, end_time] 안인 프레임 (시간순)"""
+        return self.time_index.between(start_time, end_time)
+
+    # ---------- 객체 뷰 ----------
+    def _build_object_views(self):
+        counts = Counter()
+        frames_by_class = defaultdict(list)
+        for row, frame_data in enumerate(self.frame_results):
+            classes = [obj.get('class', '') for obj in frame_data.get('objects') or []]
+            counts.update(classes)
+            for object_class in set(classes):
+                frames_by_class[object_class].append(row)
+        return counts, dict(frames_by_class)
+
+    @property
+    def object_counts(self):
+        """객체 클래스 → 전체 검출 수"""
+        return self.derived('object_views', CachedAnalysis._build_object_views)[0]
+
+    def frames_with_class(self, object_class):
+        """해당 클래스 객체가 검출된 프레임 목록"""
+        rows = self.derived('object_views', CachedAnalysis._build_object_views)[1].get(object_class, [])
+        return [self.frame_results[row] for row in rows]
+
+    def _build_person_tracks(self):
+        tracks = defaultdict(list)
+        for frame_data in self.frame_results:
+            for obj in frame_data.get('objects') or []:
+                if obj.get('class') == 'person' and obj.get('track_id') is not None:
+                    tracks[obj['track_id']].append({
+                        'frame_id': frame_data.get('image_id', 0),
+                        'timestamp': frame_data.get('timestamp', 0),
+                        'bbox': obj.get('bbox', []),
+                        'confidence': obj.get('confidence', 0)
+                    })
+        return dict(tracks)
+
+    @property
+    def person_tracks(self):
+        """track_id → 등장 목록 (frame_id, timestamp, bbox, confidence)"""
+        return self.derived('person_tracks', CachedAnalysis._build_person_tracks)
+
+
+class AnalysisDataCache:
+    """분석 결과 파일 LRU 캐시 (스레드 안전, 추정 메모리 상한)"""
+
+    def __init__(self, max_bytes=256 * 1024 * 1024, max_entries=16):
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # (경로, mtime_ns, 크기) -> CachedAnalysis
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, path):
+        """경로의 CachedAnalysis - 파일이 바뀌었으면 다시 읽음 (없는 파일은 FileNotFoundError)"""
+        path = os.path.abspath(path)
+        stat = os.stat(path)
+        key = (path, stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats['hits'] += 1
+                return entry
+            self.stats['misses'] += 1
+
+        # 파싱은 락 밖에서 (다른 파일 조회를 막지 않도록)
+        entry = CachedAnalysis(path, load_analysis_results(path), stat.st_size * _PARSED_SIZE_FACTOR)
+
+        with self._lock:
+            self._remove_path(path)  # 같은 경로의 이전 버전 제거
+            if entry.size_bytes <= self.max_bytes:
+                self._entries[key] = entry
+                self._total_bytes += entry.size_bytes
+                self._evict()
+            else:
+                logger.info(f"분석 결과가 캐시 상한보다 커서 보관하지 않음: {path} (~{entry.size_bytes // (1024 * 1024)}MB)")
+        return entry
+
+    def _remove_path(self, path):
+        """락을 잡은 상태에서 호출"""
+        for key in [key for key in self._entries if key[0] == path]:
+            self._total_bytes -= self._entries.pop(key).size_bytes
+
+    def _evict(self):
+        """락을 잡은 상태에서 호출 - 오래 사용하지 않은 항목부터 제거"""
+        while self._entries and (self._total_bytes > self.max_bytes or len(self._entries) > self.max_entries):
+            _, entry = self._entries.popitem(last=False)
+            self._total_bytes -= entry.size_bytes
+            self.stats['evictions'] += 1
+
+    def invalidate(self, *paths):
+        """분석 리셋/재시작 시 해당 파일 항목 제거"""
+        with self._lock:
+            for path in paths:
+                if path:
+                    self._remove_path(os.path.abspath(path))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                **self.stats,
+                'entries': len(self._entries),
+                'estimated_mb': round(self._total_bytes / (1024 * 1024), 1)
+            }
+
+
+_analysis_cache = None
+_analysis_cache_lock = threading.Lock()
+
+
+def get_analysis_cache():
+    """프로세스 전역 AnalysisDataCache (상한: ANALYSIS_CACHE_MAX_MB, ANALYSIS_CACHE_MAX_ENTRIES)"""
+    global _analysis_cache
+    with _analysis_cache_lock:
+        if _analysis_cache is None:
+            _analysis_cache = AnalysisDataCache(
+                max_bytes=_env_int('ANALYSIS_CACHE_MAX_MB', 256) * 1024 * 1024,
+                max_entries=_env_int('ANALYSIS_CACHE_MAX_ENTRIES', 16)
+            )
+        return _analysis_cache
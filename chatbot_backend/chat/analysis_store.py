@@ -0,0 +1,253 @@
+# chat/analysis_store.py - 분석 결과 컬럼형 저장소 (.npz + JSON 헤더)
+"""
+analyze_video_comprehensive 결과를 indent=2 JSON 하나로 저장하면 프레임마다 154개 float의
+visual_features, 포즈 랜드마크 배열, scene_analysis 전체가 텍스트로 들어가 수십 MB가 되고,
+읽는 쪽(채팅/다운로드/RAG)은 필요한 부분이 작아도 파일 전체를 파싱해야 했습니다.
+
+여기서는 하나의 .npz 파일에 다음을 저장합니다 (np.load는 멤버를 접근할 때만 읽음):
+    __header__                       : JSON 헤더 (형식/버전, 프레임 수, 컬럼 목록, 프레임 외 최상위 결과)
+    frame/image_id, frame/timestamp  : 타입 있는 숫자 컬럼 (시간 범위 선택에 사용)
+    num/<경로>/values, /offsets      : 프레임별 숫자 배열 (float32, 가변 길이) - 예: scene_analysis.visual_features
+    json/<키>/data, /offsets         : 나머지 프레임 키별 JSON (프레임별로 잘라서 필요한 행만 디코딩)
+
+읽기: load_analysis_results(path, columns=[...], start_time=, end_time=) - 기존 .json 파일도 같은 함수로 읽습니다.
+"""
+import os
+import json
+
+import numpy as np
+
+FORMAT_NAME = 'analysis-columnar'
+FORMAT_VERSION = 1
+
+# 프레임 결과 안에서 타입 있는 버퍼로 분리 저장할 숫자 배열 (점 표기 경로)
+NUMERIC_PATHS = ('scene_analysis.visual_features', 'scene_analysis.pose_features')
+_INDEX_COLUMNS = ('image_id', 'timestamp')
+_MISSING = object()  # 해당 프레임에 키가 없었음 (null 값과 구분)
+
+
+def _json_default(value):
+    """numpy 값 → 기본 타입, 그 외는 기존 JSON 저장과 같이 문자열"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, default=_json_default)
+
+
+def _pop_path(frame, path):
+    """frame에서 점 표기 경로 값을 꺼냄 (원본은 수정하지 않도록 상위 dict는 얕은 복사) → (frame, 값)"""
+    parent_key, key = path.split('.', 1)
+    parent = frame.get(parent_key)
+    if not isinstance(parent, dict) or key not in parent:
+        return frame, None
+    parent = dict(parent)
+    value = parent.pop(key)
+    return {**frame, parent_key: parent}, value
+
+
+def _ragged(chunks, dtype):
+    """가변 길이 조각 목록 → (이어 붙인 값, offsets[n+1])"""
+    lengths = np.array([len(chunk) for chunk in chunks], dtype=np.int64)
+    offsets = np.zeros(len(chunks) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    values = np.concatenate(chunks).astype(dtype) if int(offsets[-1]) else np.zeros(0, dtype=dtype)
+    return values, offsets
+
+
+def save_analysis_results(analysis_results, path):
+    """분석 결과 dict → 컬럼형 .npz (임시 파일에 쓴 뒤 os.replace로 원자적 교체)"""
+    frame_results = analysis_results.get('frame_results', []) or []
+    document = {key: value for key, value in analysis_results.items() if key != 'frame_results'}
+
+    arrays = {
+        'frame/image_id': np.array([f.get('image_id', 0) for f in frame_results], dtype=np.int64),
+        'frame/timestamp': np.array([f.get('timestamp', 0) for f in frame_results], dtype=np.float64),
+    }
+
+    # 숫자 배열 분리
+    numeric_chunks = {path_: [] for path_ in NUMERIC_PATHS}
+    stripped_frames = []
+    for frame in frame_results:
+        for numeric_path in NUMERIC_PATHS:
+            frame, value = _pop_path(frame, numeric_path)
+            numeric_chunks[numeric_path].append(np.asarray(value if value is not None else [], dtype=np.float32).ravel())
+        stripped_frames.append(frame)
+
+    for numeric_path, chunks in numeric_chunks.items():
+        arrays[f'num/{numeric_path}/values'], arrays[f'num/{numeric_path}/offsets'] = _ragged(chunks, np.float32)
+
+    # 나머지 키는 키별 JSON 컬럼 (프레임 순서 유지, 없는 키는 null)
+    json_columns = []
+    for frame in stripped_frames:
+        for key in frame:
+            if key not in _INDEX_COLUMNS and key not in json_columns:
+                json_columns.append(key)
+
+    for key in json_columns:
+        encoded = [
+            np.frombuffer(_dumps(frame[key]).encode('utf-8') if key in frame else b'', dtype=np.uint8)
+            for frame in stripped_frames
+        ]
+        arrays[f'json/{key}/data'], arrays[f'json/{key}/offsets'] = _ragged(encoded, np.uint8)
+
+    header = {
+        'format': FORMAT_NAME,
+        'version': FORMAT_VERSION,
+        'frame_count': len(frame_results),
+        'json_columns': json_columns,
+        'numeric_columns': list(NUMERIC_PATHS),
+        'document': document,
+    }
+    arrays['__header__'] = np.frombuffer(_dumps(header).encode('utf-8'), dtype=np.uint8)
+
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    with open(tmp_path, 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(tmp_path, path)
+    return path
+
+
+def is_columnar_file(path):
+    return str(path).endswith('.npz')
+
+
+class AnalysisStore:
+    """컬럼형 분석 결과 읽기 - 필요한 컬럼/시간 범위의 프레임만 디코딩"""
+
+    def __init__(self, path):
+        self.path = path
+        self._npz = np.load(path, allow_pickle=False)
+        self._arrays = {}
+        self.header = json.loads(self._array('__header__').tobytes().decode('utf-8'))
+        if self.header.get('format') != FORMAT_NAME or self.header.get('version', 0) > FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 분석 결과 형식: {self.header.get('format')} v{self.header.get('version')}")
+
+    def close(self):
+        self._npz.close()
+
+    def _array(self, name):
+        """npz 멤버 (NpzFile은 접근할 때마다 압축 파일에서 다시 읽으므로 한 번 읽은 멤버는 보관)"""
+        if name not in self._arrays:
+            self._arrays[name] = self._npz[name]
+        return self._arrays[name]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @property
+    def document(self):
+        """frame_results를 제외한 최상위 결과 (video_summary, analysis_config, metadata 등)"""
+        return self.header.get('document', {})
+
+    @property
+    def columns(self):
+        return list(_INDEX_COLUMNS) + self.header.get('json_columns', []) + self.header.get('numeric_columns', [])
+
+    def timestamps(self):
+        return self._array('frame/timestamp')
+
+    def frame_ids(self):
+        return self._array('frame/image_id')
+
+    def select_rows(self, start_time=None, end_time=None):
+        """시간 범위 [start_time, end_time] 안의 프레임 행 번호"""
+        timestamps = self.timestamps()
+        mask = np.ones(len(timestamps), dtype=bool)
+        if start_time is not None:
+            mask &= timestamps >= start_time
+        if end_time is not None:
+            mask &= timestamps <= end_time
+        return np.flatnonzero(mask)
+
+    def _json_column(self, key, rows):
+        data = self._array(f'json/{key}/data')
+        offsets = self._array(f'json/{key}/offsets')
+        values = []
+        for row in rows:
+            chunk = data[offsets[row]:offsets[row + 1]]
+            values.append(json.loads(chunk.tobytes().decode('utf-8')) if len(chunk) else _MISSING)
+        return values
+
+    def numeric_column(self, numeric_path, rows=None):
+        """숫자 배열 컬럼 → 행별 float32 배열 목록"""
+        values = self._array(f'num/{numeric_path}/values')
+        offsets = self._array(f'num/{numeric_path}/offsets')
+        rows = range(len(offsets) - 1) if rows is None else rows
+        return [values[offsets[row]:offsets[row + 1]] for row in rows]
+
+    def load_frames(self, columns=None, start_time=None, end_time=None):
+        """프레임 결과 dict 목록 - columns(프레임 키 또는 숫자 컬럼 경로)가 None이면 전체
+
+        숫자 컬럼은 요청했을 때만 (columns=None이면 항상) 원래 위치의 리스트로 복원합니다.
+        """
+        rows = self.select_rows(start_time, end_time)
+        json_columns = self.header.get('json_columns', [])
+        numeric_columns = self.header.get('numeric_columns', [])
+
+        if columns is not None:
+            json_columns = [key for key in json_columns if key in columns]
+            numeric_columns = [path_ for path_ in numeric_columns if path_ in columns]
+
+        frame_ids = self.frame_ids()
+        timestamps = self.timestamps()
+        frames = [
+            {'image_id': int(frame_ids[row]), 'timestamp': float(timestamps[row])}
+            for row in rows
+        ]
+
+        for key in json_columns:
+            for frame, value in zip(frames, self._json_column(key, rows)):
+                if value is not _MISSING:
+                    frame[key] = value
+
+        for numeric_path in numeric_columns:
+            parent_key, key = numeric_path.split('.', 1)
+            for frame, value in zip(frames, self.numeric_column(numeric_path, rows)):
+                if isinstance(frame.get(parent_key), dict):
+                    frame[parent_key][key] = value.tolist()
+
+        return frames
+
+    def to_dict(self, columns=None, start_time=None, end_time=None):
+        """기존 JSON 파일과 같은 구조의 분석 결과 dict"""
+        return {**self.document, 'frame_results': self.load_frames(columns, start_time, end_time)}
+
+
+def _filter_json_frames(frame_results, columns=None, start_time=None, end_time=None):
+    """기존 JSON 형식 파일의 프레임 결과에 같은 컬럼/시간 범위 선택 적용"""
+    selected = []
+    for frame in frame_results:
+        timestamp = frame.get('timestamp', 0)
+        if (start_time is not None and timestamp < start_time) or (end_time is not None and timestamp > end_time):
+            continue
+        if columns is not None:
+            frame = {key: value for key, value in frame.items() if key in columns or key in _INDEX_COLUMNS}
+            for numeric_path in NUMERIC_PATHS:
+                if numeric_path not in columns:
+                    frame, _ = _pop_path(frame, numeric_path)
+        selected.append(frame)
+    return selected
+
+
+def load_analysis_results(path, columns=None, start_time=None, end_time=None):
+    """분석 결과 파일(.npz 컬럼형 또는 기존 .json) → 분석 결과 dict"""
+    if is_columnar_file(path):
+        with AnalysisStore(path) as store:
+            return store.to_dict(columns, start_time, end_time)
+
+    with open(path, 'r', encoding='utf-8') as f:
+        analysis_results = json.load(f)
+    if columns is None and start_time is None and end_time is None:
+        return analysis_results
+    return {
+        **analysis_results,
+        'frame_results': _filter_json_frames(analysis_results.get('frame_results', []), columns, start_time, end_time)
+    }
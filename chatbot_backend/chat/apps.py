@@ -1,9 +1,20 @@
 # chat/apps.py
+import threading
+
 from django.apps import AppConfig
+from django.conf import settings
 
 class ChatConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'chat'
 
     def ready(self):
-        import chat.signals  # chat 앱의 signals.py를 import
\ No newline at end of file
+        import chat.signals  # chat 앱의 signals.py를 import
+
+        # 무거운 모델/클라이언트 미리 로드 (백그라운드 - 서버 기동을 막지 않음)
+        warmup_components = getattr(settings, 'MODEL_REGISTRY_WARMUP', [])
+        if warmup_components:
+            from .model_registry import warm_up
+            threading.Thread(
+                target=warm_up, args=(warmup_components,), name='model-warmup', daemon=True
+            ).start()
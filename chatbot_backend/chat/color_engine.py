@@ -0,0 +1,143 @@
+# chat/color_engine.py - 프레임 단위 색상 분류 엔진
+"""
+객체 색상(ColorAnalyzer)과 의상 색상(PersonAttributeAnalyzer)이 공유하는 색상 분류 엔진입니다.
+
+기존에는 박스마다 ROI를 리사이즈하고 HSV로 변환한 뒤 11개 색상 범위마다 cv2.inRange를 호출했습니다.
+여기서는 프레임을 한 번만 HSV로 변환하고, H/S/V 채널별 룩업 테이블(색상 범위마다 1비트)을 AND 하여
+픽셀별 색상 비트 코드를 만든 다음, 모든 박스의 색상 비율을 한 번의 bincount로 계산합니다.
+색상 범위는 겹칠 수 있으므로(예: brown/orange) 한 픽셀이 여러 색상에 동시에 포함되는 기존 동작을 유지합니다.
+"""
+import threading
+import weakref
+
+import cv2
+import numpy as np
+
+COLOR_RANGES = {
+    'red': [(0, 70, 50), (10, 255, 255), (170, 70, 50), (180, 255, 255)],
+    'orange': [(11, 70, 50), (25, 255, 255)],
+    'yellow': [(26, 70, 50), (35, 255, 255)],
+    'green': [(36, 70, 50), (85, 255, 255)],
+    'blue': [(86, 70, 50), (125, 255, 255)],
+    'purple': [(126, 70, 50), (155, 255, 255)],
+    'pink': [(156, 70, 50), (169, 255, 255)],
+    'white': [(0, 0, 200), (180, 25, 255)],
+    'black': [(0, 0, 0), (180, 255, 50)],
+    'gray': [(0, 0, 51), (180, 25, 199)],
+    'brown': [(8, 60, 20), (20, 255, 200)]
+}
+
+
+class ColorLUT:
+    """색상 범위(HSV 박스) → 채널별 비트 룩업 테이블"""
+
+    def __init__(self, color_ranges=COLOR_RANGES):
+        self.colors = list(color_ranges)
+        self.h_lut = np.zeros(256, dtype=np.uint16)
+        self.s_lut = np.zeros(256, dtype=np.uint16)
+        self.v_lut = np.zeros(256, dtype=np.uint16)
+        self.color_masks = {}
+
+        bit = 0
+        for color_name, ranges in color_ranges.items():
+            mask = 0
+            # 범위는 (하한, 상한) 쌍의 나열 - red는 두 개의 색상 구간
+            for lower, upper in zip(ranges[0::2], ranges[1::2]):
+                box_bit = np.uint16(1 << bit)
+                self.h_lut[lower[0]:upper[0] + 1] |= box_bit
+                self.s_lut[lower[1]:upper[1] + 1] |= box_bit
+                self.v_lut[lower[2]:upper[2] + 1] |= box_bit
+                mask |= 1 << bit
+                bit += 1
+            self.color_masks[color_name] = np.uint16(mask)
+
+    def classify(self, hsv):
+        """HSV 이미지 → 픽셀별 색상 비트 코드 (uint16)"""
+        return self.h_lut[hsv[..., 0]] & self.s_lut[hsv[..., 1]] & self.v_lut[hsv[..., 2]]
+
+
+_default_lut = ColorLUT()
+
+
+class FrameColorMap:
+    """프레임 전체를 한 번 HSV 변환 + LUT 분류한 색상 코드 맵
+
+    박스 좌표는 정규화 [x1, y1, x2, y2]. 큰 프레임은 max_side로 줄인 뒤 분류하며,
+    박스 내부는 한 변 최대 sample_size 픽셀 간격으로 샘플링합니다 (기존 ROI 100x100 리사이즈와 같은 해상도).
+    """
+
+    def __init__(self, frame, lut=None, max_side=640, sample_size=100):
+        self.lut = lut or _default_lut
+        self.sample_size = sample_size
+
+        h, w = frame.shape[:2]
+        scale = min(1.0, max_side / max(h, w)) if max(h, w) > 0 else 1.0
+        if scale < 1.0:
+            frame = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+
+        self.codes = self.lut.classify(cv2.cvtColor(frame, cv2.COLOR_BGR2HSV))
+        self.height, self.width = self.codes.shape
+
+    def color_percentages(self, boxes):
+        """박스별 {색상: 픽셀 비율(%)} 목록 - 빈 박스는 빈 dict"""
+        samples = []
+        for bbox in boxes:
+            x1 = max(0, int(bbox[0] * self.width))
+            y1 = max(0, int(bbox[1] * self.height))
+            x2 = min(self.width, int(bbox[2] * self.width))
+            y2 = min(self.height, int(bbox[3] * self.height))
+
+            if x2 <= x1 or y2 <= y1:
+                samples.append(np.empty(0, dtype=np.uint16))
+                continue
+
+            stride = max(1, -(-max(x2 - x1, y2 - y1) // self.sample_size))
+            samples.append(self.codes[y1:y2:stride, x1:x2:stride].ravel())
+
+        if not samples:
+            return []
+
+        sizes = np.array([len(sample) for sample in samples])
+        owners = np.repeat(np.arange(len(samples)), sizes)
+        all_codes = np.concatenate(samples)
+
+        totals = np.maximum(sizes, 1)
+        per_color = {
+            color_name: np.bincount(owners, weights=(all_codes & mask) != 0, minlength=len(samples)) / totals * 100
+            for color_name, mask in self.lut.color_masks.items()
+        }
+
+        return [
+            {color_name: float(per_color[color_name][index]) for color_name in self.lut.colors} if sizes[index] else {}
+            for index in range(len(samples))
+        ]
+
+    def dominant_colors(self, boxes, num_colors=3, min_percentage=3.0):
+        """박스별 주요 색상 [(색상, 비율)] - ColorAnalyzer.extract_dominant_colors와 같은 형식"""
+        results = []
+        for percentages in self.color_percentages(boxes):
+            significant = [(color, round(pct, 1)) for color, pct in percentages.items() if round(pct, 1) >= min_percentage]
+            significant.sort(key=lambda item: item[1], reverse=True)
+            results.append(significant[:num_colors])
+        return results
+
+
+_recent_maps = []
+_recent_maps_lock = threading.Lock()
+_RECENT_MAPS_SIZE = 8
+
+
+def get_frame_color_map(frame):
+    """같은 프레임 배열에 대해서는 색상 맵을 한 번만 계산하여 공유 (객체 색상 ↔ 의상 색상)"""
+    with _recent_maps_lock:
+        for frame_ref, color_map in _recent_maps:
+            if frame_ref() is frame:
+                return color_map
+
+    color_map = FrameColorMap(frame)
+
+    with _recent_maps_lock:
+        _recent_maps.append((weakref.ref(frame), color_map))
+        # 해제된 프레임과 오래된 항목 정리
+        _recent_maps[:] = [item for item in _recent_maps if item[0]() is not None][-_RECENT_MAPS_SIZE:]
+    return color_map
@@ -411,11 +411,13 @@
 import os
 import json
 import time
+import shutil
 import hashlib
+import threading
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional, Tuple
 from dataclasses import dataclass
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import torch
 import numpy as np
 from tqdm import tqdm
@@ -426,8 +428,14 @@ from langchain_core.documents import Document
 import os, logging
 from konlpy.tag import Mecab, Okt
 
+from .analysis_store import load_analysis_results
+from .time_index import TimeIndex, bucket_by_time
+
 logger = logging.getLogger(__name__)
 
+# RAG 문서 생성에 필요한 프레임 결과 컬럼
+RAG_FRAME_COLUMNS = ['image_id', 'timestamp', 'final_caption', 'enhanced_caption', 'caption', 'objects', 'scene_analysis']
+
 MECAB_DIC = os.getenv("MECAB_DIC", "/opt/homebrew/lib/mecab/dic/mecab-ko-dic")
 
 def make_korean_analyzer(preferred: str | None = None):
@@ -443,6 +451,7 @@ def make_korean_analyzer(preferred: str | None = None):
 try:
     from langchain_community.document_loaders import JSONLoader
     from langchain_community.vectorstores import FAISS
+    from langchain_community.docstore.in_memory import InMemoryDocstore
     from langchain_huggingface import HuggingFaceEmbeddings
     from langchain_core.documents import Document
     from langchain.retrievers import EnsembleRetriever
@@ -454,6 +463,13 @@ except ImportError:
     print("⚠️ LangChain 라이브러리 미설치 - RAG 기능 비활성화")
     LANGCHAIN_AVAILABLE = False
 
+# FAISS 인덱스 직접 저장/로드 (메모리 매핑)
+try:
+    import faiss
+    FAISS_AVAILABLE = True
+except ImportError:
+    FAISS_AVAILABLE = False
+
 # 한국어 NLP 처리
 try:
     from konlpy.tag import Mecab, Hannanum, Kkma
@@ -479,6 +495,16 @@ class VideoRAGConfig:
     chunk_overlap: int = 128
     top_k: int = 5
     similarity_threshold: float = 0.8
+    # 의미적 답변 캐시 기준 (e5 쿼리 임베딩 코사인) - e5는 무관한 질문끼리도 0.8 이상이 흔해
+    # 바꿔 말한 같은 질문만 적중하도록 높게 설정
+    semantic_cache_threshold: float = 0.95
+    embedding_query_prefix: str = "query: "  # e5 계열 모델의 질의 접두어
+    semantic_cache_size: int = 256     # 비디오당 의미적 답변 캐시 최대 항목 수
+    
+    # 영구 저장소 설정 (비디오별 FAISS/BM25/시간축 인덱스)
+    persist_indexes: bool = True
+    store_dir: str = ""  # 비어 있으면 MEDIA_ROOT/rag_store
+    max_resident_videos: int = 8  # 프로세스당 메모리에 유지할 비디오 인덱스 수 (LRU)
     
     # 캐싱 설정
     cache_ttl_embedding: int = 3600  # 1시간
@@ -501,6 +527,7 @@ class TemporalIndex:
         self.timeline = defaultdict(list)  # timestamp -> events
         self.segments = []  # 시간 구간별 세그먼트
         self.events = []   # 감지된 이벤트들
+        self._time_index = None  # events의 timestamp 정렬 인덱스 (이벤트 추가 시 다시 생성)
     
     def add_frame_data(self, timestamp: float, frame_id: int, 
                       caption: str, objects: List[str], scene_data: Dict):
@@ -517,34 +544,54 @@ class TemporalIndex:
         
         self.timeline[timestamp].append(event)
         self.events.append(event)
+        self._time_index = None
+    
+    @property
+    def time_index(self) -> TimeIndex:
+        if self._time_index is None:
+            self._time_index = TimeIndex(self.events)
+        return self._time_index
+    
+    def events_between(self, start_time: float, end_time: float) -> List[Dict]:
+        """[start_time, end_time] 구간 이벤트 (시간순)"""
+        return self.time_index.between(start_time, end_time)
+    
+    def events_near(self, timestamp: float, window: float, limit: Optional[int] = None) -> List[tuple]:
+        """timestamp ± window 안의 이벤트 → [(시간 차, 이벤트)] - 가까운 순"""
+        return self.time_index.nearby(timestamp, window, limit)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """영구 저장용 직렬화 (timeline은 events에서 재구성)"""
+        return {'events': self.events, 'segments': self.segments}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'TemporalIndex':
+        """to_dict() 결과로부터 복원"""
+        index = cls()
+        for event in data.get('events', []):
+            index.timeline[event['timestamp']].append(event)
+            index.events.append(event)
+        index.segments = data.get('segments', [])
+        index._time_index = None
+        return index
     
     def create_segments(self, segment_duration: float = 30.0):
         """시간 구간별 세그먼트 생성"""
         if not self.events:
             return
         
-        max_time = max(event['timestamp'] for event in self.events)
-        current_time = 0
-        
-        while current_time < max_time:
-            end_time = min(current_time + segment_duration, max_time)
-            
-            segment_events = [
-                event for event in self.events 
-                if current_time <= event['timestamp'] < end_time
-            ]
-            
-            if segment_events:
-                segment = {
-                    'start_time': current_time,
-                    'end_time': end_time,
-                    'events': segment_events,
-                    'dominant_objects': self._get_dominant_objects(segment_events),
-                    'scene_summary': self._summarize_scene(segment_events)
-                }
-                self.segments.append(segment)
-            
-            current_time = end_time
+        max_time = self.time_index.timestamps[-1]
+        
+        # 이벤트를 한 번 순회하여 구간별로 묶음 (구간마다 전체 이벤트를 다시 훑지 않음)
+        for bucket, segment_events in bucket_by_time(self.events, segment_duration, end_time=max_time):
+            start_time = bucket * segment_duration
+            self.segments.append({
+                'start_time': start_time,
+                'end_time': min(start_time + segment_duration, max_time),
+                'events': segment_events,
+                'dominant_objects': self._get_dominant_objects(segment_events),
+                'scene_summary': self._summarize_scene(segment_events)
+            })
     
     def _get_dominant_objects(self, events: List[Dict]) -> List[str]:
         """세그먼트에서 주요 객체 추출"""
@@ -646,7 +693,9 @@ class EnhancedCacheManager:
         self.config = config
         self.embedding_cache = {}
         self.analysis_cache = {}
-        self.response_cache = {}
+        self.response_cache = {}  # video_id -> {'vectors': (N, D) 정규화 쿼리 임베딩, 'entries': [...]}
+        self.semantic_stats = {'hits': 0, 'misses': 0}
+        self._semantic_lock = threading.Lock()
     
     def get_cache_key(self, video_id: str, query: str, cache_type: str) -> str:
         """캐시 키 생성"""
@@ -672,29 +721,210 @@ class EnhancedCacheManager:
             'timestamp': time.time()
         }, timeout=self.config.cache_ttl_embedding)
     
-    def get_semantic_cache(self, video_id: str, query: str, threshold: float = 0.8) -> Optional[str]:
-        """의미적 유사도 기반 캐시 조회"""
-        # 기존 쿼리들과 유사도 비교
-        cache_key_pattern = f"semantic_cache:{video_id}:*"
+    def get_semantic_cache(self, video_id: str, query_embedding, threshold: float = 0.95,
+                           language: Optional[str] = None) -> Optional[str]:
+        """의미적 유사도 기반 답변 캐시 조회 - 같은 비디오·같은 언어 질문 중 코사인 유사도가 threshold 이상이면 반환"""
+        query_vector = self._normalize(query_embedding)
+        
+        with self._semantic_lock:
+            video_cache = self._purge_expired(video_id)
+            if video_cache is not None:
+                similarities = video_cache['vectors'] @ query_vector
+                if language is not None:
+                    same_language = np.array([entry.get('language') == language for entry in video_cache['entries']])
+                    similarities = np.where(same_language, similarities, -np.inf)
+                best = int(np.argmax(similarities))
+                if similarities[best] >= threshold:
+                    self.semantic_stats['hits'] += 1
+                    return video_cache['entries'][best]['answer']
+            
+            self.semantic_stats['misses'] += 1
+            return None
+    
+    def set_semantic_cache(self, video_id: str, query: str, query_embedding, answer: str,
+                           language: Optional[str] = None):
+        """의미적 답변 캐시 저장 - 비디오당 semantic_cache_size 초과 시 오래된 항목부터 제거"""
+        query_vector = self._normalize(query_embedding)
+        entry = {'query': query, 'answer': answer, 'language': language,
+                 'expires_at': time.time() + self.config.cache_ttl_response}
+        
+        with self._semantic_lock:
+            video_cache = self._purge_expired(video_id)
+            if video_cache is None:
+                video_cache = {'vectors': query_vector[np.newaxis, :], 'entries': [entry]}
+            else:
+                video_cache['vectors'] = np.vstack([video_cache['vectors'], query_vector])
+                video_cache['entries'].append(entry)
+            
+            overflow = len(video_cache['entries']) - max(1, self.config.semantic_cache_size)
+            if overflow > 0:
+                video_cache['vectors'] = video_cache['vectors'][overflow:]
+                video_cache['entries'] = video_cache['entries'][overflow:]
+            
+            self.response_cache[video_id] = video_cache
+    
+    def invalidate_semantic_cache(self, video_id: str):
+        """비디오 인덱스가 바뀌면 해당 비디오의 답변 캐시 폐기"""
+        with self._semantic_lock:
+            self.response_cache.pop(video_id, None)
+    
+    def get_semantic_cache_stats(self) -> Dict[str, Any]:
+        """의미적 답변 캐시 적중/실패 통계"""
+        with self._semantic_lock:
+            hits, misses = self.semantic_stats['hits'], self.semantic_stats['misses']
+            return {
+                'hits': hits,
+                'misses': misses,
+                'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+                'cached_answers': sum(len(c['entries']) for c in self.response_cache.values())
+            }
+    
+    def _purge_expired(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """만료 항목 제거 후 비디오 캐시 반환 (비어 있으면 None) - _semantic_lock 안에서 호출"""
+        video_cache = self.response_cache.get(video_id)
+        if video_cache is None:
+            return None
         
-        # Redis나 다른 캐시에서 패턴 매칭으로 조회
-        # 여기서는 간단한 구현
-        for cached_query, response in self.response_cache.items():
-            if self._calculate_similarity(query, cached_query) > threshold:
-                return response
+        now = time.time()
+        alive = [i for i, entry in enumerate(video_cache['entries']) if entry['expires_at'] > now]
+        if not alive:
+            del self.response_cache[video_id]
+            return None
         
-        return None
+        if len(alive) < len(video_cache['entries']):
+            video_cache['vectors'] = video_cache['vectors'][alive]
+            video_cache['entries'] = [video_cache['entries'][i] for i in alive]
+        return video_cache
+    
+    @staticmethod
+    def question_language(text: str) -> str:
+        """답변 캐시 구분용 질문 언어 - 한글이 있으면 'ko', 없으면 'other'"""
+        return 'ko' if any('\uac00' <= ch <= '\ud7a3' or '\u3131' <= ch <= '\u318e' for ch in text) else 'other'
+    
+    @staticmethod
+    def _normalize(embedding) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm > 0 else vector
+
+class VideoRAGStore:
+    """비디오별 RAG 인덱스 영구 저장소
     
-    def _calculate_similarity(self, query1: str, query2: str) -> float:
-        """간단한 텍스트 유사도 계산"""
-        # 실제로는 임베딩 기반 코사인 유사도 사용
-        words1 = set(query1.split())
-        words2 = set(query2.split())
+    {store_dir}/{video_id}/{version}/ 아래에 레벨별 FAISS 인덱스, 문서(BM25 코퍼스 겸 docstore),
+    TemporalIndex를 저장하고, {video_id}/CURRENT 파일이 최신 버전을 가리킵니다.
+    version은 분석 JSON 내용과 임베딩 모델로 결정되므로 재분석 시 자동으로 새 버전이 됩니다.
+    """
+    
+    INDEX_LEVELS = ('all', 'frame', 'segment', 'video')
+    
+    def __init__(self, config: VideoRAGConfig):
+        self.config = config
+        self.root = config.store_dir or os.path.join(settings.MEDIA_ROOT, 'rag_store')
+    
+    def make_version(self, analysis_bytes: bytes) -> str:
+        """분석 결과 + 임베딩 모델 기반 버전 키"""
+        digest = hashlib.sha1(analysis_bytes)
+        digest.update(self.config.embedding_model.encode())
+        return digest.hexdigest()[:16]
+    
+    def _video_dir(self, video_id: str) -> str:
+        return os.path.join(self.root, str(video_id))
+    
+    def current_version(self, video_id: str) -> Optional[str]:
+        try:
+            with open(os.path.join(self._video_dir(video_id), 'CURRENT'), 'r', encoding='utf-8') as f:
+                return f.read().strip() or None
+        except OSError:
+            return None
+    
+    def save(self, video_id: str, version: str, indexes: Dict[str, Any],
+             documents: List[Document], temporal_index: Optional[TemporalIndex], created_at: datetime):
+        """인덱스 저장 후 CURRENT 갱신 (임시 디렉토리 → rename으로 원자적 교체)"""
+        video_dir = self._video_dir(video_id)
+        version_dir = os.path.join(video_dir, version)
+        tmp_dir = f"{version_dir}.tmp-{os.getpid()}"
+        os.makedirs(tmp_dir, exist_ok=True)
+        
+        try:
+            for level, db in indexes.items():
+                if db is not None:
+                    faiss.write_index(db.index, os.path.join(tmp_dir, f"{level}.faiss"))
+            
+            with open(os.path.join(tmp_dir, 'documents.json'), 'w', encoding='utf-8') as f:
+                json.dump([{'page_content': doc.page_content, 'metadata': doc.metadata} for doc in documents],
+                          f, ensure_ascii=False)
+            
+            with open(os.path.join(tmp_dir, 'temporal_index.json'), 'w', encoding='utf-8') as f:
+                json.dump(temporal_index.to_dict() if temporal_index else {}, f, ensure_ascii=False)
+            
+            with open(os.path.join(tmp_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+                json.dump({
+                    'video_id': str(video_id),
+                    'version': version,
+                    'embedding_model': self.config.embedding_model,
+                    'created_at': created_at.isoformat(),
+                    'levels': [level for level, db in indexes.items() if db is not None]
+                }, f)
+            
+            shutil.rmtree(version_dir, ignore_errors=True)
+            os.replace(tmp_dir, version_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+        
+        current_tmp = os.path.join(video_dir, f"CURRENT.tmp-{os.getpid()}")
+        with open(current_tmp, 'w', encoding='utf-8') as f:
+            f.write(version)
+        os.replace(current_tmp, os.path.join(video_dir, 'CURRENT'))
+        
+        # 이전 버전 정리
+        for name in os.listdir(video_dir):
+            path = os.path.join(video_dir, name)
+            if name != version and os.path.isdir(path) and '.tmp-' not in name:
+                shutil.rmtree(path, ignore_errors=True)
+    
+    def load(self, video_id: str, version: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """저장된 인덱스 로드 - FAISS 인덱스는 가능하면 메모리 매핑"""
+        version = version or self.current_version(video_id)
+        if not version:
+            return None
+        
+        version_dir = os.path.join(self._video_dir(video_id), version)
+        manifest_path = os.path.join(version_dir, 'manifest.json')
+        if not os.path.exists(manifest_path):
+            return None
+        
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        
+        if manifest.get('embedding_model') != self.config.embedding_model:
+            return None
+        
+        with open(os.path.join(version_dir, 'documents.json'), 'r', encoding='utf-8') as f:
+            documents = [Document(page_content=d['page_content'], metadata=d['metadata']) for d in json.load(f)]
         
-        intersection = words1.intersection(words2)
-        union = words1.union(words2)
+        with open(os.path.join(version_dir, 'temporal_index.json'), 'r', encoding='utf-8') as f:
+            temporal_index = TemporalIndex.from_dict(json.load(f))
         
-        return len(intersection) / len(union) if union else 0.0
+        indexes = {}
+        for level in manifest.get('levels', []):
+            indexes[level] = self._read_index(os.path.join(version_dir, f"{level}.faiss"))
+        
+        return {
+            'version': version,
+            'indexes': indexes,
+            'documents': documents,
+            'temporal_index': temporal_index,
+            'created_at': datetime.fromisoformat(manifest['created_at'])
+        }
+    
+    def _read_index(self, path: str):
+        try:
+            return faiss.read_index(path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+        except Exception:
+            # 메모리 매핑을 지원하지 않는 인덱스 타입/빌드
+            return faiss.read_index(path)
+
 
 class EnhancedVideoRAGSystem:
     """고도화된 비디오 분석 RAG 시스템"""
@@ -711,6 +941,12 @@ class EnhancedVideoRAGSystem:
         self._embeddings_initialized = False
         self._llm_initialized = False
         
+        # 비디오 데이터베이스 저장소 (LRU - max_resident_videos 초과 시 오래된 비디오부터 해제)
+        self.video_databases = OrderedDict()
+        self.temporal_indexes = {}
+        self._resident_lock = threading.Lock()  # video_databases/temporal_indexes (요청 스레드 간 공유)
+        self.store = VideoRAGStore(self.config) if self.config.persist_indexes and FAISS_AVAILABLE else None
+        
         print(f"🚀 Enhanced VideoRAG 시스템 초기화 (디바이스: {self.device})")
         
         if not LANGCHAIN_AVAILABLE:
@@ -723,10 +959,6 @@ class EnhancedVideoRAGSystem:
         except Exception as e:
             print(f"⚠️ RAG 시스템 초기화 부분 실패: {e}")
         
-        # 비디오 데이터베이스 저장소
-        self.video_databases = {}
-        self.temporal_indexes = {}
-        
         print("✅ Enhanced VideoRAG 시스템 초기화 완료")
     
     def _init_embeddings(self):
@@ -774,8 +1006,17 @@ class EnhancedVideoRAGSystem:
             
             print(f"📄 JSON 분석 파일 처리 중: {json_file_path}")
             
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
+            with open(json_file_path, 'rb') as f:
+                analysis_bytes = f.read()
+            
+            # 같은 분석 결과로 이미 저장된 인덱스가 있으면 재임베딩 없이 로드
+            version = self.store.make_version(analysis_bytes) if self.store else None
+            if version and self._load_video_db(video_id, version):
+                print(f"✅ 비디오 {video_id} RAG DB 저장소에서 로드 (버전 {version})")
+                return True
+            
+            # 문서 생성에 쓰는 컬럼만 읽음 (visual_features/포즈 배열 등 숫자 컬럼은 디코딩하지 않음)
+            analysis_data = load_analysis_results(json_file_path, columns=RAG_FRAME_COLUMNS)
             
             # 시간축 인덱스 생성
             temporal_index = TemporalIndex()
@@ -864,11 +1105,9 @@ class EnhancedVideoRAGSystem:
             )]
             
             # 계층적 벡터 DB 생성
-            success = self._create_hierarchical_vector_db(video_id, all_documents)
+            success = self._create_hierarchical_vector_db(video_id, all_documents, temporal_index, version)
             
             if success:
-                # 시간축 인덱스 저장
-                self.temporal_indexes[video_id] = temporal_index
                 print(f"✅ 비디오 {video_id} 고급 RAG DB 생성 완료: {len(all_documents)}개 문서")
                 return True
             
@@ -960,102 +1199,198 @@ class EnhancedVideoRAGSystem:
         
         return '\n'.join(content_parts)
     
-    def _create_hierarchical_vector_db(self, video_id: str, documents: List[Document]) -> bool:
-        """계층적 벡터 DB 생성"""
+    def _create_hierarchical_vector_db(self, video_id: str, documents: List[Document],
+                                       temporal_index: Optional[TemporalIndex] = None,
+                                       version: Optional[str] = None) -> bool:
+        """계층적 벡터 DB 생성 - version이 주어지면 영구 저장소에도 저장"""
         if not self._embeddings_initialized or not documents:
             return False
         
         try:
-            # FAISS 인덱스 최적화 설정
-            db = FAISS.from_documents(documents, embedding=self.embeddings)
-            
-            # nlist 동적 조정
-            n_docs = len(documents)
-            optimal_nlist = max(10, min(int(np.sqrt(n_docs)), 1000))
+            # 임베딩은 한 번만 계산하고 전체/계층별 인덱스에서 재사용
+            vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
             
-            # 검색기 구성 - 다중 검색 전략
-            similarity_retriever = db.as_retriever(
-                search_type="similarity",
-                search_kwargs={'k': self.config.top_k}
-            )
+            # FAISS 인덱스 최적화 설정
+            db = self._build_faiss_from_vectors(documents, vectors)
+            level_dbs = {
+                level: self._create_level_db(documents, vectors, level)
+                for level in ('frame', 'segment', 'video')
+            }
+            created_at = datetime.now()
             
-            mmr_retriever = db.as_retriever(
-                search_type="mmr",
-                search_kwargs={
-                    'k': self.config.top_k,
-                    'fetch_k': self.config.top_k * 2
-                }
+            self._register_video_db(
+                video_id, self._assemble_video_db(db, level_dbs, documents, created_at), temporal_index
             )
+            self.cache_manager.invalidate_semantic_cache(video_id)
             
-            # BM25 검색기 (한국어 지원)
-            try:
-                bm25_retriever = BM25Retriever.from_documents(documents)
-                bm25_retriever.k = self.config.top_k
-                
-                # 앙상블 검색기 구성
-                ensemble_retriever = EnsembleRetriever(
-                    retrievers=[similarity_retriever, mmr_retriever, bm25_retriever],
-                    weights=[0.5, 0.3, 0.2]  # 가중치 조정
-                )
-            except Exception as e:
-                print(f"⚠️ BM25 검색기 생성 실패: {e}")
-                ensemble_retriever = similarity_retriever
+            if self.store and version:
+                try:
+                    self.store.save(video_id, version, dict(level_dbs, all=db),
+                                    documents, temporal_index, created_at)
+                except Exception as e:
+                    print(f"⚠️ RAG DB 영구 저장 실패 (메모리에서만 사용): {e}")
             
-            # 계층별 검색기
-            frame_retriever = self._create_level_retriever(db, documents, 'frame')
-            segment_retriever = self._create_level_retriever(db, documents, 'segment')
-            video_retriever = self._create_level_retriever(db, documents, 'video')
+            return True
             
-            self.video_databases[video_id] = {
-                'db': db,
-                'retriever': ensemble_retriever,
-                'frame_retriever': frame_retriever,
-                'segment_retriever': segment_retriever,
-                'video_retriever': video_retriever,
-                'documents': documents,
-                'created_at': datetime.now(),
-                'config': self.config
+        except Exception as e:
+            print(f"❌ 계층적 벡터 DB 생성 실패: {e}")
+            return False
+    
+    def _assemble_video_db(self, db, level_dbs: Dict[str, Any], documents: List[Document],
+                           created_at: datetime) -> Dict[str, Any]:
+        """FAISS 인덱스들로 검색기 구성 (새로 생성/저장소 로드 공통)"""
+        # nlist 동적 조정
+        n_docs = len(documents)
+        optimal_nlist = max(10, min(int(np.sqrt(n_docs)), 1000))
+        
+        # 검색기 구성 - 다중 검색 전략
+        similarity_retriever = db.as_retriever(
+            search_type="similarity",
+            search_kwargs={'k': self.config.top_k}
+        )
+        
+        mmr_retriever = db.as_retriever(
+            search_type="mmr",
+            search_kwargs={
+                'k': self.config.top_k,
+                'fetch_k': self.config.top_k * 2
             }
+        )
+        
+        # BM25 검색기 (한국어 지원)
+        try:
+            bm25_retriever = BM25Retriever.from_documents(documents)
+            bm25_retriever.k = self.config.top_k
             
-            return True
+            # 앙상블 검색기 구성
+            ensemble_retriever = EnsembleRetriever(
+                retrievers=[similarity_retriever, mmr_retriever, bm25_retriever],
+                weights=[0.5, 0.3, 0.2]  # 가중치 조정
+            )
+        except Exception as e:
+            print(f"⚠️ BM25 검색기 생성 실패: {e}")
+            ensemble_retriever = similarity_retriever
+        
+        return {
+            'db': db,
+            'retriever': ensemble_retriever,
+            'frame_retriever': self._create_level_retriever(level_dbs.get('frame')),
+            'segment_retriever': self._create_level_retriever(level_dbs.get('segment')),
+            'video_retriever': self._create_level_retriever(level_dbs.get('video')),
+            'documents': documents,
+            'created_at': created_at,
+            'config': self.config
+        }
+    
+    def _register_video_db(self, video_id: str, db_info: Dict[str, Any],
+                           temporal_index: Optional[TemporalIndex]):
+        """메모리 상주 비디오 DB 등록 - LRU 한도 초과 시 가장 오래 사용하지 않은 비디오 해제"""
+        with self._resident_lock:
+            self.video_databases[video_id] = db_info
+            self.video_databases.move_to_end(video_id)
+            if temporal_index is not None:
+                self.temporal_indexes[video_id] = temporal_index
             
+            evicted_ids = []
+            while len(self.video_databases) > max(1, self.config.max_resident_videos):
+                evicted_id, _ = self.video_databases.popitem(last=False)
+                self.temporal_indexes.pop(evicted_id, None)
+                evicted_ids.append(evicted_id)
+        
+        for evicted_id in evicted_ids:
+            print(f"♻️ 비디오 {evicted_id} RAG DB 메모리 해제 (LRU)")
+    
+    def _load_video_db(self, video_id: str, version: Optional[str] = None) -> bool:
+        """영구 저장소에서 비디오 DB 로드 (재임베딩 없음)"""
+        if not self.store or not self._embeddings_initialized:
+            return False
+        
+        try:
+            stored = self.store.load(video_id, version)
         except Exception as e:
-            print(f"❌ 계층적 벡터 DB 생성 실패: {e}")
+            print(f"⚠️ 비디오 {video_id} RAG DB 저장소 로드 실패: {e}")
             return False
+        
+        if not stored or 'all' not in stored['indexes']:
+            return False
+        
+        documents = stored['documents']
+        level_dbs = {}
+        for level, index in stored['indexes'].items():
+            level_docs = documents if level == 'all' else [
+                doc for doc in documents if doc.metadata.get('level') == level
+            ]
+            level_dbs[level] = FAISS(
+                embedding_function=self.embeddings,
+                index=index,
+                docstore=InMemoryDocstore({str(i): doc for i, doc in enumerate(level_docs)}),
+                index_to_docstore_id={i: str(i) for i in range(len(level_docs))}
+            )
+        
+        db = level_dbs.pop('all')
+        self._register_video_db(
+            video_id, self._assemble_video_db(db, level_dbs, documents, stored['created_at']),
+            stored['temporal_index']
+        )
+        return True
+    
+    def _get_video_db(self, video_id: str) -> Optional[Dict[str, Any]]:
+        """비디오 DB 조회 - 메모리에 없으면 영구 저장소에서 로드 (로드는 락 밖에서)"""
+        with self._resident_lock:
+            if video_id in self.video_databases:
+                self.video_databases.move_to_end(video_id)
+                return self.video_databases[video_id]
+        
+        if not self._load_video_db(video_id):
+            return None
+        
+        with self._resident_lock:
+            return self.video_databases.get(video_id)
+    
+    def _build_faiss_from_vectors(self, documents: List[Document], vectors: List[List[float]]):
+        """미리 계산한 임베딩으로 FAISS 인덱스 생성 (재임베딩 없음)"""
+        return FAISS.from_embeddings(
+            list(zip((doc.page_content for doc in documents), vectors)),
+            embedding=self.embeddings,
+            metadatas=[doc.metadata for doc in documents]
+        )
     
-    def _create_level_retriever(self, db, documents: List[Document], level: str):
+    def _create_level_db(self, documents: List[Document], vectors: List[List[float]], level: str):
+        """레벨별 하위 인덱스 생성 - 전체 임베딩 중 해당 레벨 벡터만 사용"""
+        level_items = [
+            (doc, vector) for doc, vector in zip(documents, vectors)
+            if doc.metadata.get('level') == level
+        ]
+        if not level_items:
+            return None
+        
+        level_docs, level_vectors = zip(*level_items)
+        return self._build_faiss_from_vectors(list(level_docs), list(level_vectors))
+    
+    def _create_level_retriever(self, level_db):
         """레벨별 검색기 생성"""
-        level_docs = [doc for doc in documents if doc.metadata.get('level') == level]
-        if not level_docs:
+        if level_db is None:
             return None
         
-        level_db = FAISS.from_documents(level_docs, embedding=self.embeddings)
         return level_db.as_retriever(
             search_type="similarity",
-            search_kwargs={'k': min(self.config.top_k, len(level_docs))}
+            search_kwargs={'k': min(self.config.top_k, level_db.index.ntotal)}
         )
     
     def smart_search_video_content(self, video_id: str, query: str, 
                                  context: Optional[Dict] = None) -> List[Dict]:
         """지능형 비디오 내용 검색"""
-        if video_id not in self.video_databases:
+        db_info = self._get_video_db(video_id)
+        if db_info is None:
             print(f"⚠️ 비디오 {video_id}의 RAG DB가 없음")
             return []
         
         try:
-            # 의미적 캐시 확인
-            cached_result = self.cache_manager.get_semantic_cache(
-                video_id, query, self.config.similarity_threshold
-            )
-            if cached_result:
-                print("🎯 캐시에서 유사한 쿼리 결과 반환")
-                return cached_result
-            
             # 질문 의도 분석
             intent = self.korean_processor.analyze_question_intent(query)
             
-            # 의도에 따른 검색 전략 선택
-            results = self._execute_search_strategy(video_id, query, intent)
+            # 의도에 따른 검색 전략 선택 (조회한 db_info 사용 - 그 사이 LRU에서 해제되어도 안전)
+            results = self._execute_search_strategy(db_info, query, intent)
             
             # 시간적 컨텍스트 추가
             if intent['temporal'] and video_id in self.temporal_indexes:
@@ -1072,9 +1407,8 @@ class EnhancedVideoRAGSystem:
             print(f"❌ 지능형 검색 실패: {e}")
             return []
     
-    def _execute_search_strategy(self, video_id: str, query: str, intent: Dict) -> List[Dict]:
+    def _execute_search_strategy(self, db_info: Dict[str, Any], query: str, intent: Dict) -> List[Dict]:
         """의도 기반 검색 전략 실행"""
-        db_info = self.video_databases[video_id]
         
         if intent['temporal']:
             # 시간 기반 검색 - 세그먼트 레벨 우선
@@ -1128,18 +1462,14 @@ class EnhancedVideoRAGSystem:
     def _find_nearby_events(self, temporal_index: TemporalIndex, 
                            target_timestamp: float, window: float = 5.0) -> List[Dict]:
         """주변 시간대 이벤트 찾기"""
-        nearby_events = []
-        
-        for event in temporal_index.events:
-            time_diff = abs(event['timestamp'] - target_timestamp)
-            if time_diff <= window:
-                nearby_events.append({
-                    'timestamp': event['timestamp'],
-                    'caption': event['caption'],
-                    'time_diff': time_diff
-                })
-        
-        return sorted(nearby_events, key=lambda x: x['time_diff'])[:3]
+        return [
+            {
+                'timestamp': event['timestamp'],
+                'caption': event['caption'],
+                'time_diff': time_diff
+            }
+            for time_diff, event in temporal_index.events_near(target_timestamp, window, limit=3)
+        ]
     
     def _format_search_results(self, docs: List[Document]) -> List[Dict]:
         """검색 결과 포맷팅"""
@@ -1163,6 +1493,22 @@ class EnhancedVideoRAGSystem:
         if not self._llm_initialized:
             return "LLM이 초기화되지 않아 답변을 생성할 수 없습니다."
         
+        # 의미적 답변 캐시 확인 (유사한 질문이면 LLM 호출 생략)
+        query_embedding = None
+        question_language = self.cache_manager.question_language(question)
+        if self._embeddings_initialized:
+            try:
+                query_embedding = self.embeddings.embed_query(self.config.embedding_query_prefix + question)
+                cached_answer = self.cache_manager.get_semantic_cache(
+                    video_id, query_embedding, self.config.semantic_cache_threshold, question_language
+                )
+                if cached_answer:
+                    print("🎯 캐시에서 유사한 질문의 답변 반환")
+                    return cached_answer
+            except Exception as e:
+                print(f"⚠️ 의미적 캐시 조회 실패: {e}")
+                query_embedding = None
+        
         # 지능형 검색 수행
         search_results = self.smart_search_video_content(video_id, question, context)
         
@@ -1182,6 +1528,8 @@ class EnhancedVideoRAGSystem:
             # 응답 캐싱
             cache_key = self.cache_manager.get_cache_key(video_id, question, "response")
             cache.set(cache_key, answer, timeout=self.config.cache_ttl_response)
+            if query_embedding is not None:
+                self.cache_manager.set_semantic_cache(video_id, question, query_embedding, answer, question_language)
             
             return answer
             
@@ -1262,10 +1610,10 @@ class EnhancedVideoRAGSystem:
     
     def get_video_statistics(self, video_id: str) -> Dict[str, Any]:
         """비디오 통계 정보 조회"""
-        if video_id not in self.video_databases:
+        db_info = self._get_video_db(video_id)
+        if db_info is None:
             return {}
         
-        db_info = self.video_databases[video_id]
         temporal_index = self.temporal_indexes.get(video_id)
         
         stats = {
@@ -1273,7 +1621,8 @@ class EnhancedVideoRAGSystem:
             'total_documents': len(db_info['documents']),
             'created_at': db_info['created_at'].isoformat(),
             'embedding_model': self.config.embedding_model,
-            'levels': {}
+            'levels': {},
+            'semantic_cache': self.cache_manager.get_semantic_cache_stats()
         }
         
         # 레벨별 통계
@@ -1288,19 +1637,18 @@ class EnhancedVideoRAGSystem:
             stats['temporal_stats'] = {
                 'total_events': len(temporal_index.events),
                 'total_segments': len(temporal_index.segments),
-                'timeline_span': max(event['timestamp'] for event in temporal_index.events) if temporal_index.events else 0
+                'timeline_span': temporal_index.time_index.timestamps[-1] if temporal_index.events else 0
             }
         
         return stats
     
     def optimize_database(self, video_id: str) -> bool:
         """데이터베이스 최적화"""
-        if video_id not in self.video_databases:
+        db_info = self._get_video_db(video_id)
+        if db_info is None:
             return False
         
         try:
-            db_info = self.video_databases[video_id]
-            
             # 인덱스 최적화
             if hasattr(db_info['db'].index, 'train'):
                 embeddings = db_info['db'].index.reconstruct_n(0, db_info['db'].index.ntotal)
@@ -1323,6 +1671,7 @@ class EnhancedVideoRAGSystem:
                 f"*{video_id}*response*"
             ]
             # Django 캐시 클리어 (실제 구현에서는 패턴 매칭 필요)
+            self.cache_manager.invalidate_semantic_cache(video_id)
             print(f"🧹 비디오 {video_id} 캐시 정리 완료")
         else:
             # 전체 캐시 정리
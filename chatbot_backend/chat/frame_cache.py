@@ -0,0 +1,147 @@
+# chat/frame_cache.py - 비디오 내용 해시 기반 프레임별 모델 출력 캐시
+"""
+재분석(RestartAnalysisView, ResetVideoAnalysisView, 다른 analysis_type으로 재실행) 시
+이미 분석한 프레임의 YOLO/CLIP/BLIP/OCR/LLM 출력을 재사용하기 위한 캐시입니다.
+
+키는 (비디오 내용 해시, 단계별 모델명@버전, 프레임 번호)이며, 단계별로 하나의 JSON 파일에 저장합니다:
+    {root}/{video_hash}/{stage_file}.json = {'stage_key': ..., 'frames': {frame_id: output}}
+같은 파일을 다시 업로드해도 해시가 같으면 캐시가 그대로 적용되고, 모델/설정이 바뀌면 stage_key가
+달라져 자동으로 새 파일을 사용합니다.
+"""
+import os
+import copy
+import json
+import hashlib
+import threading
+
+import numpy as np
+
+_video_hash_memo = {}
+_video_hash_lock = threading.Lock()
+
+
+def compute_video_hash(video_path, chunk_size=4 * 1024 * 1024):
+    """비디오 파일 내용 SHA-256 (경로/크기/수정시각이 같으면 프로세스 내에서 재계산하지 않음)"""
+    stat = os.stat(video_path)
+    memo_key = (os.path.abspath(video_path), stat.st_size, stat.st_mtime_ns)
+
+    with _video_hash_lock:
+        if memo_key in _video_hash_memo:
+            return _video_hash_memo[memo_key]
+
+    digest = hashlib.sha256()
+    with open(video_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    video_hash = digest.hexdigest()
+
+    with _video_hash_lock:
+        _video_hash_memo[memo_key] = video_hash
+    return video_hash
+
+
+def _json_default(value):
+    """numpy 값 → JSON 직렬화 가능한 기본 타입"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"JSON 직렬화 불가: {type(value)}")
+
+
+class FrameResultCache:
+    """한 비디오의 단계별 프레임 출력 캐시 (스레드 안전)
+
+    stage_keys: {단계 이름: '모델명@버전...'} - 단계 이름으로 get/put 하고, 실제 저장 위치는 stage_key로 결정
+    """
+
+    def __init__(self, video_hash, root, stage_keys):
+        self.video_hash = video_hash
+        self.cache_dir = os.path.join(root, video_hash)
+        self.stage_keys = dict(stage_keys)
+        self._frames = {}    # stage -> {frame_id(str): output}
+        self._updates = {}   # stage -> 이번 실행에서 새로 추가된 항목
+        self._lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'stored': 0}
+
+    def _stage_path(self, stage):
+        file_key = hashlib.sha1(self.stage_keys[stage].encode()).hexdigest()[:16]
+        return os.path.join(self.cache_dir, f"{stage}-{file_key}.json")
+
+    def _load_stage(self, stage):
+        """단계 파일을 한 번만 읽어 메모리에 보관 (락을 잡은 상태에서 호출)"""
+        if stage not in self._frames:
+            frames = {}
+            try:
+                with open(self._stage_path(stage), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('stage_key') == self.stage_keys[stage]:
+                    frames = data.get('frames', {})
+            except (OSError, ValueError):
+                pass
+            self._frames[stage] = frames
+        return self._frames[stage]
+
+    def get(self, stage, frame_id):
+        """캐시된 출력 또는 None"""
+        if stage not in self.stage_keys:
+            return None
+        with self._lock:
+            value = self._load_stage(stage).get(str(frame_id))
+            self.stats['hits' if value is not None else 'misses'] += 1
+            # 호출 측이 결과를 수정해도(트랙 ID 재매핑 등) 캐시가 바뀌지 않도록 복사본 반환
+            return copy.deepcopy(value)
+
+    def has_all(self, stage, frame_ids):
+        """frame_ids가 모두 캐시되어 있는지 (통계에는 반영하지 않음)"""
+        if stage not in self.stage_keys:
+            return False
+        with self._lock:
+            frames = self._load_stage(stage)
+            return all(str(frame_id) in frames for frame_id in frame_ids)
+
+    def put(self, stage, frame_id, value):
+        if stage not in self.stage_keys or value is None:
+            return
+        with self._lock:
+            frames = self._load_stage(stage)
+            if frames.get(str(frame_id)) == value:
+                return
+            value = copy.deepcopy(value)
+            frames[str(frame_id)] = value
+            self._updates.setdefault(stage, {})[str(frame_id)] = value
+            self.stats['stored'] += 1
+
+    def pop_updates(self):
+        """이번 실행에서 추가된 항목 반환 후 비움 (샤드 워커 → 부모 프로세스 전달용)"""
+        with self._lock:
+            updates, self._updates = self._updates, {}
+            return updates
+
+    def merge_updates(self, updates):
+        """다른 프로세스에서 계산한 항목 병합"""
+        for stage, frames in (updates or {}).items():
+            for frame_id, value in frames.items():
+                self.put(stage, frame_id, value)
+
+    def save(self):
+        """변경된 단계 파일만 기록 (임시 파일 → os.replace로 원자적 교체)"""
+        with self._lock:
+            stages = [stage for stage in self._updates if stage in self.stage_keys]
+            if not stages:
+                return
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+            for stage in stages:
+                path = self._stage_path(stage)
+                tmp_path = f"{path}.tmp-{os.getpid()}"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump({'stage_key': self.stage_keys[stage], 'frames': self._frames[stage]},
+                              f, ensure_ascii=False, default=_json_default)
+                os.replace(tmp_path, path)
+
+            self._updates = {}
+
+    def get_stats(self):
+        with self._lock:
+            return {**self.stats, 'video_hash': self.video_hash}
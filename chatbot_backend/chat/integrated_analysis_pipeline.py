@@ -20,6 +20,62 @@ from .advanced_video_analyzer import (
     TemporalAnalyzer, VideoSearchEngine
 )
 from .llm_client import LLMClient
+from .performance_optimization import BulkModelWriter
+
+
+class SharedFrameStage:
+    """공유 프레임 단계 - 기본 분석에서 디코딩된 샘플 프레임을 메타데이터/사람 속성 분석에 함께 전달
+    
+    프레임은 받은 즉시 분석하고 보관하지 않으므로 메모리 사용량은 결과 크기만큼만 늘어납니다.
+    """
+    
+    def __init__(self, metadata_analyzer, person_analyzer, video, metadata_samples=10):
+        self.metadata_analyzer = metadata_analyzer
+        self.person_analyzer = person_analyzer
+        self.video = video
+        self.metadata_samples = metadata_samples
+        self.total_frames = None
+        
+        self.observed_frame_ids = set()
+        self.metadata_frames = []       # [{'weather': ..., 'time': ...}]
+        self.person_attributes = {}     # {(frame_id, person_idx): attributes}
+        self._metadata_targets = None
+    
+    def __call__(self, frame_id, timestamp, frame, detected_objects):
+        if frame_id in self.observed_frame_ids:
+            return
+        self.observed_frame_ids.add(frame_id)
+        
+        try:
+            if self._consume_metadata_target(frame_id):
+                self.metadata_frames.append({
+                    'weather': self.metadata_analyzer.analyze_weather_conditions(frame),
+                    'time': self.metadata_analyzer.analyze_time_of_day(frame)
+                })
+        except Exception as e:
+            print(f"⚠️ 프레임 {frame_id} 메타데이터 분석 실패: {e}")
+        
+        for person_idx, obj in enumerate(detected_objects or []):
+            if obj.get('class') != 'person' or len(obj.get('bbox', [])) != 4:
+                continue
+            try:
+                self.person_attributes[(frame_id, person_idx)] = \
+                    self.person_analyzer.analyze_person_attributes(frame, obj['bbox'])
+            except Exception as e:
+                print(f"⚠️ 프레임 {frame_id} 사람 속성 분석 실패: {e}")
+    
+    def _consume_metadata_target(self, frame_id):
+        """전체 구간을 균등 분할한 메타데이터 샘플 위치에 도달한 첫 프레임이면 True"""
+        if self._metadata_targets is None:
+            total_frames = self.total_frames or getattr(self.video, 'total_frames', 0) or 0
+            step = total_frames // self.metadata_samples
+            self._metadata_targets = [i * step for i in range(self.metadata_samples)]
+        
+        consumed = False
+        while self._metadata_targets and self._metadata_targets[0] <= frame_id - 1:
+            self._metadata_targets.pop(0)
+            consumed = True
+        return consumed
 
 
 class IntegratedAnalysisPipeline:
@@ -50,19 +106,26 @@ class IntegratedAnalysisPipeline:
             if progress_callback:
                 progress_callback(5, "기본 AI 분석 시작")
             
-            basic_results = self._run_basic_analysis(video, progress_callback)
+            # 기본 분석의 디코딩 결과를 메타데이터/사람 속성 분석에 함께 전달 (비디오는 한 번만 디코딩)
+            frame_stage = SharedFrameStage(self.metadata_analyzer, self.person_analyzer, video)
+            
+            basic_results = self._run_basic_analysis(video, progress_callback, frame_stage)
+            self._complete_frame_stage(video, basic_results, frame_stage)
             
             # 2단계: 고급 메타데이터 분석
             if progress_callback:
                 progress_callback(25, "비디오 메타데이터 분석")
             
-            metadata_results = self._analyze_video_metadata(video, basic_results)
+            metadata_results = self._analyze_video_metadata(video, basic_results, frame_stage)
             
             # 3단계: 사람 속성 분석
             if progress_callback:
                 progress_callback(45, "사람 속성 분석")
             
-            person_results = self._analyze_person_attributes(video, basic_results)
+            # PersonDetection/ObjectTracking 행은 버퍼링 후 한 번에 일괄 저장
+            db_writer = BulkModelWriter()
+            
+            person_results = self._analyze_person_attributes(video, basic_results, frame_stage, db_writer)
             
             # 4단계: 시간별 통계 생성
             if progress_callback:
@@ -74,7 +137,9 @@ class IntegratedAnalysisPipeline:
             if progress_callback:
                 progress_callback(80, "객체 추적 분석")
             
-            tracking_results = self._analyze_object_tracking(video, basic_results)
+            tracking_results = self._analyze_object_tracking(video, basic_results, db_writer)
+            
+            db_write_stats = self._flush_db_writes(video, db_writer)
             
             # 6단계: 검색 인덱스 생성
             if progress_callback:
@@ -98,7 +163,8 @@ class IntegratedAnalysisPipeline:
                     'metadata': metadata_results,
                     'person': person_results,
                     'temporal': temporal_results,
-                    'tracking': tracking_results
+                    'tracking': tracking_results,
+                    'db_writes': db_write_stats
                 }
             )
             
@@ -119,7 +185,7 @@ class IntegratedAnalysisPipeline:
             
             raise e
     
-    def _run_basic_analysis(self, video, progress_callback):
+    def _run_basic_analysis(self, video, progress_callback, frame_stage=None):
         """기존 기본 분석 실행"""
         try:
             # 기존 EnhancedVideoAnalyzer의 analyze_video_comprehensive 사용
@@ -134,19 +200,20 @@ class IntegratedAnalysisPipeline:
                 basic_results = self.video_analyzer.analyze_video_comprehensive(
                     video, 
                     analysis_type='comprehensive',
-                    progress_callback=basic_progress_callback
+                    progress_callback=basic_progress_callback,
+                    frame_callback=frame_stage
                 )
                 
                 return basic_results
             else:
                 # Fallback: 간단한 프레임 분석
-                return self._fallback_basic_analysis(video, progress_callback)
+                return self._fallback_basic_analysis(video, progress_callback, frame_stage)
                 
         except Exception as e:
             print(f"⚠️ 기본 분석 실패, fallback 사용: {e}")
-            return self._fallback_basic_analysis(video, progress_callback)
+            return self._fallback_basic_analysis(video, progress_callback, frame_stage)
     
-    def _fallback_basic_analysis(self, video, progress_callback):
+    def _fallback_basic_analysis(self, video, progress_callback, frame_stage=None):
         """기본 분석 fallback"""
         # 비디오 파일 경로 찾기
         video_path = self._get_video_path(video)
@@ -158,6 +225,9 @@ class IntegratedAnalysisPipeline:
         total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
         fps = cap.get(cv2.CAP_PROP_FPS)
         
+        if frame_stage is not None:
+            frame_stage.total_frames = total_frames
+        
         frame_results = []
         sample_interval = max(1, total_frames // 50)  # 최대 50개 프레임
         
@@ -187,6 +257,9 @@ class IntegratedAnalysisPipeline:
             
             frame_results.append(frame_data)
             
+            if frame_stage is not None:
+                frame_stage(frame_count, timestamp, frame, detected_objects)
+            
             # 진행률 업데이트
             progress = (frame_count / total_frames) * 100
             if progress_callback and frame_count % 10 == 0:
@@ -205,39 +278,55 @@ class IntegratedAnalysisPipeline:
             'total_frames_analyzed': len(frame_results)
         }
     
-    def _analyze_video_metadata(self, video, basic_results):
-        """비디오 메타데이터 분석"""
+    def _complete_frame_stage(self, video, basic_results, frame_stage):
+        """공유 프레임 단계가 받지 못한 프레임(샤드 분석 등)만 한 번의 순차 디코딩으로 보충"""
+        frame_results = sorted(basic_results.get('frame_results', []), key=lambda f: f.get('image_id', 0))
+        missing = [f for f in frame_results if f.get('image_id') not in frame_stage.observed_frame_ids]
+        if not missing:
+            return
+        
+        video_path = self._get_video_path(video)
+        if not video_path:
+            print("⚠️ 비디오 파일을 찾을 수 없어 프레임 보충 디코딩 생략")
+            return
+        
+        print(f"🔁 비디오 {video.id} 공유 프레임 보충 디코딩: {len(missing)}개 프레임")
+        
+        cap = cv2.VideoCapture(video_path)
         try:
-            print(f"🏞️ 비디오 {video.id} 메타데이터 분석 시작")
-            
-            # 프레임 샘플링으로 메타데이터 분석
-            video_path = self._get_video_path(video)
-            if not video_path:
-                raise Exception("비디오 파일을 찾을 수 없습니다")
+            if not frame_stage.total_frames:
+                frame_stage.total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
             
-            cap = cv2.VideoCapture(video_path)
-            frame_analyses = []
+            seek_threshold = getattr(self.video_analyzer, 'seek_threshold', 48)
+            position = 0  # 다음 read()가 반환할 0-based 위치
             
-            # 10개 프레임 샘플링
-            total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-            sample_indices = [i * (total_frames // 10) for i in range(10)]
-            
-            for frame_idx in sample_indices:
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_idx)
+            for frame_data in missing:
+                frame_id = frame_data.get('image_id', 0)
+                target = frame_id - 1
+                
+                # 가까운 프레임은 grab()으로 건너뛰고, 멀리 떨어져 있을 때만 seek
+                if target < position or target - position >= seek_threshold:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    position = target
+                
+                while position < target and cap.grab():
+                    position += 1
+                
                 ret, frame = cap.read()
                 if not ret:
-                    continue
-                
-                # 날씨 및 시간대 분석
-                weather_analysis = self.metadata_analyzer.analyze_weather_conditions(frame)
-                time_analysis = self.metadata_analyzer.analyze_time_of_day(frame)
+                    break
+                position += 1
                 
-                frame_analyses.append({
-                    'weather': weather_analysis,
-                    'time': time_analysis
-                })
-            
+                frame_stage(frame_id, frame_data.get('timestamp', 0), frame, frame_data.get('objects', []))
+        finally:
             cap.release()
+    
+    def _analyze_video_metadata(self, video, basic_results, frame_stage):
+        """비디오 메타데이터 분석 - 공유 프레임 단계에서 샘플링한 프레임(최대 10개)의 날씨/시간대 집계"""
+        try:
+            print(f"🏞️ 비디오 {video.id} 메타데이터 분석 시작")
+            
+            frame_analyses = frame_stage.metadata_frames
             
             # 메타데이터 집계
             weather_votes = Counter()
@@ -315,74 +404,51 @@ class IntegratedAnalysisPipeline:
                 'overall_contrast': 50.0
             }
     
-    def _analyze_person_attributes(self, video, basic_results):
-        """사람 속성 분석"""
+    def _analyze_person_attributes(self, video, basic_results, frame_stage, db_writer):
+        """사람 속성 분석 - 공유 프레임 단계에서 추출한 속성을 저장/집계"""
         try:
             print(f"👤 비디오 {video.id} 사람 속성 분석 시작")
             
             frame_results = basic_results.get('frame_results', [])
             person_detections = []
-            
-            # 비디오 프레임 재분석 (사람 속성 추출을 위해)
-            video_path = self._get_video_path(video)
-            if not video_path:
-                raise Exception("비디오 파일을 찾을 수 없습니다")
-            
-            cap = cv2.VideoCapture(video_path)
+            frame_pk_map = db_writer.frame_pk_map(video)
             
             for frame_data in frame_results:
                 frame_id = frame_data.get('image_id', 0)
                 timestamp = frame_data.get('timestamp', 0)
                 objects = frame_data.get('objects', [])
                 
-                # 해당 프레임으로 이동
-                cap.set(cv2.CAP_PROP_POS_FRAMES, frame_id - 1)
-                ret, frame = cap.read()
-                if not ret:
-                    continue
-                
-                # 사람 객체들에 대한 속성 분석
+                # 사람 객체들에 대한 속성 (디코딩 실패한 프레임은 속성 없음)
                 for person_idx, obj in enumerate(objects):
-                    if obj.get('class') != 'person':
+                    attributes = frame_stage.person_attributes.get((frame_id, person_idx))
+                    if attributes is None:
                         continue
                     
                     person_bbox = obj.get('bbox', [])
-                    if len(person_bbox) != 4:
-                        continue
                     
-                    # 사람 속성 분석
-                    attributes = self.person_analyzer.analyze_person_attributes(frame, person_bbox)
+                    # PersonDetection 저장 예약 (Frame이 저장된 프레임만)
+                    frame_pk = frame_pk_map.get(frame_id)
                     
-                    # PersonDetection 모델에 저장
-                    try:
-                        # Frame 모델에서 해당 프레임 찾기
-                        frame_obj = Frame.objects.filter(
-                            video=video, 
-                            image_id=frame_id
-                        ).first()
-                        
-                        if frame_obj:
-                            PersonDetection.objects.create(
-                                frame=frame_obj,
-                                person_id=person_idx,
-                                track_id=obj.get('track_id'),
-                                bbox_x1=person_bbox[0],
-                                bbox_y1=person_bbox[1],
-                                bbox_x2=person_bbox[2],
-                                bbox_y2=person_bbox[3],
-                                confidence=obj.get('confidence', 0.5),
-                                gender_estimation=attributes['gender_estimation']['gender'],
-                                gender_confidence=attributes['gender_estimation']['confidence'],
-                                upper_body_color=attributes['upper_body_color']['color'],
-                                upper_color_confidence=attributes['upper_body_color']['confidence'],
-                                lower_body_color=attributes['lower_body_color']['color'],
-                                lower_color_confidence=attributes['lower_body_color']['confidence'],
-                                posture=attributes['posture']['posture'],
-                                posture_confidence=attributes['posture']['confidence'],
-                                detailed_attributes=attributes
-                            )
-                    except Exception as save_error:
-                        print(f"⚠️ PersonDetection 저장 실패: {save_error}")
+                    if frame_pk:
+                        db_writer.add(PersonDetection(
+                            frame_id=frame_pk,
+                            person_id=person_idx,
+                            track_id=obj.get('track_id'),
+                            bbox_x1=person_bbox[0],
+                            bbox_y1=person_bbox[1],
+                            bbox_x2=person_bbox[2],
+                            bbox_y2=person_bbox[3],
+                            confidence=obj.get('confidence', 0.5),
+                            gender_estimation=attributes['gender_estimation']['gender'],
+                            gender_confidence=attributes['gender_estimation']['confidence'],
+                            upper_body_color=attributes['upper_body_color']['color'],
+                            upper_color_confidence=attributes['upper_body_color']['confidence'],
+                            lower_body_color=attributes['lower_body_color']['color'],
+                            lower_color_confidence=attributes['lower_body_color']['confidence'],
+                            posture=attributes['posture']['posture'],
+                            posture_confidence=attributes['posture']['confidence'],
+                            detailed_attributes=attributes
+                        ))
                     
                     person_detections.append({
                         'frame_id': frame_id,
@@ -392,8 +458,6 @@ class IntegratedAnalysisPipeline:
                         'bbox': person_bbox
                     })
             
-            cap.release()
-            
             # 사람 속성 통계 생성
             person_stats = self._generate_person_statistics(person_detections)
             
@@ -493,7 +557,7 @@ class IntegratedAnalysisPipeline:
             print(f"⚠️ 시간별 통계 생성 실패: {e}")
             return {'temporal_stats': []}
     
-    def _analyze_object_tracking(self, video, basic_results):
+    def _analyze_object_tracking(self, video, basic_results, db_writer):
         """객체 추적 분석"""
         try:
             print(f"🎯 비디오 {video.id} 객체 추적 분석 시작")
@@ -551,24 +615,21 @@ class IntegratedAnalysisPipeline:
                 duration = last_detection['timestamp'] - first_detection['timestamp']
                 average_speed = total_distance / duration if duration > 0 else 0
                 
-                # ObjectTracking 모델에 저장
-                try:
-                    ObjectTracking.objects.create(
-                        video=video,
-                        track_id=track_id,
-                        object_class=first_detection['object_class'],
-                        first_appearance=first_detection['timestamp'],
-                        last_appearance=last_detection['timestamp'],
-                        total_duration=duration,
-                        total_detections=len(detections),
-                        tracking_confidence=sum(d['confidence'] for d in detections) / len(detections),
-                        movement_path=movement_path,
-                        movement_distance=total_distance,
-                        average_speed=average_speed,
-                        tracking_quality='high' if len(detections) > 10 else 'medium' if len(detections) > 5 else 'low'
-                    )
-                except Exception as save_error:
-                    print(f"⚠️ ObjectTracking 저장 실패: {save_error}")
+                # ObjectTracking 저장 예약
+                db_writer.add(ObjectTracking(
+                    video=video,
+                    track_id=track_id,
+                    object_class=first_detection['object_class'],
+                    first_appearance=first_detection['timestamp'],
+                    last_appearance=last_detection['timestamp'],
+                    total_duration=duration,
+                    total_detections=len(detections),
+                    tracking_confidence=sum(d['confidence'] for d in detections) / len(detections),
+                    movement_path=movement_path,
+                    movement_distance=total_distance,
+                    average_speed=average_speed,
+                    tracking_quality='high' if len(detections) > 10 else 'medium' if len(detections) > 5 else 'low'
+                ))
                 
                 tracking_results.append({
                     'track_id': track_id,
@@ -590,6 +651,19 @@ class IntegratedAnalysisPipeline:
             print(f"⚠️ 객체 추적 분석 실패: {e}")
             return {'tracks': []}
     
+    def _flush_db_writes(self, video, db_writer):
+        """버퍼링된 PersonDetection/ObjectTracking 행 일괄 저장"""
+        pending = db_writer.pending_count()
+        try:
+            stats = db_writer.flush()
+            skipped = sum(stats['rows_skipped'].values())
+            print(f"✅ 비디오 {video.id} DB 일괄 저장: {stats['total_rows']}행, "
+                  f"{stats['rows_per_second']}행/초" + (f", {skipped}행 건너뜀" if skipped else ""))
+        except Exception as e:
+            print(f"⚠️ DB 일괄 저장 실패 ({pending}행): {e}")
+            stats = db_writer.get_stats()
+        return stats
+    
     def _build_search_index(self, video, all_results):
         """검색 인덱스 구축"""
         try:
@@ -697,6 +771,7 @@ class IntegratedAnalysisPipeline:
             person_results = all_results.get('person', {})
             temporal_results = all_results.get('temporal', {})
             tracking_results = all_results.get('tracking', {})
+            db_write_stats = all_results.get('db_writes', {})
             
             # VideoAnalysis 모델 생성/업데이트
             processing_time = 300  # 임시값 (실제로는 실행 시간 계산)
@@ -778,7 +853,8 @@ class IntegratedAnalysisPipeline:
                     'temporal_segments': temporal_results.get('total_segments', 0),
                     'object_tracks': tracking_results.get('total_tracks', 0),
                     'processing_time_seconds': processing_time,
-                    'analysis_features': analysis_statistics['features_used']
+                    'analysis_features': analysis_statistics['features_used'],
+                    'db_write_stats': db_write_stats
                 }
             }
             
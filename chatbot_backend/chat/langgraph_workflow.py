@@ -3,22 +3,94 @@ from langgraph.graph import StateGraph, END
 from typing import TypedDict, List, Dict, Any, Annotated
 from langchain.schema import BaseMessage
 import asyncio
+import functools
 import logging
 import time
 import json
+import uuid
 from .langchain_config import LangChainManager, GroqLLM
 
 logger = logging.getLogger(__name__)
 
+# 모델 응답 수집 기본 정책
+MODEL_TIMEOUT = 30.0   # 모델별 최대 대기 시간(초)
+MIN_RESPONSES = 2      # 이 수만큼 응답하면 나머지는 유예 시간까지만 대기
+QUORUM_GRACE = 2.0     # 최소 응답 수 충족 후 나머지 모델을 기다리는 시간(초)
+
+
+async def collect_concurrently(calls: Dict[str, Any], timeout: float = MODEL_TIMEOUT,
+                               min_responses: int = MIN_RESPONSES, grace: float = QUORUM_GRACE,
+                               on_response=None):
+    """모델별 코루틴을 동시에 실행하고 응답 수집
+    
+    - 각 모델은 timeout 초 안에 응답해야 합니다.
+    - min_responses개가 응답하면 남은 모델은 grace 초까지만 기다린 뒤 취소합니다.
+    - on_response(model, response, elapsed)는 각 모델이 응답하는 즉시 호출됩니다 (스트리밍용).
+    
+    반환: (responses, timings, errors) - timings[model] = {'status', 'elapsed'}
+    """
+    async def timed(model, coro):
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(coro, timeout)
+            return model, 'success', response, time.perf_counter() - started
+        except asyncio.TimeoutError:
+            return model, 'timeout', f"{timeout:.0f}초 내 응답 없음", time.perf_counter() - started
+        except Exception as e:
+            return model, 'error', str(e), time.perf_counter() - started
+    
+    started = time.perf_counter()
+    tasks = {asyncio.ensure_future(timed(model, coro)): model for model, coro in calls.items()}
+    pending = set(tasks)
+    quorum = min(max(1, min_responses), len(tasks))
+    grace_deadline = None
+    
+    responses, timings, errors = {}, {}, []
+    
+    while pending:
+        wait_timeout = None if grace_deadline is None else max(0.0, grace_deadline - time.perf_counter())
+        done, pending = await asyncio.wait(pending, timeout=wait_timeout, return_when=asyncio.FIRST_COMPLETED)
+        if not done:
+            break  # 유예 시간 만료
+        
+        for task in done:
+            model, status, result, elapsed = task.result()
+            timings[model] = {'status': status, 'elapsed': round(elapsed, 3)}
+            if status == 'success':
+                responses[model] = result
+                if on_response:
+                    try:
+                        on_response(model, result, elapsed)
+                    except Exception as e:
+                        logger.warning(f"{model} 응답 콜백 실패: {e}")
+            else:
+                errors.append(f"{model} 응답 실패: {result}")
+        
+        if grace_deadline is None and len(responses) >= quorum:
+            grace_deadline = time.perf_counter() + grace
+    
+    # 유예 시간 안에 응답하지 않은 모델은 취소 (부분 결과로 진행)
+    for task in pending:
+        task.cancel()
+        model = tasks[task]
+        timings[model] = {'status': 'cancelled', 'elapsed': round(time.perf_counter() - started, 3)}
+        errors.append(f"{model} 응답 취소: 최소 응답 수 충족 후 {grace:.1f}초 유예 시간 초과")
+    if pending:
+        await asyncio.gather(*pending, return_exceptions=True)
+    
+    return responses, timings, errors
+
 # State 정의
 class AIResponseState(TypedDict):
     user_message: str
     user_language: str
     selected_models: List[str]
     request_id: str
+    listener_key: str  # 모델별 응답 콜백 조회 키 (run_workflow 호출마다 고유)
     
     # 각 단계별 결과
     individual_responses: Dict[str, str]
+    model_timings: Dict[str, Dict[str, Any]]
     similarity_analysis: Dict[str, Any]
     final_analysis: Dict[str, Any]
     
@@ -28,11 +100,21 @@ class AIResponseState(TypedDict):
 
 # 워크플로우 클래스
 class AIComparisonWorkflow:
-    def __init__(self, langchain_manager: LangChainManager, similarity_analyzer):
+    def __init__(self, langchain_manager: LangChainManager, similarity_analyzer,
+                 model_timeout: float = MODEL_TIMEOUT, min_responses: int = MIN_RESPONSES,
+                 quorum_grace: float = QUORUM_GRACE):
         self.langchain_manager = langchain_manager
         self.similarity_analyzer = similarity_analyzer
         self.groq_llm = GroqLLM(langchain_manager.groq_key)
         
+        # 응답 수집 정책 (모델별 타임아웃, 최소 응답 수, 유예 시간)
+        self.model_timeout = model_timeout
+        self.min_responses = min_responses
+        self.quorum_grace = quorum_grace
+        
+        # 요청별 응답 콜백 (request_id → on_model_response) - 모델 응답 즉시 스트리밍
+        self._response_listeners = {}
+        
         # 워크플로우 그래프 생성
         self.workflow = self.create_workflow()
     
@@ -96,7 +178,7 @@ class AIComparisonWorkflow:
         logger.info(f"🎯 처리할 모델 목록: {selected_models} (타입: {type(selected_models)})")
         
         # 병렬로 각 모델에서 응답 수집
-        tasks = []
+        calls = {}
         for model in selected_models:
             logger.info(f"📡 {model} 모델 응답 요청 준비 중...")
             
@@ -112,23 +194,22 @@ class AIComparisonWorkflow:
                 errors.append(error_msg)
                 logger.error(f"❌ {error_msg}")
                 continue
-            tasks.append((model, task))
+            calls[model] = task
         
-        logger.info(f"🚀 {len(tasks)}개 모델 병렬 실행 시작")
+        logger.info(f"🚀 {len(calls)}개 모델 병렬 실행 시작")
         
-        # 비동기 실행
-        for model, task in tasks:
-            try:
-                logger.info(f"⏳ {model} 응답 대기 중...")
-                response = await task
-                responses[model] = response
-                logger.info(f"✅ {model} 응답 완료: {response[:50]}...")
-            except Exception as e:
-                error_msg = f"{model} 응답 실패: {str(e)}"
-                errors.append(error_msg)
-                logger.error(error_msg)
+        # 동시 실행 - 모델별 타임아웃, 최소 응답 수 충족 후 유예 시간이 지나면 나머지 취소
+        responses, timings, collect_errors = await collect_concurrently(
+            calls, self.model_timeout, self.min_responses, self.quorum_grace,
+            on_response=self._response_listeners.get(state.get("listener_key"))
+        )
+        errors.extend(collect_errors)
+        
+        for model, timing in timings.items():
+            logger.info(f"⏱️ {model}: {timing['status']} ({timing['elapsed']:.2f}초)")
         
         state["individual_responses"] = responses
+        state["model_timings"] = timings
         state["errors"].extend(errors)
         
         logger.info(f"📊 응답 수집 완료: {len(responses)}개 모델, {len(errors)}개 오류")
@@ -145,11 +226,13 @@ class AIComparisonWorkflow:
                     user_language=language
                 )
             else:
-                # 커스텀 LLM들은 동기 방식 사용
-                result = chain.run(
+                # 커스텀 LLM들은 동기 방식 - 이벤트 루프를 막지 않도록 스레드에서 실행
+                loop = asyncio.get_running_loop()
+                result = await loop.run_in_executor(None, functools.partial(
+                    chain.run,
                     user_input=message,
                     user_language=language
-                )
+                ))
             return result
         except Exception as e:
             logger.error(f"LangChain {model} 에러: {e}")
@@ -171,7 +254,11 @@ class AIComparisonWorkflow:
         try:
             responses = state["individual_responses"]
             if len(responses) >= 2:
-                similarity_result = self.similarity_analyzer.cluster_responses(responses)
+                # 임베딩 계산은 CPU 작업이므로 공유 이벤트 루프를 막지 않도록 스레드에서 실행
+                loop = asyncio.get_running_loop()
+                similarity_result = await loop.run_in_executor(
+                    None, self.similarity_analyzer.cluster_responses, responses
+                )
                 state["similarity_analysis"] = self.convert_to_serializable(similarity_result)
                 logger.info("✅ 유사도 분석 완료")
             else:
@@ -220,13 +307,15 @@ class AIComparisonWorkflow:
                     **formatted
                 )
             else:
-                # 커스텀 LLM들은 동기 방식
-                analysis_result = analysis_chain.run(
+                # 커스텀 LLM들은 동기 방식 - 스레드에서 실행
+                loop = asyncio.get_running_loop()
+                analysis_result = await loop.run_in_executor(None, functools.partial(
+                    analysis_chain.run,
                     query=state["user_message"],
                     user_language=state["user_language"],
                     selected_models=selected_models,
                     **formatted
-                )
+                ))
             
             state["final_analysis"] = analysis_result
             logger.info("✅ 최적 응답 생성 완료")
@@ -302,10 +391,16 @@ class AIComparisonWorkflow:
         }
     
     async def run_workflow(self, user_message: str, selected_models: List[str], 
-                          user_language: str = 'ko', request_id: str = None) -> Dict[str, Any]:
-        """워크플로우 실행"""
+                          user_language: str = 'ko', request_id: str = None,
+                          on_model_response=None) -> Dict[str, Any]:
+        """워크플로우 실행 - on_model_response(model, response, elapsed)는 모델별 응답 즉시 호출"""
         if not request_id:
-            request_id = str(time.time())
+            request_id = str(uuid.uuid4())
+        
+        # 워크플로우는 요청 간에 공유되므로 콜백은 호출마다 새로 만든 키로 등록 (request_id는 호출 측 값이라 중복될 수 있음)
+        listener_key = uuid.uuid4().hex
+        if on_model_response:
+            self._response_listeners[listener_key] = on_model_response
         
         # 초기 상태 설정
         initial_state = AIResponseState(
@@ -313,7 +408,9 @@ class AIComparisonWorkflow:
             user_language=user_language,
             selected_models=selected_models,
             request_id=request_id,
+            listener_key=listener_key,
             individual_responses={},
+            model_timings={},
             similarity_analysis={},
             final_analysis={},
             errors=[],
@@ -331,6 +428,7 @@ class AIComparisonWorkflow:
             return {
                 "request_id": request_id,
                 "individual_responses": final_state["individual_responses"],
+                "model_timings": final_state.get("model_timings", {}),
                 "similarity_analysis": final_state["similarity_analysis"],
                 "final_analysis": final_state["final_analysis"],
                 "errors": final_state["errors"],
@@ -342,8 +440,13 @@ class AIComparisonWorkflow:
             return {
                 "request_id": request_id,
                 "individual_responses": {},
+                "model_timings": {},
                 "similarity_analysis": {},
                 "final_analysis": self.create_fallback_response({}, selected_models),
                 "errors": [str(e)],
                 "final_step": "workflow_failed"
-            }
\ No newline at end of file
+            }
+        
+        finally:
+            # 클라이언트 연결 종료로 취소(CancelledError)된 경우에도 콜백 제거
+            self._response_listeners.pop(listener_key, None)
\ No newline at end of file
@@ -0,0 +1,234 @@
+# chat/llm_gateway.py - 공급자별 토큰 버킷 기반 비동기 LLM 게이트웨이
+"""
+여러 LLM 공급자(Groq → OpenAI → Anthropic 등)를 하나의 진입점으로 호출합니다.
+
+- 공급자별 요청/토큰 분당 한도(RPM/TPM)를 토큰 버킷으로 관리 - 한도가 남아 있으면 대기 없이 호출
+- 동시에 진행 중인 호출 수 제한 (asyncio.Semaphore)
+- 지터를 준 지수 백오프 재시도 후, 등록 순서대로 다음 공급자로 폴백
+- 공급자별 호출/실패/대기 시간 메트릭
+
+공급자는 (prompt, system_prompt, max_tokens, temperature) → str 을 반환하는 임의의 함수로 등록하므로,
+실제 API 대신 로컬 가짜 함수를 넣어 동작을 확인할 수 있습니다.
+"""
+import time
+import random
+import asyncio
+import logging
+import threading
+from functools import partial
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """분당 rate_per_minute 만큼 채워지는 토큰 버킷 (게이트웨이 이벤트 루프 안에서만 사용)"""
+
+    def __init__(self, rate_per_minute):
+        self.capacity = float(rate_per_minute)
+        self.fill_rate = self.capacity / 60.0
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.fill_rate)
+        self.updated = now
+
+    def estimated_wait(self, amount):
+        """지금 amount를 꺼내려면 기다려야 하는 시간(초)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.fill_rate
+
+    async def acquire(self, amount=1):
+        """토큰이 찰 때까지 기다렸다가 꺼냄 → 실제로 기다린 시간(초) 반환. 대기자는 도착 순서대로 처리"""
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                delay = self.estimated_wait(amount)
+                if delay <= 0:
+                    self.tokens -= amount
+                    return waited
+                await asyncio.sleep(delay)
+                waited += delay
+
+
+class LLMProvider:
+    """게이트웨이에 등록되는 LLM 공급자"""
+
+    def __init__(self, name, call, requests_per_minute=30, tokens_per_minute=None, max_wait=30.0,
+                 max_output_tokens=None):
+        self.name = name
+        self.call = call  # (prompt, system_prompt, max_tokens, temperature) -> str (동기 함수)
+        self.max_output_tokens = max_output_tokens  # 모델의 응답 토큰 상한 - 요청 max_tokens를 이 값으로 제한
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        # 한도 대기가 이보다 길면 기다리지 않고 다음 공급자로 폴백 (마지막 공급자는 항상 대기)
+        self.max_wait = max_wait
+        self.metrics = {
+            'requests': 0,
+            'successes': 0,
+            'failures': 0,
+            'retries': 0,
+            'skipped': 0,
+            'rate_limit_wait_seconds': 0.0,
+            'total_latency_seconds': 0.0,
+        }
+
+    def estimated_wait(self, estimated_tokens):
+        wait = self.request_bucket.estimated_wait(1)
+        if self.token_bucket:
+            wait = max(wait, self.token_bucket.estimated_wait(estimated_tokens))
+        return wait
+
+    async def acquire(self, estimated_tokens):
+        waited = await self.request_bucket.acquire(1)
+        if self.token_bucket:
+            waited += await self.token_bucket.acquire(estimated_tokens)
+        self.metrics['rate_limit_wait_seconds'] += waited
+        return waited
+
+
+def _is_rate_limit_error(error):
+    message = str(error).lower()
+    return '429' in message or 'rate_limit' in message or 'rate limit' in message
+
+
+class LLMGateway:
+    """공급자 폴백 순서, 동시 호출 제한, 재시도를 가진 비동기 LLM 게이트웨이
+
+    acomplete()는 게이트웨이 이벤트 루프에서 실행되어야 하며(버킷/세마포어가 루프에 묶임),
+    동기 코드에서는 complete()를 사용합니다.
+    """
+
+    def __init__(self, providers, max_in_flight=4, max_retries=3, backoff_base=1.0, backoff_cap=30.0, loop=None):
+        self.providers = list(providers)
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._loop = loop
+        self._semaphore = None
+        self._in_flight = 0
+        self._queued = 0
+        self._metrics_lock = threading.Lock()
+        self.metrics = {'calls': 0, 'fallbacks': 0, 'exhausted': 0}
+
+    @property
+    def loop(self):
+        if self._loop is None:
+            from .model_registry import get_event_loop
+            self._loop = get_event_loop()
+        return self._loop
+
+    @property
+    def max_output_tokens(self):
+        """모든 공급자가 받아들이는 응답 토큰 상한 (상한이 있는 공급자가 없으면 None)"""
+        limits = [provider.max_output_tokens for provider in self.providers if provider.max_output_tokens]
+        return min(limits) if limits else None
+
+    @staticmethod
+    def estimate_tokens(prompt, system_prompt, max_tokens):
+        """대략적인 토큰 수 (문자 4개당 1토큰) + 응답 최대 토큰"""
+        return (len(prompt) + len(system_prompt)) // 4 + max_tokens
+
+    def complete(self, prompt, system_prompt="", max_tokens=512, temperature=0.6, max_retries=None, timeout=None):
+        """동기 호출 - 게이트웨이 루프에서 acomplete 실행. 모든 공급자가 실패하면 None"""
+        future = asyncio.run_coroutine_threadsafe(
+            self.acomplete(prompt, system_prompt, max_tokens, temperature, max_retries), self.loop
+        )
+        return future.result(timeout)
+
+    async def acomplete(self, prompt, system_prompt="", max_tokens=512, temperature=0.6, max_retries=None):
+        """공급자를 순서대로 시도 → 응답 문자열 또는 None"""
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        with self._metrics_lock:
+            self.metrics['calls'] += 1
+            self._queued += 1
+
+        async with self._semaphore:
+            with self._metrics_lock:
+                self._queued -= 1
+                self._in_flight += 1
+            try:
+                return await self._complete_with_fallback(prompt, system_prompt, max_tokens, temperature,
+                                                          max_retries or self.max_retries)
+            finally:
+                with self._metrics_lock:
+                    self._in_flight -= 1
+
+    async def _complete_with_fallback(self, prompt, system_prompt, max_tokens, temperature, max_retries):
+        for index, provider in enumerate(self.providers):
+            is_last = index == len(self.providers) - 1
+            provider_max_tokens = min(max_tokens, provider.max_output_tokens or max_tokens)
+            estimated_tokens = self.estimate_tokens(prompt, system_prompt, provider_max_tokens)
+            if index > 0:
+                self.metrics['fallbacks'] += 1
+
+            # 한도 대기가 너무 길면 다음 공급자로
+            if not is_last and provider.estimated_wait(estimated_tokens) > provider.max_wait:
+                provider.metrics['skipped'] += 1
+                continue
+
+            content = await self._call_with_retries(provider, prompt, system_prompt, provider_max_tokens,
+                                                    temperature, estimated_tokens, max_retries)
+            if content is not None:
+                return content
+
+        self.metrics['exhausted'] += 1
+        return None
+
+    async def _call_with_retries(self, provider, prompt, system_prompt, max_tokens, temperature,
+                                 estimated_tokens, max_retries):
+        loop = asyncio.get_running_loop()
+
+        for attempt in range(max_retries):
+            await provider.acquire(estimated_tokens)
+            provider.metrics['requests'] += 1
+            started = time.monotonic()
+
+            try:
+                content = await loop.run_in_executor(
+                    None, partial(provider.call, prompt, system_prompt, max_tokens, temperature)
+                )
+                provider.metrics['successes'] += 1
+                provider.metrics['total_latency_seconds'] += time.monotonic() - started
+                return content
+
+            except Exception as e:
+                provider.metrics['failures'] += 1
+                provider.metrics['total_latency_seconds'] += time.monotonic() - started
+                if attempt == max_retries - 1:
+                    logger.warning(f"LLM 공급자 {provider.name} 실패 ({attempt + 1}/{max_retries}): {e}")
+                    break
+
+                # Full jitter 지수 백오프 - 레이트 리밋이면 더 길게
+                base = self.backoff_base * (2 if _is_rate_limit_error(e) else 1)
+                delay = random.uniform(0, min(self.backoff_cap, base * 2 ** attempt))
+                provider.metrics['retries'] += 1
+                logger.info(f"LLM 공급자 {provider.name} 재시도 {attempt + 2}/{max_retries} ({delay:.1f}초 후): {e}")
+                await asyncio.sleep(delay)
+
+        return None
+
+    def get_metrics(self):
+        """게이트웨이/공급자별 메트릭"""
+        with self._metrics_lock:
+            gateway_metrics = {**self.metrics, 'in_flight': self._in_flight, 'queued': self._queued,
+                               'max_in_flight': self.max_in_flight}
+
+        providers = {}
+        for provider in self.providers:
+            metrics = dict(provider.metrics)
+            metrics['avg_latency_seconds'] = (
+                metrics['total_latency_seconds'] / metrics['requests'] if metrics['requests'] else 0.0
+            )
+            providers[provider.name] = metrics
+
+        return {'gateway': gateway_metrics, 'providers': providers}
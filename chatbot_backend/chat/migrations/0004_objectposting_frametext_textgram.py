@@ -0,0 +1,65 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0003_rename_analysis_summary_video_api_cost_tracking_and_more'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ObjectPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frame_id', models.IntegerField()),
+                ('timestamp', models.FloatField()),
+                ('object_class', models.CharField(max_length=50)),
+                ('color', models.CharField(blank=True, max_length=20)),
+                ('color_description', models.CharField(blank=True, max_length=100)),
+                ('colors', models.JSONField(default=list)),
+                ('track_id', models.IntegerField(blank=True, null=True)),
+                ('confidence', models.FloatField(default=0.0)),
+                ('bbox', models.JSONField(default=list)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='object_postings', to='chat.video')),
+            ],
+            options={
+                'db_table': 'object_postings',
+                'indexes': [models.Index(fields=['object_class', 'video', 'timestamp'], name='object_post_object__0cba13_idx'), models.Index(fields=['color', 'object_class'], name='object_post_color_139ab0_idx'), models.Index(fields=['video', 'track_id'], name='object_post_video_i_0d6ebd_idx'), models.Index(fields=['video', 'timestamp'], name='object_post_video_i_615dea_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='FrameText',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frame_id', models.IntegerField()),
+                ('timestamp', models.FloatField()),
+                ('source', models.CharField(choices=[('ocr', 'OCR'), ('caption', '캡션')], max_length=20)),
+                ('text', models.TextField()),
+                ('details', models.JSONField(blank=True, default=list)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='frame_texts', to='chat.video')),
+            ],
+            options={
+                'db_table': 'frame_texts',
+                'indexes': [models.Index(fields=['source', 'video', 'timestamp'], name='frame_texts_source_242f2f_idx')],
+                'unique_together': {('video', 'frame_id', 'source')},
+            },
+        ),
+        migrations.CreateModel(
+            name='TextGram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('frame_id', models.IntegerField()),
+                ('source', models.CharField(max_length=20)),
+                ('gram', models.CharField(max_length=8)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='text_grams', to='chat.video')),
+            ],
+            options={
+                'db_table': 'text_grams',
+                'indexes': [models.Index(fields=['gram', 'source', 'video'], name='text_grams_gram_b6b0a6_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0004_objectposting_frametext_textgram'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='frame',
+            index=models.Index(fields=['video', 'timestamp'], name='chat_frame_video_i_4c9031_idx'),
+        ),
+    ]
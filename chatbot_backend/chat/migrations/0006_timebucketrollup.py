@@ -0,0 +1,35 @@
+# Generated by Django 4.2.18 on 2026-10-17 00:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('chat', '0005_frame_video_timestamp_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TimeBucketRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resolution', models.IntegerField()),
+                ('bucket', models.IntegerField()),
+                ('frame_count', models.IntegerField(default=0)),
+                ('object_count', models.IntegerField(default=0)),
+                ('person_count', models.IntegerField(default=0)),
+                ('class_counts', models.JSONField(default=dict)),
+                ('gender_counts', models.JSONField(default=dict)),
+                ('person_color_counts', models.JSONField(default=dict)),
+                ('upper_color_counts', models.JSONField(default=dict)),
+                ('track_ids', models.JSONField(default=list)),
+                ('video', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='time_rollups', to='chat.video')),
+            ],
+            options={
+                'db_table': 'time_bucket_rollups',
+                'unique_together': {('video', 'resolution', 'bucket')},
+            },
+        ),
+    ]
@@ -0,0 +1,166 @@
+# chat/model_registry.py - 프로세스 단위 모델/클라이언트 레지스트리
+"""
+무거운 모델과 API 클라이언트를 프로세스당 한 번만 생성하여 공유합니다.
+
+DRF는 요청마다 View 인스턴스를 새로 만들기 때문에, View.__init__에서 SentenceTransformer나
+LangGraph 워크플로우를 만들면 요청마다 수 초의 로딩이 반복됩니다. 각 컴포넌트는 처음
+요청될 때 생성되며(지연 초기화), ChatConfig.ready()에서 미리 워밍업할 수도 있습니다.
+"""
+import os
+import asyncio
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+_instances = {}
+_registry_lock = threading.Lock()
+_component_locks = {}
+
+
+def _create_similarity_analyzer():
+    from .similarity_analyzer import SimilarityAnalyzer
+    return SimilarityAnalyzer(threshold=0.85)
+
+
+def _create_langchain_manager():
+    from .langchain_config import LangChainManager
+    return LangChainManager(
+        openai_key=os.getenv("OPENAI_API_KEY"),
+        anthropic_key=os.getenv("ANTHROPIC_API_KEY"),
+        groq_key=os.getenv("GROQ_API_KEY")
+    )
+
+
+def _create_ai_workflow():
+    from .langgraph_workflow import AIComparisonWorkflow
+    return AIComparisonWorkflow(
+        langchain_manager=get_langchain_manager(),
+        similarity_analyzer=get_similarity_analyzer()
+    )
+
+
+def _create_multi_ai_service():
+    from .multi_ai_views import MultiAIService
+    return MultiAIService()
+
+
+def _create_llm_client():
+    from .llm_client import get_llm_client
+    return get_llm_client()
+
+
+def _create_ollama_client():
+    from .ollama_client import get_ollama_client
+    return get_ollama_client()
+
+
+def _create_video_analyzer():
+    from .video_analyzer import get_video_analyzer
+    return get_video_analyzer()
+
+
+def _create_rag_system():
+    from .db_builder import get_video_rag_system
+    return get_video_rag_system()
+
+
+def _create_event_loop():
+    """요청 간 공유하는 백그라운드 asyncio 이벤트 루프 (요청마다 새 루프를 만들지 않음)"""
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name='shared-event-loop', daemon=True).start()
+    return loop
+
+
+COMPONENT_FACTORIES = {
+    'similarity_analyzer': _create_similarity_analyzer,
+    'langchain_manager': _create_langchain_manager,
+    'ai_workflow': _create_ai_workflow,
+    'multi_ai_service': _create_multi_ai_service,
+    'llm_client': _create_llm_client,
+    'ollama_client': _create_ollama_client,
+    'video_analyzer': _create_video_analyzer,
+    'rag_system': _create_rag_system,
+    'event_loop': _create_event_loop,
+}
+
+
+def get_component(name, factory=None):
+    """컴포넌트 인스턴스 반환 - 없으면 생성 (스레드 안전, 프로세스당 1회)
+
+    factory를 주면 등록되지 않은 이름도 같은 방식으로 한 번만 생성/실행합니다.
+    """
+    if name in _instances:
+        return _instances[name]
+
+    # 컴포넌트별 락 - 서로 의존하는 컴포넌트(ai_workflow → langchain_manager)도 교착 없이 생성
+    with _registry_lock:
+        lock = _component_locks.setdefault(name, threading.Lock())
+
+    with lock:
+        # 더블 체크 - 다른 스레드가 이미 생성했을 수 있음
+        if name in _instances:
+            return _instances[name]
+
+        factory = factory or COMPONENT_FACTORIES.get(name)
+        if factory is None:
+            raise KeyError(f"등록되지 않은 컴포넌트: {name}")
+
+        logger.info(f"모델 레지스트리: {name} 생성 중")
+        instance = factory()
+        _instances[name] = instance
+        return instance
+
+
+def get_similarity_analyzer():
+    return get_component('similarity_analyzer')
+
+
+def get_langchain_manager():
+    return get_component('langchain_manager')
+
+
+def get_ai_workflow():
+    return get_component('ai_workflow')
+
+
+def get_multi_ai_service():
+    return get_component('multi_ai_service')
+
+
+def get_llm_client():
+    return get_component('llm_client')
+
+
+def get_ollama_client():
+    return get_component('ollama_client')
+
+
+def get_video_analyzer():
+    return get_component('video_analyzer')
+
+
+def get_rag_system():
+    return get_component('rag_system')
+
+
+def get_event_loop():
+    return get_component('event_loop')
+
+
+def warm_up(names=None):
+    """지정한 컴포넌트들을 미리 생성 (기본: 등록된 전체). 실패한 컴포넌트는 첫 요청 때 다시 시도"""
+    loaded = []
+    for name in names or COMPONENT_FACTORIES:
+        try:
+            get_component(name)
+            loaded.append(name)
+        except Exception as e:
+            logger.warning(f"모델 레지스트리 워밍업 실패 ({name}): {e}")
+    logger.info(f"모델 레지스트리 워밍업 완료: {', '.join(loaded)}")
+    return loaded
+
+
+def get_registry_status():
+    """생성된 컴포넌트 목록"""
+    return {name: name in _instances for name in COMPONENT_FACTORIES}
@@ -586,6 +586,9 @@ class Frame(models.Model):
     class Meta:
         unique_together = ['video', 'image_id']
         ordering = ['image_id']
+        indexes = [
+            models.Index(fields=['video', 'timestamp']),  # 시간 범위 조회 (시간대별 분석, 채팅 시간 슬롯)
+        ]
 
     def __str__(self):
         return f"Frame {self.image_id} of {self.video.original_name}"
@@ -1046,6 +1049,103 @@ class VideoSearchIndex(models.Model):
         db_table = 'video_search_index'
 
 
+class ObjectPosting(models.Model):
+    """객체 역색인 - (객체 클래스, 색상, 트랙) → (비디오, 프레임, 시각, 신뢰도)
+    
+    분석 시점에 샘플링된 모든 프레임의 감지 객체를 한 행씩 저장합니다 (chat/search_index.py).
+    """
+    video = models.ForeignKey('Video', on_delete=models.CASCADE, related_name='object_postings')
+    frame_id = models.IntegerField()  # Frame.image_id와 동일한 프레임 번호
+    timestamp = models.FloatField()
+    
+    object_class = models.CharField(max_length=50)
+    color = models.CharField(max_length=20, blank=True)  # 주요 색상 (colors의 첫 번째)
+    color_description = models.CharField(max_length=100, blank=True)
+    colors = models.JSONField(default=list)
+    track_id = models.IntegerField(null=True, blank=True)
+    
+    confidence = models.FloatField(default=0.0)
+    bbox = models.JSONField(default=list)
+    
+    def __str__(self):
+        return f"{self.object_class} @ {self.timestamp:.1f}s in video {self.video_id}"
+    
+    class Meta:
+        db_table = 'object_postings'
+        indexes = [
+            models.Index(fields=['object_class', 'video', 'timestamp']),
+            models.Index(fields=['color', 'object_class']),
+            models.Index(fields=['video', 'track_id']),
+            models.Index(fields=['video', 'timestamp']),
+        ]
+
+
+class FrameText(models.Model):
+    """프레임별 텍스트 (OCR/캡션) - 텍스트 검색 결과 확인 및 표시용 원문"""
+    SOURCE_CHOICES = [
+        ('ocr', 'OCR'),
+        ('caption', '캡션'),
+    ]
+    
+    video = models.ForeignKey('Video', on_delete=models.CASCADE, related_name='frame_texts')
+    frame_id = models.IntegerField()
+    timestamp = models.FloatField()
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES)
+    text = models.TextField()
+    details = models.JSONField(default=list, blank=True)  # OCR 텍스트별 상세 (bbox, 신뢰도)
+    
+    def __str__(self):
+        return f"{self.source} text of frame {self.frame_id} in video {self.video_id}"
+    
+    class Meta:
+        db_table = 'frame_texts'
+        unique_together = ['video', 'frame_id', 'source']
+        indexes = [
+            models.Index(fields=['source', 'video', 'timestamp']),
+        ]
+
+
+class TextGram(models.Model):
+    """텍스트 n-gram 역색인 - gram → (비디오, 프레임, 출처)"""
+    video = models.ForeignKey('Video', on_delete=models.CASCADE, related_name='text_grams')
+    frame_id = models.IntegerField()
+    source = models.CharField(max_length=20)
+    gram = models.CharField(max_length=8)
+    
+    def __str__(self):
+        return f"'{self.gram}' in frame {self.frame_id} of video {self.video_id}"
+    
+    class Meta:
+        db_table = 'text_grams'
+        indexes = [
+            models.Index(fields=['gram', 'source', 'video']),
+        ]
+
+
+class TimeBucketRollup(models.Model):
+    """비디오 시간 구간별 집계 - 5초/30초/5분 해상도로 분석 종료 시 생성, 시간대별 통계는 구간 합으로 계산"""
+    video = models.ForeignKey('Video', on_delete=models.CASCADE, related_name='time_rollups')
+    resolution = models.IntegerField()  # 구간 길이 (초)
+    bucket = models.IntegerField()      # 구간 번호 (시작 시각 = bucket * resolution)
+    
+    frame_count = models.IntegerField(default=0)
+    object_count = models.IntegerField(default=0)
+    person_count = models.IntegerField(default=0)
+    
+    class_counts = models.JSONField(default=dict)         # 객체 클래스 → 검출 수
+    gender_counts = models.JSONField(default=dict)        # male/female/male_guess/female_guess/unknown → 사람 수
+    person_color_counts = models.JSONField(default=dict)  # 사람 color_description → 수
+    upper_color_counts = models.JSONField(default=dict)   # 사람 상의 색상 (person_attributes) → 수
+    track_ids = models.JSONField(default=list)            # 구간에 등장한 사람 트랙 ID
+    
+    def __str__(self):
+        return f"Rollup {self.resolution}s #{self.bucket} of video {self.video_id}"
+    
+    class Meta:
+        db_table = 'time_bucket_rollups'
+        unique_together = ['video', 'resolution', 'bucket']
+
+
 class SearchQuery(models.Model):
     """검색 쿼리 로그 및 결과 캐싱"""
     query_text = models.TextField()
@@ -314,7 +314,7 @@ class SimpleMultiLLMAnalyzer:
     """간단한 멀티 LLM 분석기"""
     
     def __init__(self):
-        self.multi_ai_service = MultiAIService()
+        self.multi_ai_service = get_multi_ai_service()
         print("멀티 LLM 분석기 초기화 완료")
     
     def analyze_video_multi_llm(self, frame_images, user_query, video_context):
@@ -393,15 +393,12 @@ class SimpleMultiLLMAnalyzer:
 
 
 # 전역 인스턴스 (싱글톤)
-_multi_ai_service_instance = None
 _multi_llm_analyzer_instance = None
 
 def get_multi_ai_service():
-    """멀티 AI 서비스 인스턴스 반환"""
-    global _multi_ai_service_instance
-    if _multi_ai_service_instance is None:
-        _multi_ai_service_instance = MultiAIService()
-    return _multi_ai_service_instance
+    """멀티 AI 서비스 인스턴스 반환 (프로세스 단위 모델 레지스트리와 공유)"""
+    from .model_registry import get_multi_ai_service as get_shared_multi_ai_service
+    return get_shared_multi_ai_service()
 
 def get_multi_llm_analyzer():
     """멀티 LLM 분석기 인스턴스 반환"""
@@ -2,7 +2,10 @@ import asyncio
 import concurrent.futures
 import re
 import os
+import time
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import logging
 import base64
@@ -13,38 +16,121 @@ import pytesseract
 logger = logging.getLogger(__name__)
 
 class OllamaClient:
-    def __init__(self, base_url=None):
+    """Ollama API 클라이언트 - 프로세스당 하나를 공유 (get_ollama_client)
+    
+    - requests.Session 연결 풀로 요청마다 TCP 연결을 새로 맺지 않음
+    - 사용 가능한 모델 목록(/api/tags)은 생성 시 조회하지 않고 처음 필요할 때 조회하여 TTL 동안 캐시
+    - 비동기 요청(agenerate)은 max_concurrency 크기의 공유 스레드 풀에서 실행되어 동시 요청 수가 제한됨
+    - stream_generate로 응답을 조각 단위로 받을 수 있음
+    """
+    
+    def __init__(self, base_url=None, models_ttl=300, unavailable_ttl=30, max_concurrency=4, pool_size=10):
         # 기본 주소 설정
         if base_url is None:
             # 먼저 환경 변수 확인
             base_url = os.environ.get('OLLAMA_API_URL', 'http://localhost:11434')
         self.base_url = base_url
-        self.is_server_available = False
         
-        # 서버 연결 테스트
-        try:
-            response = requests.get(f"{self.base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                self.is_server_available = True
-                logger.info(f"Ollama 서버 연결 성공: {self.base_url}")
-                # 사용 가능한 모델 확인
-                models_data = response.json()
-                available_models = models_data.get('models', [])
-                if available_models:
-                    model_names = [model.get('name') for model in available_models]
-                    logger.info(f"사용 가능한 모델: {', '.join(model_names)}")
-                    self.available_models = model_names
+        # 연결 풀을 가진 공유 세션
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        
+        # 모델 목록 TTL 캐시 (서버에 연결하지 못한 경우에는 더 짧은 주기로 재확인)
+        self.models_ttl = models_ttl
+        self.unavailable_ttl = unavailable_ttl
+        self._models_lock = threading.Lock()
+        self._models_checked_at = None
+        self._is_server_available = False
+        self._available_models = []
+        
+        # 비동기 요청 동시 실행 제한
+        self.max_concurrency = max_concurrency
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix='ollama'
+        )
+    
+    def _refresh_models(self, force=False):
+        """/api/tags로 서버 상태와 모델 목록 확인 - TTL 이내면 캐시 사용"""
+        with self._models_lock:
+            ttl = self.models_ttl if self._is_server_available else self.unavailable_ttl
+            if not force and self._models_checked_at is not None and time.monotonic() - self._models_checked_at < ttl:
+                return
+            
+            # 서버 연결 테스트
+            try:
+                response = self.session.get(f"{self.base_url}/api/tags", timeout=5)
+                if response.status_code == 200:
+                    self._is_server_available = True
+                    logger.info(f"Ollama 서버 연결 성공: {self.base_url}")
+                    # 사용 가능한 모델 확인
+                    models_data = response.json()
+                    available_models = models_data.get('models', [])
+                    if available_models:
+                        model_names = [model.get('name') for model in available_models]
+                        logger.info(f"사용 가능한 모델: {', '.join(model_names)}")
+                        self._available_models = model_names
+                    else:
+                        logger.warning("사용 가능한 모델이 없습니다.")
+                        self._available_models = []
                 else:
-                    logger.warning("사용 가능한 모델이 없습니다.")
-                    self.available_models = []
-            else:
-                logger.error(f"Ollama 서버 연결 실패: {response.status_code}")
-        except Exception as e:
-            logger.error(f"Ollama 서버 연결 시도 중 오류: {str(e)}")
-            self.available_models = []
+                    logger.error(f"Ollama 서버 연결 실패: {response.status_code}")
+                    self._is_server_available = False
+                    self._available_models = []
+            except Exception as e:
+                logger.error(f"Ollama 서버 연결 시도 중 오류: {str(e)}")
+                self._is_server_available = False
+                self._available_models = []
+            
+            self._models_checked_at = time.monotonic()
+    
+    @property
+    def is_server_available(self):
+        self._refresh_models()
+        return self._is_server_available
     
-    def preprocess_image_for_ocr(self, image):
-        """OCR 인식률 향상을 위한 이미지 전처리"""
+    @property
+    def available_models(self):
+        self._refresh_models()
+        return self._available_models
+    
+    def _post_generate(self, payload, timeout):
+        """/api/generate 호출 (연결 풀 세션 사용) → requests.Response"""
+        return self.session.post(f"{self.base_url}/api/generate", json=payload, timeout=timeout)
+    
+    def generate(self, payload, timeout=180):
+        """/api/generate 동기 호출 → 응답 텍스트 (HTTP 오류 시 예외)"""
+        response = self._post_generate(dict(payload, stream=False), timeout)
+        if response.status_code != 200:
+            raise Exception(f"Ollama API 오류: {response.status_code}")
+        return response.json().get("response", "응답을 받지 못했습니다.")
+    
+    async def agenerate(self, payload, timeout=180):
+        """/api/generate 비동기 호출 - 공유 스레드 풀(max_concurrency)에서 실행되어 동시 요청 수 제한"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._executor, self.generate, payload, timeout)
+    
+    def stream_generate(self, payload, timeout=180):
+        """/api/generate 스트리밍 호출 - 생성되는 응답 조각을 순서대로 yield"""
+        with self.session.post(f"{self.base_url}/api/generate", json=dict(payload, stream=True),
+                               timeout=timeout, stream=True) as response:
+            if response.status_code != 200:
+                raise Exception(f"Ollama API 오류: {response.status_code}")
+            
+            # 응답은 줄 단위 JSON: {"response": "...", "done": false} ... {"done": true}
+            for line in response.iter_lines():
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                if chunk.get("response"):
+                    yield chunk["response"]
+                if chunk.get("done"):
+                    break
+    
+    @staticmethod
+    def preprocess_image_for_ocr(image):
+        """OCR 인식률 향상을 위한 이미지 전처리 (서버 연결 없이 호출 가능 - PDF OCR 워커에서도 사용)"""
         # 그레이스케일 변환
         if image.mode != 'L':
             image = image.convert('L')
@@ -62,13 +148,14 @@ class OllamaClient:
         
         return image
     
-    def get_optimized_ocr_text(self, image, lang='kor+eng'):
-        """최적화된 OCR 설정으로 텍스트 추출"""
+    @staticmethod
+    def get_optimized_ocr_text(image, lang='kor+eng', timeout=0):
+        """최적화된 OCR 설정으로 텍스트 추출 (timeout초 초과 시 tesseract 종료 후 RuntimeError, 0이면 무제한)"""
         # 한국어 인식에 최적화된 Tesseract 설정
         custom_config = r'--oem 1 --psm 6 -c preserve_interword_spaces=1 -c textord_min_linesize=3'
         
         # OCR 실행
-        text = pytesseract.image_to_string(image, lang=lang, config=custom_config)
+        text = pytesseract.image_to_string(image, lang=lang, config=custom_config, timeout=timeout)
         
         # 불필요한 공백 정리
         text = ' '.join(text.split())
@@ -162,11 +249,7 @@ class OllamaClient:
             
             # 관련성 판단 API 호출
             logger.info(f"텍스트 관련성 확인 API 호출: 모델 {model}")
-            relevance_response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=relevance_payload,
-                timeout=60
-            )
+            relevance_response = self._post_generate(relevance_payload, timeout=60)
             
             # 응답 처리
             if relevance_response.status_code == 200:
@@ -285,11 +368,7 @@ OCR 텍스트: {ocr_text}
             
             logger.info(f"Ollama API 요청: /api/generate (이미지 분석) 모델: {model}")
             # API 호출
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json=payload,
-                timeout=180  # 타임아웃 3분으로 연장
-            )
+            response = self._post_generate(payload, timeout=180)  # 타임아웃 3분으로 연장
             
             # 응답 처리 및 로깅
             logger.info(f"Ollama API 응답 상태 코드: {response.status_code}")
@@ -498,11 +577,7 @@ OCR 텍스트: {ocr_text}
                     }
                     
                     # API 호출
-                    response = requests.post(
-                        f"{self.base_url}/api/generate",
-                        json=payload,
-                        timeout=300  # 시간 증가
-                    )
+                    response = self._post_generate(payload, timeout=300)  # 시간 증가
                     
                     if response.status_code == 200:
                         response_data = response.json()
@@ -513,9 +588,6 @@ OCR 텍스트: {ocr_text}
                 elif analyze_by_page:
                     # 방법 2: 비동기 처리로 여러 페이지 동시에 처리
                     async def process_pages():
-                        # 최대 동시 작업 수 제한
-                        max_workers = min(5, len(pages))  # 최대 5개 페이지 동시 처리
-                        
                         async def analyze_page(page_data):
                             page_num = page_data.get("page", 1)
                             page_text = page_data.get("text", "")
@@ -534,31 +606,20 @@ OCR 텍스트: {ocr_text}
         단, 문장이나 단어가 아니라고 생각될 경우 분석하지 않아도 됩니다. 또는 정보 없음이라고 출력
         반드시 "영어(En)"로 응답해주세요."""
                             
-                            # ThreadPoolExecutor를 사용하여 비동기 HTTP 요청
-                            with concurrent.futures.ThreadPoolExecutor() as executor:
-                                page_payload = {
-                                    "model": model,
-                                    "prompt": page_prompt,
-                                    "stream": False,
-                                    "temperature": 0.3,
-                                    "max_tokens": 1024
-                                }
-                                
-                                def make_request():
-                                    try:
-                                        r = requests.post(
-                                            f"{self.base_url}/api/generate",
-                                            json=page_payload,
-                                            timeout=180
-                                        )
-                                        if r.status_code == 200:
-                                            data = r.json()
-                                            return f"===== 페이지 {page_num} =====\n{data.get('response', '분석 실패')}"
-                                        return f"===== 페이지 {page_num} =====\n페이지 분석 중 오류 발생: {r.status_code}"
-                                    except Exception as e:
-                                        return f"===== 페이지 {page_num} =====\n페이지 분석 중 오류 발생: {str(e)}"
-                                
-                                return await asyncio.get_event_loop().run_in_executor(executor, make_request)
+                            page_payload = {
+                                "model": model,
+                                "prompt": page_prompt,
+                                "stream": False,
+                                "temperature": 0.3,
+                                "max_tokens": 1024
+                            }
+                            
+                            # 공유 스레드 풀에서 실행 (페이지마다 스레드 풀을 새로 만들지 않음)
+                            try:
+                                result = await self.agenerate(page_payload, timeout=180)
+                                return f"===== 페이지 {page_num} =====\n{result}"
+                            except Exception as e:
+                                return f"===== 페이지 {page_num} =====\n페이지 분석 중 오류 발생: {str(e)}"
                         
                         # 페이지 그룹화 - 2페이지씩 묶기
                         grouped_pages = []
@@ -578,13 +639,9 @@ OCR 텍스트: {ocr_text}
                         results = await asyncio.gather(*tasks)
                         return "\n\n".join(results)
                     
-                    # 비동기 실행 결과 반환
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(process_pages())
-                    finally:
-                        loop.close()
+                    # 요청 간 공유하는 이벤트 루프에서 실행 (요청마다 새 루프를 만들지 않음)
+                    from .model_registry import get_event_loop
+                    return asyncio.run_coroutine_threadsafe(process_pages(), get_event_loop()).result()
                 else:
                     # 기존 방식 - 단일 문서 또는 적은 페이지 수
                     prompt = f"""다음 텍스트를 자세히 분석하고 내용을 명확하게 정리해주세요:
@@ -617,11 +674,7 @@ OCR 텍스트: {ocr_text}
                     }
                     
                     # API 호출
-                    response = requests.post(
-                        f"{self.base_url}/api/generate",
-                        json=payload,
-                        timeout=180
-                    )
+                    response = self._post_generate(payload, timeout=180)
                     
                     if response.status_code == 200:
                         response_data = response.json()
@@ -633,3 +686,19 @@ OCR 텍스트: {ocr_text}
                 logger.error(f"Ollama 텍스트 분석 오류: {str(e)}")
                 return f"텍스트 분석 처리 중 오류가 발생했습니다: {str(e)}"
 
+
+# 전역 OllamaClient 인스턴스 (base_url별 1개)
+_ollama_clients = {}
+_ollama_clients_lock = threading.Lock()
+
+def get_ollama_client(base_url=None):
+    """프로세스 전역 OllamaClient 반환 - 연결 풀과 모델 목록 캐시를 요청 간 공유"""
+    base_url = base_url or os.environ.get('OLLAMA_API_URL', 'http://localhost:11434')
+    
+    with _ollama_clients_lock:
+        if base_url not in _ollama_clients:
+            _ollama_clients[base_url] = OllamaClient(
+                base_url=base_url,
+                max_concurrency=int(os.environ.get('OLLAMA_MAX_CONCURRENCY', 4))
+            )
+        return _ollama_clients[base_url]
@@ -0,0 +1,182 @@
+# chat/pdf_ocr.py - PDF 페이지 단위 스트리밍 OCR
+"""
+스캔 PDF를 페이지 단위로 래스터화 → 전처리 → Tesseract OCR 하여 페이지 순서대로 결과를 내보냅니다.
+
+기존 ProcessFileView.ocr_pdf_by_pages는 convert_from_path로 범위 전체를 300dpi 이미지로 한 번에
+만든 뒤 한 코어에서 순서대로 OCR 했기 때문에, 100페이지 문서면 수 GB 메모리와 수 분이 걸렸습니다.
+여기서는 각 워커 프로세스가 자기 페이지만 래스터화하므로, 동시에 메모리에 올라가는 페이지 이미지는
+워커 수만큼이며 워커 수는 메모리 상한(memory_limit_mb)으로 제한됩니다.
+"""
+import os
+import re
+import logging
+import unicodedata
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+
+from pdf2image import convert_from_path, pdfinfo_from_path
+
+from .ollama_client import OllamaClient
+
+logger = logging.getLogger(__name__)
+
+# 래스터 픽셀당 대략적인 메모리 사용량 (RGB 원본 + 그레이/블러/대비 사본 + 2배 업스케일 + tesseract 내부 사본)
+_BYTES_PER_RASTER_PIXEL = 12
+_DEFAULT_PAGE_SIZE_PTS = (595.0, 842.0)  # A4
+
+
+# 텍스트 레이어 품질 판단에 쓰는 문자 분류
+_CID_PATTERN = re.compile(r'\(cid:\d+\)')
+_READABLE_CATEGORIES = ('L', 'N', 'P', 'S', 'Z')  # 문자/숫자/구두점/기호/공백 (한자·악센트 라틴 포함)
+
+
+def _is_readable_char(c):
+    """유니코드 범주 기준 읽을 수 있는 문자 - 사용자 정의(Co)/미할당(Cn)/제어 문자(Cc, 공백 제외)와 U+FFFD 제외"""
+    if c == '\ufffd':
+        return False
+    return c.isspace() or unicodedata.category(c)[0] in _READABLE_CATEGORIES
+
+
+def _env_int(name, default):
+    try:
+        return int(os.environ.get(name, default))
+    except (TypeError, ValueError):
+        return default
+
+
+def estimate_page_memory_mb(page_size_pts, dpi):
+    """한 페이지 처리 중 최대 메모리 (MB) 추정"""
+    width_pts, height_pts = page_size_pts
+    pixels = (width_pts / 72.0 * dpi) * (height_pts / 72.0 * dpi)
+    return pixels * _BYTES_PER_RASTER_PIXEL / (1024 * 1024)
+
+
+def _parse_page_size(info):
+    """pdfinfo의 'Page size' (예: '595.28 x 841.89 pts (A4)') → (가로, 세로) pt"""
+    match = re.match(r'\s*([\d.]+)\s*x\s*([\d.]+)', str(info.get('Page size', '')))
+    if not match:
+        return _DEFAULT_PAGE_SIZE_PTS
+    return float(match.group(1)), float(match.group(2))
+
+
+def is_usable_text_layer(text, min_chars=30, min_readable_ratio=0.85):
+    """PDF 텍스트 레이어로 추출한 한 페이지 텍스트를 그대로 써도 되는지 판단
+
+    이미지뿐인 페이지(텍스트가 거의 없음)와 깨진 페이지(글꼴 매핑이 없어 (cid:123)·대체 문자·
+    제어 문자 등 읽을 수 없는 문자가 많음)는 False → OCR 대상
+    """
+    if not text:
+        return False
+
+    stripped = text.strip()
+    if sum(1 for c in stripped if c.isalnum()) < min_chars:
+        return False
+
+    if stripped.count('\ufffd') + len(_CID_PATTERN.findall(stripped)) * 3 > len(stripped) * 0.05:
+        return False
+
+    readable = sum(1 for c in stripped if _is_readable_char(c))
+    return readable / len(stripped) >= min_readable_ratio
+
+
+def _init_ocr_worker():
+    """OCR 워커 초기화 - 워커마다 tesseract가 여러 스레드를 띄워 코어를 과점유하지 않도록 1스레드로 제한"""
+    os.environ['OMP_THREAD_LIMIT'] = '1'
+
+
+def ocr_pdf_page(pdf_path, page_num, dpi=300, lang='kor+eng', timeout=0):
+    """한 페이지만 래스터화하여 OCR → {'page', 'text'} (워커 프로세스/현재 프로세스 공용)"""
+    images = convert_from_path(
+        pdf_path,
+        dpi=dpi,
+        first_page=page_num,
+        last_page=page_num,
+        timeout=timeout or None
+    )
+    if not images:
+        return {"page": page_num, "text": ""}
+
+    image = images[0]
+    try:
+        preprocessed_img = OllamaClient.preprocess_image_for_ocr(image)
+        text = OllamaClient.get_optimized_ocr_text(preprocessed_img, lang=lang, timeout=timeout)
+    finally:
+        image.close()
+
+    return {"page": page_num, "text": text}
+
+
+def _failed_page(page_num, error):
+    logger.warning(f"PDF {page_num}페이지 OCR 실패: {error}")
+    return {"page": page_num, "text": "", "error": str(error)}
+
+
+def iter_pdf_ocr_pages(pdf_path, start_page=1, end_page=0, dpi=300, lang='kor+eng', max_workers=None,
+                       memory_limit_mb=None, page_timeout=None, page_numbers=None):
+    """PDF 페이지를 병렬 OCR 하여 페이지 순서대로 yield
+
+    - end_page <= 0 이면 마지막 페이지까지
+    - page_numbers: OCR 할 페이지 번호 목록 (주면 start_page/end_page 범위 안의 해당 페이지만 처리)
+    - max_workers: 워커 프로세스 수 상한 (기본: CPU 수, 환경 변수 PDF_OCR_WORKERS)
+    - memory_limit_mb: 동시에 처리 중인 페이지들의 메모리 상한 (기본 1024, PDF_OCR_MEMORY_LIMIT_MB)
+    - page_timeout: 페이지당 래스터화/OCR 제한 시간(초) (기본 120, PDF_OCR_PAGE_TIMEOUT).
+      초과하거나 실패한 페이지는 text가 빈 문자열이고 'error' 키가 있는 결과로 내보냅니다.
+    """
+    max_workers = max_workers or _env_int('PDF_OCR_WORKERS', os.cpu_count() or 1)
+    memory_limit_mb = memory_limit_mb or _env_int('PDF_OCR_MEMORY_LIMIT_MB', 1024)
+    page_timeout = page_timeout if page_timeout is not None else _env_int('PDF_OCR_PAGE_TIMEOUT', 120)
+
+    info = pdfinfo_from_path(pdf_path)
+    total_pages = int(info.get('Pages', 0))
+    first_page = max(1, start_page)
+    last_page = total_pages if end_page <= 0 else min(end_page, total_pages)
+    if page_numbers is None:
+        page_numbers = range(first_page, last_page + 1)
+    page_numbers = sorted(set(page for page in page_numbers if first_page <= page <= last_page))
+    if not page_numbers:
+        return
+
+    # 메모리 상한 안에서 동시에 처리할 수 있는 페이지 수 = 워커 수
+    page_memory_mb = estimate_page_memory_mb(_parse_page_size(info), dpi)
+    workers = max(1, min(max_workers, len(page_numbers), int(memory_limit_mb // max(page_memory_mb, 1))))
+    logger.info(f"PDF OCR 시작: {len(page_numbers)}개 페이지 ({first_page}~{last_page} 범위), 워커 {workers}개 "
+                f"(페이지당 약 {page_memory_mb:.0f}MB, 상한 {memory_limit_mb}MB)")
+
+    if workers == 1:
+        for page_num in page_numbers:
+            try:
+                yield ocr_pdf_page(pdf_path, page_num, dpi, lang, page_timeout)
+            except Exception as e:
+                yield _failed_page(page_num, e)
+        return
+
+    executor = ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context('spawn'),
+        initializer=_init_ocr_worker
+    )
+    try:
+        # 순서대로 내보내기 위해 앞쪽 페이지를 기다리는 동안 뒤쪽 페이지는 워커 수의 2배까지만 미리 제출
+        # (결과 텍스트만 보관하므로 대기 중인 페이지가 메모리를 차지하지 않음)
+        window = workers * 2
+        futures = {}
+        next_submit = 0
+
+        for page_num in page_numbers:
+            while next_submit < len(page_numbers) and len(futures) < window:
+                submit_page = page_numbers[next_submit]
+                futures[submit_page] = executor.submit(ocr_pdf_page, pdf_path, submit_page, dpi, lang, page_timeout)
+                next_submit += 1
+
+            future = futures.pop(page_num)
+            try:
+                # 워커 안에서도 pdftoppm/tesseract에 같은 제한 시간을 적용 - 여기서는 큐 대기 시간까지 감안
+                yield future.result(timeout=page_timeout * 3 if page_timeout else None)
+            except FutureTimeoutError:
+                future.cancel()
+                yield _failed_page(page_num, f"{page_timeout}초 제한 시간 초과")
+            except Exception as e:
+                yield _failed_page(page_num, e)
+    finally:
+        # 중간에 소비를 멈추거나(제너레이터 close) 오류가 나도 남은 페이지 작업은 취소
+        executor.shutdown(wait=False, cancel_futures=True)
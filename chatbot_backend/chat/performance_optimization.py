@@ -10,7 +10,7 @@ from datetime import datetime, timedelta
 from collections import defaultdict, OrderedDict
 from django.core.cache import cache
 from django.conf import settings
-from django.db import connection
+from django.db import DatabaseError, connection, transaction
 from django.db.models import Prefetch, Q
 
 import numpy as np
@@ -518,6 +518,95 @@ class DatabaseOptimizer:
         }
 
 
+class BulkModelWriter:
+    """분석 결과 일괄 저장기 - 모델별로 버퍼링 후 하나의 트랜잭션에서 bulk_create
+    
+    행마다 INSERT/SELECT 하던 PersonDetection, ObjectTracking, Frame 저장을 batch_size 단위
+    bulk_create로 묶습니다. 배치마다 세이브포인트를 두고, 배치가 실패하면(유니크 제약 충돌 등)
+    그 배치만 행 단위로 다시 저장하여 실패한 행만 건너뜁니다 (기존 개별 저장과 같은 결과).
+    rows_written에는 실제로 저장된 행만, rows_skipped에는 건너뛴 행이 집계됩니다.
+    """
+    
+    def __init__(self, batch_size=None):
+        self.batch_size = max(1, int(batch_size or getattr(settings, 'ANALYSIS_DB_BATCH_SIZE', 500)))
+        self.buffers = OrderedDict()  # {model: [instance, ...]} - 추가된 모델 순서대로 저장 (FK 순서 보장)
+        self.rows_written = defaultdict(int)
+        self.rows_skipped = defaultdict(int)
+        self.write_seconds = 0.0
+        self._frame_pk_maps = {}
+    
+    def frame_pk_map(self, video):
+        """비디오의 image_id → Frame pk 매핑 (비디오당 한 번만 조회)"""
+        if video.pk not in self._frame_pk_maps:
+            self._frame_pk_maps[video.pk] = dict(
+                Frame.objects.filter(video=video).values_list('image_id', 'pk')
+            )
+        return self._frame_pk_maps[video.pk]
+    
+    def add(self, instance):
+        """저장할 모델 인스턴스 버퍼에 추가"""
+        self.buffers.setdefault(type(instance), []).append(instance)
+    
+    def pending_count(self):
+        return sum(len(rows) for rows in self.buffers.values())
+    
+    def flush(self):
+        """버퍼의 모든 행을 하나의 트랜잭션에서 batch_size 단위로 저장"""
+        if not self.pending_count():
+            return self.get_stats()
+        
+        start_time = time.time()
+        try:
+            with transaction.atomic():
+                for model, rows in self.buffers.items():
+                    for i in range(0, len(rows), self.batch_size):
+                        self._write_batch(model, rows[i:i + self.batch_size])
+                    
+                    # 새 Frame 행이 추가되었으므로 pk 매핑 재조회 필요
+                    if model is Frame:
+                        self._frame_pk_maps.clear()
+        finally:
+            self.buffers.clear()
+            self.write_seconds += time.time() - start_time
+        
+        return self.get_stats()
+    
+    def _write_batch(self, model, batch):
+        """배치 하나를 세이브포인트 안에서 저장 - 실패 시 행 단위 재시도"""
+        try:
+            with transaction.atomic():
+                model.objects.bulk_create(batch)
+            self.rows_written[model.__name__] += len(batch)
+            return
+        except DatabaseError:
+            pass  # 세이브포인트까지 롤백됨 - 어떤 행이 문제인지 행 단위로 확인
+        
+        skipped, last_error = 0, None
+        for instance in batch:
+            try:
+                with transaction.atomic():
+                    model.objects.bulk_create([instance])
+                self.rows_written[model.__name__] += 1
+            except DatabaseError as e:
+                skipped, last_error = skipped + 1, e
+        
+        if skipped:
+            self.rows_skipped[model.__name__] += skipped
+            print(f"⚠️ {model.__name__} {skipped}/{len(batch)}행 저장 건너뜀: {last_error}")
+    
+    def get_stats(self):
+        """저장 통계 (rows/sec 포함)"""
+        total_rows = sum(self.rows_written.values())
+        return {
+            'rows_written': dict(self.rows_written),
+            'rows_skipped': dict(self.rows_skipped),
+            'total_rows': total_rows,
+            'batch_size': self.batch_size,
+            'write_seconds': round(self.write_seconds, 3),
+            'rows_per_second': round(total_rows / self.write_seconds, 1) if self.write_seconds > 0 else 0.0
+        }
+
+
 class SearchOptimizer:
     """검색 성능 최적화"""
     
@@ -0,0 +1,203 @@
+# chat/rollups.py - 비디오 시간 구간 집계 (분석 종료 시 생성, 시간대별 통계 조회)
+"""
+시간대별 분석(TimeBasedAnalysisView, EnhancedVideoChatView 성비, TemporalAnalyzer)은 요청마다
+구간 안의 모든 프레임 JSON을 읽어 30초 구간/색상/클래스 수를 다시 셌습니다.
+
+여기서는 분석이 끝날 때 5초/30초/5분 해상도의 구간별 개수(클래스, 사람 성별/색상, 트랙)를
+TimeBucketRollup에 한 번 저장해 두고, 임의의 시간 범위는 범위를 덮는 가장 큰 구간들의 합으로
+계산합니다. 범위 중간은 5분 구간, 양 끝은 30초/5초 구간이므로 읽는 행 수는 영상 길이가 아니라
+범위 길이/5분 + 수십 개 정도입니다. 범위 경계는 5초 단위로 맞춰집니다.
+"""
+import math
+import logging
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import Frame, TimeBucketRollup
+from .performance_optimization import BulkModelWriter
+
+logger = logging.getLogger(__name__)
+
+ROLLUP_RESOLUTIONS = (300, 30, 5)  # 큰 해상도부터 (초)
+FINEST_RESOLUTION = ROLLUP_RESOLUTIONS[-1]
+
+_COUNT_FIELDS = ('frame_count', 'object_count', 'person_count')
+_COUNTER_FIELDS = ('class_counts', 'gender_counts', 'person_color_counts', 'upper_color_counts')
+
+
+def person_gender(obj):
+    """사람 객체의 성별 분류
+
+    'male'/'female': 모델 추정 (person_attributes 신뢰도 0.6 초과 또는 gender/sex 필드)
+    'male_guess'/'female_guess': 의상 색상 휴리스틱 (파랑/분홍), 그 외 'unknown'
+    """
+    estimation = (obj.get('person_attributes') or {}).get('gender_estimation') or {}
+    if estimation.get('gender') in ('male', 'female') and estimation.get('confidence', 0) > 0.6:
+        return estimation['gender']
+
+    gender = obj.get('gender', obj.get('sex'))
+    if isinstance(gender, bool):
+        return 'male' if gender else 'female'
+    gender = str(gender or '').lower()
+    if gender in ('male', 'man', 'm'):
+        return 'male'
+    if gender in ('female', 'woman', 'f'):
+        return 'female'
+
+    color_text = ' '.join(
+        [str(obj.get('color_description') or '')] + [str(color) for color in obj.get('colors') or []]
+    ).lower()
+    if 'pink' in color_text:
+        return 'female_guess'
+    if 'blue' in color_text:
+        return 'male_guess'
+    return 'unknown'
+
+
+def _track_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _empty_bucket():
+    return {
+        'frame_count': 0, 'object_count': 0, 'person_count': 0,
+        **{field: Counter() for field in _COUNTER_FIELDS},
+        'track_ids': set()
+    }
+
+
+def _add_frame(bucket, objects):
+    bucket['frame_count'] += 1
+    for obj in objects:
+        object_class = (obj.get('class') or 'unknown').lower()
+        bucket['object_count'] += 1
+        bucket['class_counts'][object_class] += 1
+        if object_class != 'person':
+            continue
+
+        bucket['person_count'] += 1
+        bucket['gender_counts'][person_gender(obj)] += 1
+        bucket['person_color_counts'][str(obj.get('color_description') or '')] += 1
+        upper_color = ((obj.get('person_attributes') or {}).get('upper_body_color') or {}).get('color')
+        if upper_color and upper_color != 'unknown':
+            bucket['upper_color_counts'][upper_color] += 1
+        track_id = _track_id(obj.get('track_id'))
+        if track_id is not None:
+            bucket['track_ids'].add(track_id)
+
+
+def build_video_rollups(video, frame_results):
+    """frame_results(분석기 프레임 결과 dict 목록)로 비디오의 구간 집계 교체 → 저장 통계"""
+    buckets = defaultdict(_empty_bucket)
+    for frame_data in frame_results:
+        timestamp = frame_data.get('timestamp', 0) or 0
+        if timestamp < 0:
+            continue
+        objects = [obj for obj in frame_data.get('objects') or [] if isinstance(obj, dict)]
+        for resolution in ROLLUP_RESOLUTIONS:
+            _add_frame(buckets[(resolution, int(timestamp // resolution))], objects)
+
+    writer = BulkModelWriter()
+    for (resolution, bucket), data in buckets.items():
+        writer.add(TimeBucketRollup(
+            video=video,
+            resolution=resolution,
+            bucket=bucket,
+            **{field: data[field] for field in _COUNT_FIELDS},
+            **{field: dict(data[field]) for field in _COUNTER_FIELDS},
+            track_ids=sorted(data['track_ids'])
+        ))
+
+    with transaction.atomic():
+        # 재분석 시 이전 집계 제거 후 교체
+        TimeBucketRollup.objects.filter(video=video).delete()
+        stats = writer.flush()
+
+    logger.info(f"시간 구간 집계 생성: 비디오 {video.id}, {stats['rows_written']}")
+    return stats
+
+
+def clear_video_rollups(video):
+    """비디오의 구간 집계 삭제 (분석 결과를 지우고 재시작할 때 - ensure_rollups는 존재 여부만 확인하므로)"""
+    TimeBucketRollup.objects.filter(video=video).delete()
+
+
+def ensure_rollups(video):
+    """집계가 없는 비디오는 저장된 Frame 행으로 생성 (이 기능 이전에 분석된 비디오용, 1회)"""
+    if TimeBucketRollup.objects.filter(video=video).exists():
+        return
+    frame_results = [
+        {
+            'timestamp': timestamp,
+            'objects': detected_objects if isinstance(detected_objects, list) else []
+        }
+        for timestamp, detected_objects in Frame.objects.filter(video=video).values_list('timestamp', 'detected_objects')
+    ]
+    if frame_results:
+        build_video_rollups(video, frame_results)
+
+
+def _cover(lo, hi, resolutions=ROLLUP_RESOLUTIONS):
+    """[lo, hi) (초, FINEST_RESOLUTION 배수, hi=None이면 끝까지)를 덮는 구간 → [(해상도, 첫 bucket, 끝 bucket 또는 None)]"""
+    resolution, finer = resolutions[0], resolutions[1:]
+    first = math.ceil(lo / resolution)
+    last = None if hi is None else hi // resolution
+    if not finer:
+        return [(resolution, first, last)]
+    if last is not None and first >= last:
+        return _cover(lo, hi, finer)
+
+    ranges = [(resolution, first, last)]
+    if first * resolution > lo:
+        ranges = _cover(lo, first * resolution, finer) + ranges
+    if last is not None and last * resolution < hi:
+        ranges += _cover(last * resolution, hi, finer)
+    return ranges
+
+
+def _range_filter(start_time, end_time):
+    """[start_time, end_time] (끝 포함) → 덮는 구간들의 Q (경계는 5초 단위로 확장)"""
+    lo = 0 if start_time is None else max(0, int(start_time // FINEST_RESOLUTION) * FINEST_RESOLUTION)
+    hi = None if end_time is None else (int(end_time // FINEST_RESOLUTION) + 1) * FINEST_RESOLUTION
+    condition = Q(pk__in=[])
+    for resolution, first, last in _cover(lo, hi):
+        bucket_range = Q(resolution=resolution, bucket__gte=first)
+        if last is not None:
+            bucket_range &= Q(bucket__lt=last)
+        condition |= bucket_range
+    return condition
+
+
+def _merge(rows):
+    summary = _empty_bucket()
+    for row in rows:
+        for field in _COUNT_FIELDS:
+            summary[field] += getattr(row, field)
+        for field in _COUNTER_FIELDS:
+            summary[field].update(getattr(row, field) or {})
+        summary['track_ids'].update(row.track_ids or [])
+    return summary
+
+
+def summarize_range(video, start_time=None, end_time=None):
+    """[start_time, end_time] 구간 합계 → {frame_count, object_count, person_count,
+    class_counts, gender_counts, person_color_counts, upper_color_counts (Counter), track_ids (set)}"""
+    ensure_rollups(video)
+    rows = TimeBucketRollup.objects.filter(video=video).filter(_range_filter(start_time, end_time))
+    return _merge(rows)
+
+
+def bucket_series(video, resolution=30, start_time=None, end_time=None):
+    """한 해상도의 구간별 집계 → [(구간 시작 시각, TimeBucketRollup)] - 시간순 (빈 구간 제외)"""
+    ensure_rollups(video)
+    rows = TimeBucketRollup.objects.filter(video=video, resolution=resolution)
+    if start_time is not None:
+        rows = rows.filter(bucket__gte=int(start_time // resolution))
+    if end_time is not None:
+        rows = rows.filter(bucket__lte=int(end_time // resolution))
+    return [(row.bucket * resolution, row) for row in rows.order_by('bucket')]
@@ -0,0 +1,344 @@
+# chat/search_index.py - 객체/텍스트 역색인 (분석 시 생성, 검색 API에서 조회)
+"""
+ObjectSearchView/TextSearchView는 분석된 모든 Video의 모든 Frame 행을 읽어 JSON을 파이썬에서
+훑은 뒤 50개로 잘랐습니다 (비디오 수 × 프레임 수에 비례). 여기서는 분석 시점에 다음을 만들어 둡니다:
+
+- ObjectPosting: 객체 클래스/색상/트랙 → (비디오, 프레임, 시각, 신뢰도, bbox)
+- FrameText + TextGram: OCR/캡션 원문과 그 2-gram 역색인 - 검색어의 모든 2-gram을 가진 프레임만
+  후보로 가져온 뒤 원문에 검색어가 실제로 포함되는지 확인
+
+색인이 없는 (이 기능 이전에 분석된) 비디오는 첫 검색 때 분석 결과 파일(없으면 Frame 행)로 한 번 채웁니다.
+"""
+import os
+import logging
+import unicodedata
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Count, Q
+
+from .models import Video, VideoAnalysis, Frame, VideoSearchIndex, ObjectPosting, FrameText, TextGram
+from .performance_optimization import BulkModelWriter
+from .analysis_cache import get_analysis_cache
+
+logger = logging.getLogger(__name__)
+
+POSTINGS_VERSION = 'postings-1'  # VideoSearchIndex.index_version - 이 값이면 역색인이 만들어진 비디오
+GRAM_SIZE = 2  # 한국어 2글자 단어도 색인으로 찾을 수 있도록 2-gram
+
+
+def normalize_text(text):
+    """검색/색인 공통 정규화 - 유니코드 NFKC, 소문자, 연속 공백 하나로"""
+    return ' '.join(unicodedata.normalize('NFKC', text or '').lower().split())
+
+
+def text_grams(text):
+    """정규화된 텍스트의 2-gram 집합 (공백만으로 된 gram 제외)"""
+    normalized = normalize_text(text)
+    if len(normalized) < GRAM_SIZE:
+        return set()
+    return {
+        normalized[i:i + GRAM_SIZE] for i in range(len(normalized) - GRAM_SIZE + 1)
+        if normalized[i:i + GRAM_SIZE].strip()
+    }
+
+
+def _primary_color(colors):
+    """colors 항목 ('red' 또는 ('red', 35.2)) 중 첫 번째 색상 이름"""
+    if not colors:
+        return ''
+    first = colors[0]
+    if isinstance(first, (list, tuple)):
+        first = first[0] if first else ''
+    return str(first).lower()[:20]
+
+
+def _track_id(value):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _frame_texts(frame_data):
+    """프레임 결과 → [(출처, 원문, 상세)]
+
+    OCR은 분석기 출력(scene_analysis.ocr_text 문자열)을 사용하고, 없으면
+    comprehensive_features.ocr_text의 {'full_text', 'texts'} 형식을 사용
+    """
+    texts = []
+    scene_ocr = (frame_data.get('scene_analysis') or {}).get('ocr_text')
+    ocr_data = (frame_data.get('comprehensive_features') or {}).get('ocr_text') or {}
+    if isinstance(scene_ocr, str) and scene_ocr.strip():
+        texts.append(('ocr', scene_ocr.strip(), []))
+    elif isinstance(ocr_data, dict) and ocr_data.get('full_text'):
+        texts.append(('ocr', ocr_data['full_text'], ocr_data.get('texts', [])))
+
+    caption = frame_data.get('final_caption') or frame_data.get('caption')
+    if caption:
+        texts.append(('caption', caption, []))
+    return texts
+
+
+def index_video_frames(video, frame_results):
+    """비디오의 역색인을 frame_results로 교체
+
+    frame_results: 분석기 프레임 결과 dict 목록 (image_id, timestamp, objects, caption,
+    final_caption, comprehensive_features) - 저장 여부와 관계없이 샘플링된 모든 프레임을 색인
+    """
+    writer = BulkModelWriter()
+
+    for frame_data in frame_results:
+        frame_id = frame_data.get('image_id', 0)
+        timestamp = frame_data.get('timestamp', 0)
+
+        for obj in frame_data.get('objects') or []:
+            object_class = (obj.get('class') or '').lower()
+            if not object_class:
+                continue
+            colors = obj.get('colors') or []
+            writer.add(ObjectPosting(
+                video=video,
+                frame_id=frame_id,
+                timestamp=timestamp,
+                object_class=object_class[:50],
+                color=_primary_color(colors),
+                color_description=str(obj.get('color_description') or '').lower()[:100],
+                colors=colors,
+                track_id=_track_id(obj.get('track_id')),
+                confidence=float(obj.get('confidence') or 0.0),
+                bbox=obj.get('bbox') or []
+            ))
+
+        for source, text, details in _frame_texts(frame_data):
+            writer.add(FrameText(video=video, frame_id=frame_id, timestamp=timestamp,
+                                 source=source, text=text, details=details))
+            for gram in text_grams(text):
+                writer.add(TextGram(video=video, frame_id=frame_id, source=source, gram=gram))
+
+    with transaction.atomic():
+        # 재분석 시 이전 색인 제거 후 교체
+        _delete_postings(video)
+        stats = writer.flush()
+        VideoSearchIndex.objects.update_or_create(video=video, defaults={'index_version': POSTINGS_VERSION})
+
+    logger.info(f"검색 색인 생성: 비디오 {video.id}, {stats['rows_written']}")
+    return stats
+
+
+def _delete_postings(video):
+    ObjectPosting.objects.filter(video=video).delete()
+    FrameText.objects.filter(video=video).delete()
+    TextGram.objects.filter(video=video).delete()
+
+
+def clear_video_index(video):
+    """비디오의 역색인 삭제 + 색인 완료 표시 해제 (분석 결과를 지우고 재시작할 때)"""
+    with transaction.atomic():
+        _delete_postings(video)
+        VideoSearchIndex.objects.filter(video=video, index_version=POSTINGS_VERSION).update(
+            index_version=VideoSearchIndex._meta.get_field('index_version').default
+        )
+
+
+def cached_video_analysis(video):
+    """비디오의 분석 결과 파일(json_file_path)의 캐시 항목(CachedAnalysis) - 파일이 없거나 읽지 못하면 None"""
+    stats = VideoAnalysis.objects.filter(video=video).values_list('analysis_statistics', flat=True).first()
+    path = stats.get('json_file_path') if isinstance(stats, dict) else None
+    if not path or not os.path.exists(path):
+        return None
+    try:
+        return get_analysis_cache().get(path)
+    except Exception as e:
+        logger.warning(f"비디오 {video.id} 분석 결과 파일 읽기 실패, Frame 행 사용: {e}")
+        return None
+
+
+def _saved_frame_results(video):
+    """비디오의 분석 결과 파일에 저장된 프레임 결과 - 파일이 없으면 None"""
+    cached = cached_video_analysis(video)
+    return cached.frame_results if cached is not None else None
+
+
+def ensure_indexed(videos):
+    """색인이 없는 비디오는 저장된 분석 결과로 색인 생성 (이 기능 이전에 분석된 비디오용, 1회)
+
+    분석 결과 파일이 있으면 샘플링된 모든 프레임(scene_analysis의 OCR 포함)으로, 없으면 Frame 행으로 생성
+    """
+    missing = videos.exclude(search_index__index_version=POSTINGS_VERSION)
+    for video in missing:
+        frame_results = _saved_frame_results(video)
+        if frame_results is not None:
+            try:
+                index_video_frames(video, frame_results)
+            except Exception as e:
+                logger.warning(f"비디오 {video.id} 검색 색인 생성 실패: {e}")
+            continue
+
+        frame_results = [
+            {
+                'image_id': frame.image_id,
+                'timestamp': frame.timestamp,
+                'objects': frame.detected_objects if isinstance(frame.detected_objects, list) else [],
+                'caption': frame.caption,
+                'final_caption': frame.final_caption,
+                'comprehensive_features': (
+                    frame.comprehensive_features if isinstance(frame.comprehensive_features, dict) else {}
+                )
+            }
+            for frame in Frame.objects.filter(video=video)
+        ]
+        try:
+            index_video_frames(video, frame_results)
+        except Exception as e:
+            logger.warning(f"비디오 {video.id} 검색 색인 생성 실패: {e}")
+
+
+def _captions_for(rows):
+    """결과 페이지의 (비디오, 프레임) → 캡션"""
+    if not rows:
+        return {}
+    frame_ids = {row['frame_id'] for row in rows}
+    video_ids = {row['video_id'] for row in rows}
+    return {
+        (video_id, frame_id): text
+        for video_id, frame_id, text in FrameText.objects.filter(
+            source='caption', video_id__in=video_ids, frame_id__in=frame_ids
+        ).values_list('video_id', 'frame_id', 'text')
+    }
+
+
+def search_objects(object_type, video_id=None, color=None, offset=0, limit=50):
+    """객체 클래스(부분 일치)/색상으로 검색 → (결과 페이지, 전체 일치 수)"""
+    videos = Video.objects.filter(is_analyzed=True)
+    if video_id:
+        videos = videos.filter(id=video_id)
+    ensure_indexed(videos)
+
+    postings = ObjectPosting.objects.filter(video__in=videos)
+
+    # 클래스 이름 목록(수십 개)에서 부분 일치 클래스를 고른 뒤 인덱스로 조회
+    query = object_type.lower()
+    classes = [
+        name for name in postings.values_list('object_class', flat=True).distinct()
+        if query in name
+    ]
+    postings = postings.filter(object_class__in=classes)
+    if color:
+        postings = postings.filter(color=color.lower())
+
+    total = postings.count()
+    rows = list(
+        postings.order_by('video_id', 'timestamp', 'id').values(
+            'video_id', 'video__original_name', 'frame_id', 'timestamp', 'object_class',
+            'confidence', 'color', 'track_id', 'bbox'
+        )[offset:offset + limit]
+    )
+
+    captions = _captions_for(rows)
+    results = [
+        {
+            'video_id': row['video_id'],
+            'video_name': row['video__original_name'],
+            'frame_id': row['frame_id'],
+            'timestamp': row['timestamp'],
+            'object_class': row['object_class'],
+            'confidence': row['confidence'],
+            'color': row['color'],
+            'track_id': row['track_id'],
+            'bbox': row['bbox'],
+            'caption': captions.get((row['video_id'], row['frame_id']), '')
+        }
+        for row in rows
+    ]
+    return results, total
+
+
+def search_frame_texts(search_text, video_id=None, source='ocr', offset=0, limit=50):
+    """OCR/캡션 텍스트 부분 일치 검색 → (결과 페이지, 전체 일치 수)
+
+    source: 'ocr', 'caption', 'all'
+    """
+    videos = Video.objects.filter(is_analyzed=True)
+    if video_id:
+        videos = videos.filter(id=video_id)
+    ensure_indexed(videos)
+
+    query = normalize_text(search_text)
+    sources = ['ocr', 'caption'] if source == 'all' else [source]
+    texts = FrameText.objects.filter(video__in=videos, source__in=sources)
+
+    grams = text_grams(query)
+    if grams:
+        # 검색어의 모든 2-gram을 가진 (비디오, 프레임, 출처)만 후보
+        candidates = TextGram.objects.filter(
+            video__in=videos, source__in=sources, gram__in=grams
+        ).values('video_id', 'frame_id', 'source').annotate(
+            gram_count=Count('gram', distinct=True)
+        ).filter(gram_count=len(grams))
+
+        by_video = defaultdict(set)
+        for candidate in candidates:
+            by_video[(candidate['video_id'], candidate['source'])].add(candidate['frame_id'])
+        if not by_video:
+            return [], 0
+
+        candidate_filter = Q()
+        for (candidate_video, candidate_source), frame_ids in by_video.items():
+            candidate_filter |= Q(video_id=candidate_video, source=candidate_source, frame_id__in=frame_ids)
+        texts = texts.filter(candidate_filter)
+    else:
+        # 한 글자 검색어는 n-gram으로 좁힐 수 없으므로 원문 테이블에서 직접 검색
+        texts = texts.filter(text__icontains=search_text)
+
+    # 후보 원문에 검색어가 실제로 연속해서 포함되는지 확인
+    matches = [
+        row for row in texts.order_by('video_id', 'timestamp', 'source').values(
+            'video_id', 'video__original_name', 'frame_id', 'timestamp', 'source', 'text', 'details'
+        )
+        if query in normalize_text(row['text'])
+    ]
+
+    page = matches[offset:offset + limit]
+    captions = _captions_for(page)
+    results = [
+        {
+            'video_id': row['video_id'],
+            'video_name': row['video__original_name'],
+            'frame_id': row['frame_id'],
+            'timestamp': row['timestamp'],
+            'source': row['source'],
+            'extracted_text': row['text'],
+            'text_details': row['details'],
+            'caption': captions.get((row['video_id'], row['frame_id']), '')
+        }
+        for row in page
+    ]
+    return results, len(matches)
+
+
+def get_video_object_postings(video, object_class=None, start_time=None, end_time=None):
+    """한 비디오의 객체 색인을 시간순으로 → {frame_id: (timestamp, [객체 dict])}
+
+    객체 dict는 IntraVideoTrackingView._get_detected_objects의 정규화 형식과 같습니다.
+    """
+    ensure_indexed(Video.objects.filter(id=video.id))
+
+    postings = ObjectPosting.objects.filter(video=video)
+    if object_class:
+        postings = postings.filter(object_class=object_class)
+    if start_time is not None and end_time is not None:
+        postings = postings.filter(timestamp__gte=start_time, timestamp__lte=end_time)
+
+    frames = {}
+    for posting in postings.order_by('timestamp', 'id'):
+        _, objects = frames.setdefault(posting.frame_id, (posting.timestamp, []))
+        objects.append({
+            'class': posting.object_class,
+            'bbox': posting.bbox,
+            'confidence': posting.confidence,
+            'colors': posting.colors,
+            'color_description': posting.color_description or 'unknown',
+            'track_id': posting.track_id,
+        })
+    return frames
@@ -0,0 +1,69 @@
+# chat/time_index.py - timestamp 정렬 배열 기반 시간 인덱스
+"""
+시간 범위/주변 시각 조회를 항목 전체 선형 탐색 대신 정렬된 timestamp 배열과 bisect로 처리합니다.
+(범위 조회 O(log n + 결과 수), 구간 묶기 한 번 순회)
+
+사용처: RAG 시간 컨텍스트(TemporalIndex), 분석 결과 캐시(CachedAnalysis.frames_between),
+시간별 통계(TemporalAnalyzer.analyze_temporal_statistics)
+"""
+import bisect
+from collections import defaultdict
+
+
+def _default_timestamp(item):
+    return item.get('timestamp', 0)
+
+
+class TimeIndex:
+    """항목 목록의 timestamp 정렬 인덱스 (timestamp가 같으면 원래 순서 유지, 생성 후 읽기 전용)"""
+
+    def __init__(self, items, key=_default_timestamp):
+        order = sorted(range(len(items)), key=lambda i: key(items[i]))
+        self.timestamps = [key(items[i]) for i in order]
+        self.items = [items[i] for i in order]
+
+    def __len__(self):
+        return len(self.items)
+
+    def between(self, start_time=None, end_time=None, include_end=True):
+        """timestamp가 [start_time, end_time] (include_end=False면 [start, end)) 안인 항목 - 시간순"""
+        lo = 0 if start_time is None else bisect.bisect_left(self.timestamps, start_time)
+        if end_time is None:
+            hi = len(self.timestamps)
+        elif include_end:
+            hi = bisect.bisect_right(self.timestamps, end_time)
+        else:
+            hi = bisect.bisect_left(self.timestamps, end_time)
+        return self.items[lo:hi]
+
+    def nearby(self, timestamp, window, limit=None):
+        """timestamp ± window 안의 항목 → [(시간 차, 항목)] - 가까운 순"""
+        lo = bisect.bisect_left(self.timestamps, timestamp - window)
+        hi = bisect.bisect_right(self.timestamps, timestamp + window)
+        matches = sorted(
+            ((abs(self.timestamps[i] - timestamp), self.items[i]) for i in range(lo, hi)),
+            key=lambda match: match[0]
+        )
+        return matches[:limit] if limit is not None else matches
+
+    def nearest(self, timestamp):
+        """timestamp에 가장 가까운 항목 (없으면 None)"""
+        if not self.timestamps:
+            return None
+        pos = bisect.bisect_left(self.timestamps, timestamp)
+        candidates = [p for p in (pos - 1, pos) if 0 <= p < len(self.timestamps)]
+        return self.items[min(candidates, key=lambda p: abs(self.timestamps[p] - timestamp))]
+
+
+def bucket_by_time(items, duration, key=_default_timestamp, end_time=None):
+    """항목을 [k*duration, (k+1)*duration) 구간으로 한 번 순회하여 묶음 → [(k, [항목])] - k 오름차순
+
+    end_time을 주면 그 이상인 항목은 제외 (음수 timestamp도 제외). 구간 안 항목은 입력 순서 유지.
+    """
+    buckets = defaultdict(list)
+    for item in items:
+        timestamp = key(item)
+        if timestamp < 0 or (end_time is not None and timestamp >= end_time):
+            continue
+        buckets[int(timestamp // duration)].append(item)
+    return sorted(buckets.items())
@@ -1,6 +1,7 @@
 # video_analyzer.py - 상단 import 및 초기화 부분 수정
 import os
 import json
+import hashlib
 import numpy as np
 import cv2
 import colorsys
@@ -14,12 +15,19 @@ from sklearn.cluster import DBSCAN
 from sklearn.preprocessing import StandardScaler
 from dotenv import load_dotenv
 import threading
+import queue
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from importlib import metadata as importlib_metadata
 # 환경 설정
 load_dotenv()  
 os.environ["CUDA_DEVICE_ORDER"] = "PCI_BUS_ID"
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
 # API 클라이언트들
 from groq import Groq
+from .llm_gateway import LLMGateway, LLMProvider
+from .frame_cache import FrameResultCache, compute_video_hash
+from .color_engine import COLOR_RANGES, get_frame_color_map
 import openai
 try:
     import anthropic
@@ -184,99 +192,118 @@ def log_once(message, level="INFO"):
         print(f"[{level}] {message}")
         _logged_messages.add(message)
 
-def call_groq_llm_enhanced(prompt, system_prompt="", model="llama-3.1-8b-instant", max_retries=3):
-    """개선된 LLM 호출 함수 - Rate Limiting 강화 및 로그 중복 제거"""
-    
-    # Rate Limiting을 위한 전역 변수
-    if not hasattr(call_groq_llm_enhanced, 'last_call_time'):
-        call_groq_llm_enhanced.last_call_time = 0
-        call_groq_llm_enhanced.call_count = 0
-    
-    # 요청 간격 제어 (최소 2초)
-    current_time = time.time()
-    time_since_last_call = current_time - call_groq_llm_enhanced.last_call_time
-    if time_since_last_call < 2.0:
-        sleep_time = 2.0 - time_since_last_call
-        log_once(f"⏱️ Rate limiting: {sleep_time:.1f}초 대기", "DEBUG")
-        time.sleep(sleep_time)
+def _env_rate(name, default):
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def _groq_call(model):
+    def call(prompt, system_prompt, max_tokens, temperature):
+        response = groq_client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": prompt}
+            ],
+            temperature=temperature,
+            max_tokens=max_tokens,
+            top_p=0.8
+        )
+        return response.choices[0].message.content.strip()
+    return call
+
+
+def _openai_call(prompt, system_prompt, max_tokens, temperature):
+    response = openai_client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {"role": "system", "content": system_prompt},
+            {"role": "user", "content": prompt}
+        ],
+        temperature=temperature,
+        max_tokens=max_tokens
+    )
+    return response.choices[0].message.content.strip()
+
+
+def _anthropic_call(prompt, system_prompt, max_tokens, temperature):
+    response = anthropic_client.messages.create(
+        model="claude-3-haiku-20240307",
+        max_tokens=max_tokens,
+        temperature=temperature,
+        system=system_prompt,
+        messages=[{"role": "user", "content": prompt}]
+    )
+    return response.content[0].text.strip()
+
+
+# Groq 한도는 모델별이므로 모델마다 게이트웨이를 두고, 폴백 공급자(OpenAI/Anthropic)의 버킷은 공유
+_llm_gateways = {}
+_fallback_providers = None
+_llm_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway(model="llama-3.1-8b-instant"):
+    """Groq(model) → OpenAI → Anthropic 순서의 LLM 게이트웨이 (모델별 싱글톤)
     
-    call_groq_llm_enhanced.last_call_time = time.time()
-    call_groq_llm_enhanced.call_count += 1
+    분당 한도는 환경변수(LLM_{GROQ,OPENAI,ANTHROPIC}_{RPM,TPM})로 조정합니다.
+    """
+    global _fallback_providers
     
-    # 너무 많은 요청시 긴 대기
-    if call_groq_llm_enhanced.call_count % 20 == 0:
-        log_once("🔄 대량 요청 감지 - 10초 대기", "WARNING")
-        time.sleep(10)
+    if model in _llm_gateways:
+        return _llm_gateways[model]
     
-    # Groq 먼저 시도 (기존 로직)
-    for attempt in range(max_retries):
-        try:
-            response = groq_client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=512,
-                top_p=0.8
+    with _llm_gateway_lock:
+        if model not in _llm_gateways:
+            if _fallback_providers is None:
+                _fallback_providers = []
+                if OPENAI_AVAILABLE and openai_client:
+                    _fallback_providers.append(LLMProvider(
+                        'openai', _openai_call,
+                        requests_per_minute=_env_rate('LLM_OPENAI_RPM', 500),
+                        tokens_per_minute=_env_rate('LLM_OPENAI_TPM', None),
+                        max_output_tokens=4096  # gpt-3.5-turbo
+                    ))
+                if ANTHROPIC_AVAILABLE and anthropic_client:
+                    _fallback_providers.append(LLMProvider(
+                        'anthropic', _anthropic_call,
+                        requests_per_minute=_env_rate('LLM_ANTHROPIC_RPM', 50),
+                        tokens_per_minute=_env_rate('LLM_ANTHROPIC_TPM', None),
+                        max_output_tokens=4096  # claude-3-haiku
+                    ))
+            
+            groq_provider = LLMProvider(
+                f'groq:{model}', _groq_call(model),
+                requests_per_minute=_env_rate('LLM_GROQ_RPM', 30),
+                tokens_per_minute=_env_rate('LLM_GROQ_TPM', None)
             )
-            content = response.choices[0].message.content.strip()
-            
-            # 성공 로그는 중요한 경우만
-            # if attempt > 0:  # 재시도 후 성공한 경우만 로그
-            #     log_once(f"✅ Groq API 성공 (시도 {attempt + 1})", "SUCCESS")
-            # return content
-            
-        except Exception as e:
-            if "429" in str(e) or "rate_limit" in str(e).lower():
-                wait_time = min(2 ** attempt * 2, 30)  # 지수적 백오프, 최대 30초
-                log_once(f"⏳ Rate limit - {wait_time}초 대기 (시도 {attempt + 1}/{max_retries})", "WARNING")
-                time.sleep(wait_time)
-                continue
-            else:
-                log_once(f"⚠️ Groq API 실패 (시도 {attempt + 1}/{max_retries}): {e}", "ERROR")
-                if attempt < max_retries - 1:
-                    time.sleep(1)
-                    continue
-                else:
-                    break
-
-    # OpenAI fallback
-    if OPENAI_AVAILABLE and openai_client:
-        try:
-            response = openai_client.chat.completions.create(
-                model="gpt-3.5-turbo",
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": prompt}
-                ],
-                temperature=0.6,
-                max_tokens=512
+            _llm_gateways[model] = LLMGateway(
+                [groq_provider] + _fallback_providers,
+                max_in_flight=_env_rate('LLM_GATEWAY_MAX_IN_FLIGHT', 4)
             )
-            content = response.choices[0].message.content.strip()
-            log_once("✅ OpenAI API fallback 성공", "SUCCESS")
-            return content
-            
-        except Exception as e:
-            log_once(f"❌ OpenAI API도 실패: {e}", "ERROR")
     
-    # Anthropic fallback
-    if ANTHROPIC_AVAILABLE and anthropic_client:
-        try:
-            response = anthropic_client.messages.create(
-                model="claude-3-haiku-20240307",
-                max_tokens=512,
-                temperature=0.6,
-                system=system_prompt,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            content = response.content[0].text.strip()
-            log_once("✅ Anthropic API fallback 성공", "SUCCESS")
+    return _llm_gateways[model]
+
+
+def get_llm_gateway_metrics():
+    """생성된 LLM 게이트웨이들의 메트릭 (모델별)"""
+    return {model: gateway.get_metrics() for model, gateway in list(_llm_gateways.items())}
+
+
+def call_groq_llm_enhanced(prompt, system_prompt="", model="llama-3.1-8b-instant", max_retries=3, max_tokens=512):
+    """개선된 LLM 호출 함수 - 토큰 버킷 게이트웨이(Groq → OpenAI → Anthropic)로 호출
+    
+    고정 대기(sleep) 없이 공급자별 분당 한도가 남아 있으면 바로 호출하고, 실패 시 지터 백오프 재시도 후
+    다음 공급자로 넘어갑니다. 모든 공급자가 실패하면 프롬프트 종류별 기본 응답을 반환합니다.
+    """
+    try:
+        content = get_llm_gateway(model).complete(
+            prompt, system_prompt, max_tokens=max_tokens, temperature=0.6, max_retries=max_retries
+        )
+        if content is not None:
             return content
-            
-        except Exception as e:
-            log_once(f"❌ Anthropic API도 실패: {e}", "ERROR")
+    except Exception as e:
+        log_once(f"❌ LLM 게이트웨이 호출 실패: {e}", "ERROR")
     
     # 모든 API 실패시 기본 응답
     log_once("🔄 기본 응답 생성...", "WARNING")
@@ -291,65 +318,22 @@ def call_groq_llm_enhanced(prompt, system_prompt="", model="llama-3.1-8b-instant
         return f"API 호출 실패로 인한 기본 분석 결과입니다. 프롬프트 길이: {len(prompt)}자"
 
 class ColorAnalyzer:
-    """고급 색상 분석기"""
+    """고급 색상 분석기 - 프레임 단위 색상 엔진(color_engine) 사용"""
 
     def __init__(self):
-        self.color_ranges = {
-            'red': [(0, 70, 50), (10, 255, 255), (170, 70, 50), (180, 255, 255)],
-            'orange': [(11, 70, 50), (25, 255, 255)],
-            'yellow': [(26, 70, 50), (35, 255, 255)],
-            'green': [(36, 70, 50), (85, 255, 255)],
-            'blue': [(86, 70, 50), (125, 255, 255)],
-            'purple': [(126, 70, 50), (155, 255, 255)],
-            'pink': [(156, 70, 50), (169, 255, 255)],
-            'white': [(0, 0, 200), (180, 25, 255)],
-            'black': [(0, 0, 0), (180, 255, 50)],
-            'gray': [(0, 0, 51), (180, 25, 199)],
-            'brown': [(8, 60, 20), (20, 255, 200)]
-        }
+        self.color_ranges = COLOR_RANGES
     
     def extract_dominant_colors(self, frame, bbox, num_colors=3):
         """바운딩 박스 내 주요 색상 추출"""
+        return self.extract_dominant_colors_batch(frame, [bbox], num_colors)[0]
+    
+    def extract_dominant_colors_batch(self, frame, bboxes, num_colors=3):
+        """프레임의 모든 박스 주요 색상을 한 번에 추출 (HSV 변환/LUT 분류는 프레임당 1회)"""
         try:
-            h, w = frame.shape[:2]
-            
-            x1 = max(0, int(bbox[0] * w))
-            y1 = max(0, int(bbox[1] * h))
-            x2 = min(w, int(bbox[2] * w))
-            y2 = min(h, int(bbox[3] * h))
-            
-            roi = frame[y1:y2, x1:x2]
-            
-            if roi.size == 0:
-                return []
-            
-            target_size = min(100, max(roi.shape[:2]))
-            roi_resized = cv2.resize(roi, (target_size, target_size))
-            hsv = cv2.cvtColor(roi_resized, cv2.COLOR_BGR2HSV)
-            
-            color_percentages = {}
-            
-            for color_name, ranges in self.color_ranges.items():
-                mask = np.zeros(hsv.shape[:2], dtype=np.uint8)
-                
-                if len(ranges) == 4:  # red 경우
-                    mask1 = cv2.inRange(hsv, np.array(ranges[0]), np.array(ranges[1]))
-                    mask2 = cv2.inRange(hsv, np.array(ranges[2]), np.array(ranges[3]))
-                    mask = cv2.bitwise_or(mask1, mask2)
-                else:
-                    mask = cv2.inRange(hsv, np.array(ranges[0]), np.array(ranges[1]))
-                
-                percentage = (np.sum(mask > 0) / (hsv.shape[0] * hsv.shape[1])) * 100
-                color_percentages[color_name] = round(percentage, 1)
-            
-            significant_colors = [(color, pct) for color, pct in color_percentages.items() if pct >= 3.0]
-            significant_colors.sort(key=lambda x: x[1], reverse=True)
-            
-            return significant_colors[:num_colors]
-            
+            return get_frame_color_map(frame).dominant_colors(bboxes, num_colors)
         except Exception as e:
             print(f"⚠️ 색상 분석 오류: {e}")
-            return []
+            return [[] for _ in bboxes]
     
     def get_color_description(self, colors):
         """색상 리스트를 텍스트로 변환"""
@@ -372,11 +356,18 @@ class ColorAnalyzer:
             return f"{minor_colors[0]}-{minor_colors[1]}" if len(minor_colors) == 2 else minor_colors[0]
 
 class SceneClassifier:
-    """Scene 분류기 - 실내/실외, 시간대, 날씨, 활동 등 분류"""
+    """Scene 분류기 - 실내/실외, 시간대, 날씨, 활동 등 분류
     
-    def __init__(self):
+    shared_encoder 모드(기본)에서는 템플릿 텍스트 임베딩을 로드 시 한 번만 계산하고, 프레임 이미지는
+    한 번만 인코딩한 뒤 모든 카테고리를 하나의 행렬곱으로 점수화합니다.
+    """
+    
+    def __init__(self, shared_encoder=True):
         self.clip_processor = None
         self.clip_model = None
+        self.shared_encoder = shared_encoder
+        self.text_embeddings = None  # (전체 라벨 수, D) 정규화 텍스트 임베딩
+        self.category_slices = {}    # category -> 텍스트 임베딩 행 범위
         
         try:
             if TRANSFORMERS_AVAILABLE:
@@ -391,6 +382,10 @@ class SceneClassifier:
                     'activity': ['walking', 'driving', 'sitting', 'standing']
                 }
                 
+                self.clip_model.eval()
+                if self.shared_encoder:
+                    self._encode_template_embeddings()
+                
                 print("🏞️ Scene 분류기 로드 완료")
             else:
                 raise ImportError("Transformers not available")
@@ -403,11 +398,26 @@ class SceneClassifier:
                 'activity': ['general']
             }
     
+    def _encode_template_embeddings(self):
+        """모든 카테고리의 템플릿 텍스트를 한 번에 인코딩하여 보관"""
+        text_inputs = []
+        for category, labels in self.scene_templates.items():
+            self.category_slices[category] = slice(len(text_inputs), len(text_inputs) + len(labels))
+            text_inputs.extend(f"a photo of {label}" for label in labels)
+        
+        inputs = self.clip_processor(text=text_inputs, return_tensors="pt", padding=True)
+        with torch.no_grad():
+            text_features = self.clip_model.get_text_features(**inputs)
+        self.text_embeddings = text_features / text_features.norm(dim=-1, keepdim=True)
+    
     def classify_scene(self, frame):
         """Scene 분류 수행"""
         if not self.clip_processor or not self.clip_model:
             return self._basic_scene_classification(frame)
         
+        if self.text_embeddings is not None:
+            return self.classify_scenes([frame])[0]
+        
         try:
             image = Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
             
@@ -443,6 +453,44 @@ class SceneClassifier:
             print(f"⚠️ Scene 분류 오류: {e}")
             return self._basic_scene_classification(frame)
     
+    def classify_scenes(self, frames):
+        """여러 프레임 Scene 분류 - 이미지 인코딩 1회(배치) + 캐시된 텍스트 임베딩과의 행렬곱 1회"""
+        if self.text_embeddings is None:
+            return [self.classify_scene(frame) for frame in frames]
+        
+        if not frames:
+            return []
+        
+        try:
+            images = [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
+            inputs = self.clip_processor(images=images, return_tensors="pt")
+            
+            with torch.no_grad():
+                image_features = self.clip_model.get_image_features(**inputs)
+                image_features = image_features / image_features.norm(dim=-1, keepdim=True)
+                # CLIP logits_per_image와 동일한 스케일 (logit_scale * 코사인 유사도)
+                logits = self.clip_model.logit_scale.exp() * image_features @ self.text_embeddings.T
+            
+            results = []
+            for frame_logits in logits:
+                scene_classification = {}
+                for category, labels in self.scene_templates.items():
+                    probs = frame_logits[self.category_slices[category]].softmax(dim=0)
+                    best_idx = probs.argmax().item()
+                    
+                    scene_classification[category] = {
+                        'label': labels[best_idx],
+                        'confidence': float(probs[best_idx].item()),
+                        'all_scores': {label: float(score) for label, score in zip(labels, probs)}
+                    }
+                results.append(scene_classification)
+            
+            return results
+            
+        except Exception as e:
+            print(f"⚠️ Scene 배치 분류 오류: {e}")
+            return [self._basic_scene_classification(frame) for frame in frames]
+    
     def _basic_scene_classification(self, frame):
         """기본 Scene 분류 (휴리스틱 기반)"""
         try:
@@ -631,8 +679,30 @@ class SceneGraphGenerator:
 class GPTFeatureExtractor:
     """GPT 기반 고급 특징 추출기"""
     
+    FEATURE_KEYS = [
+        'activity_type', 'emotional_tone', 'complexity_level', 'interaction_level',
+        'visual_coherence', 'spatial_composition', 'temporal_context', 'social_context'
+    ]
+    
     def __init__(self):
         self.feature_dimensions = 1024
+    
+    def is_valid_features(self, features):
+        """8개 특징이 모두 0-1 사이 수치인지 검증"""
+        return isinstance(features, dict) and all(
+            isinstance(features.get(key), (int, float)) and 0.0 <= features[key] <= 1.0
+            for key in self.FEATURE_KEYS
+        )
+    
+    def build_feature_result(self, features, extraction_method='gpt_llm'):
+        """특징 딕셔너리 → extract_gpt_features와 같은 형태의 결과"""
+        feature_vector = self._features_to_vector(features)
+        return {
+            'gpt_features': features,
+            'feature_vector': feature_vector,
+            'vector_dimension': len(feature_vector),
+            'extraction_method': extraction_method
+        }
         
     def extract_gpt_features(self, frame_analysis, scene_context):
         """GPT 기반 고수준 특징 벡터 생성"""
@@ -741,6 +811,199 @@ class GPTFeatureExtractor:
         else:
             return [0.0] * self.feature_dimensions
 
+class FrameLLMBatcher:
+    """여러 프레임의 LLM 캡션 + GPT 특징을 하나의 요청으로 묶어 생성
+    
+    프레임마다 캡션/특징 요청을 따로 보내면 같은 지시문이 매번 반복됩니다. K개 프레임의 요약 분석을
+    한 프롬프트에 담아 프레임별 JSON 배열로 받고, 응답에서 빠진 프레임은 한 번 더 묶어 요청한 뒤
+    검증에 실패한 프레임만 기존 방식으로 개별 재요청합니다.
+    """
+    
+    PROMPT_VERSION = 'batch-v1'  # 프롬프트/검증 규칙을 바꾸면 올려서 LLM 캐시 무효화
+    SYSTEM_PROMPT = "당신은 비디오 분석 전문가입니다. 프레임별 분석 정보를 정확히 반영한 한국어 캡션과 수치 특징을 JSON으로만 응답합니다."
+    MIN_CAPTION_LENGTH = 50
+    TOKENS_PER_FRAME = 900       # 한국어 캡션 150-300자 + 특징 8개 JSON 응답 토큰 여유분
+    MAX_RESPONSE_TOKENS = 8000   # 요청당 응답 토큰 상한 - 넘으면 프레임을 나눠 요청 (폴백 공급자 상한도 적용)
+    MODEL = "llama-3.1-8b-instant"
+    
+    def __init__(self, scene_analyzer, batch_size=4, on_frame_done=None):
+        self.scene_analyzer = scene_analyzer
+        self.batch_size = max(1, batch_size)
+        self.on_frame_done = on_frame_done  # (frame_data, scene_analysis) - LLM 결과가 채워진 뒤 호출
+        self.pending = []
+        self.stats = {'batches': 0, 'frames': 0, 'batched_ok': 0, 'missing_rerequests': 0,
+                      'caption_retries': 0, 'feature_retries': 0}
+    
+    def add(self, frame_data, detected_objects, scene_analysis):
+        """LLM 처리가 보류된 프레임 추가 - batch_size가 차면 바로 처리"""
+        self.pending.append((frame_data, detected_objects, scene_analysis))
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+    
+    def flush(self):
+        """보류된 프레임들을 한 번의 LLM 요청으로 처리하여 frame_data를 갱신"""
+        if not self.pending:
+            return
+        
+        batch, self.pending = self.pending, []
+        self.stats['batches'] += 1
+        self.stats['frames'] += len(batch)
+        
+        try:
+            results = self._request_batch(batch)
+        except Exception as e:
+            print(f"⚠️ LLM 배치 요청 실패, 프레임별 처리로 전환: {e}")
+            results = {}
+        
+        gpt_extractor = self.scene_analyzer.gpt_extractor
+        for frame_data, detected_objects, scene_analysis in batch:
+            result = results.get(frame_data['image_id'], {})
+            caption = result.get('caption')
+            features = result.get('features')
+            caption_ok = isinstance(caption, str) and len(caption.strip()) > self.MIN_CAPTION_LENGTH
+            features_ok = gpt_extractor.is_valid_features(features)
+            
+            if caption_ok and features_ok:
+                self.stats['batched_ok'] += 1
+            
+            # 검증 실패한 항목만 개별 재요청
+            if not caption_ok:
+                self.stats['caption_retries'] += 1
+                caption = self.scene_analyzer._generate_llm_caption(
+                    None, detected_objects, scene_analysis, frame_data.get('blip_caption', ''),
+                    frame_data.get('enhanced_caption', ''), frame_data['image_id'], frame_data['timestamp']
+                )
+            
+            if features_ok:
+                scene_analysis['gpt_features'] = gpt_extractor.build_feature_result(
+                    {key: float(features[key]) for key in gpt_extractor.FEATURE_KEYS}, 'gpt_llm_batch'
+                )
+            else:
+                self.stats['feature_retries'] += 1
+                scene_context = {
+                    'objects': detected_objects,
+                    'scene_classification': scene_analysis.get('scene_classification', {}),
+                    'vqa_results': scene_analysis.get('vqa_results', {})
+                }
+                scene_analysis['gpt_features'] = gpt_extractor.extract_gpt_features(scene_analysis, scene_context)
+            
+            self.apply_caption(frame_data, caption.strip() if caption else '')
+            
+            if self.on_frame_done:
+                self.on_frame_done(frame_data, scene_analysis)
+    
+    @staticmethod
+    def apply_caption(frame_data, caption):
+        """LLM 최종 캡션을 프레임 데이터(캡션 필드, caption_sources, comprehensive_features)에 반영"""
+        if not caption:
+            return
+        frame_data['caption'] = caption
+        frame_data['final_caption'] = caption
+        caption_sources = frame_data.get('caption_sources', {})
+        caption_sources['final_caption'] = caption
+        caption_sources['caption_length'] = len(caption)
+        features = frame_data.get('comprehensive_features', {})
+        features['has_caption'] = True
+        features['caption_length'] = len(caption)
+    
+    def _request_batch(self, batch):
+        """K개 프레임 요약 → LLM 요청 → {frame_id: {'caption', 'features'}}
+        
+        응답 토큰 상한에 맞춰 요청당 프레임 수를 나누고, 응답이 잘려 빠진 프레임만 한 번 더 묶어 요청합니다.
+        """
+        frame_summaries = []
+        for frame_data, detected_objects, scene_analysis in batch:
+            object_details, relationship_summary, key_vqa_info = self.scene_analyzer._summarize_for_llm(
+                detected_objects, scene_analysis
+            )
+            scene_info = scene_analysis.get('scene_classification', {})
+            frame_summaries.append({
+                'frame_id': frame_data['image_id'],
+                'timestamp': round(frame_data['timestamp'], 1),
+                'objects': object_details,
+                'scene': {category: scene_info.get(category, {}).get('label', '불명')
+                          for category in ('location', 'time', 'weather', 'activity')},
+                'relationships': relationship_summary,
+                'vqa': key_vqa_info,
+                'blip_caption': frame_data.get('blip_caption', ''),
+                'enhanced_caption': frame_data.get('enhanced_caption', ''),
+                'ocr_text': scene_analysis.get('ocr_text', '')[:200]
+            })
+        
+        results = {}
+        for attempt in range(2):
+            missing = [summary for summary in frame_summaries if summary['frame_id'] not in results]
+            if not missing:
+                break
+            if attempt:
+                self.stats['missing_rerequests'] += len(missing)
+            
+            frames_per_request = max(1, (self._response_token_limit() - 200) // self.TOKENS_PER_FRAME)
+            for i in range(0, len(missing), frames_per_request):
+                results.update(self._request_frames(missing[i:i + frames_per_request]))
+        
+        return results
+    
+    def _response_token_limit(self):
+        """요청 max_tokens 상한 - 게이트웨이의 모든 공급자(폴백 포함)가 받아들이는 값 이하"""
+        provider_limit = get_llm_gateway(self.MODEL).max_output_tokens
+        return min(self.MAX_RESPONSE_TOKENS, provider_limit or self.MAX_RESPONSE_TOKENS)
+    
+    def _request_frames(self, frame_summaries):
+        """프레임 요약 목록 → 한 번의 LLM 요청 → {frame_id: 응답 항목}"""
+        feature_keys = ', '.join(GPTFeatureExtractor.FEATURE_KEYS)
+        prompt = f"""
+        다음은 비디오 프레임 {len(frame_summaries)}개의 분석 결과(JSON)입니다.
+
+        {json.dumps(frame_summaries, ensure_ascii=False)}
+
+        각 프레임마다:
+        1. caption: 모든 정보를 종합한 정확하고 자연스러운 한국어 캡션 (150-300자, 객체의 위치/색상/개수, 관계, 시간대/장소/분위기 포함)
+        2. features: 다음 8개 특징을 0-1 사이 값으로 정량화 - {feature_keys}
+
+        입력 순서대로 프레임별 객체를 담은 JSON 배열로만 응답해주세요:
+        [{{"frame_id": 1, "caption": "...", "features": {{"activity_type": 0.x, ...}}}}, ...]
+        """
+        
+        response = call_groq_llm_enhanced(
+            prompt, self.SYSTEM_PROMPT, model=self.MODEL,
+            max_tokens=min(self._response_token_limit(), 200 + self.TOKENS_PER_FRAME * len(frame_summaries))
+        )
+        
+        requested = {summary['frame_id'] for summary in frame_summaries}
+        return {
+            frame_id: entry for frame_id, entry in self.parse_entries(response).items() if frame_id in requested
+        }
+    
+    @staticmethod
+    def parse_entries(response):
+        """응답에서 frame_id가 있는 JSON 객체를 하나씩 파싱 → {frame_id: 항목}
+        
+        배열 전체를 한 번에 파싱하지 않으므로 응답 끝이 잘려도 완성된 항목은 사용합니다.
+        """
+        entries = {}
+        if not response:
+            return entries
+        
+        decoder = json.JSONDecoder()
+        position = response.find('{')
+        while position != -1:
+            try:
+                entry, end = decoder.raw_decode(response, position)
+            except json.JSONDecodeError:
+                position = response.find('{', position + 1)
+                continue
+            
+            if isinstance(entry, dict) and entry.get('frame_id') is not None:
+                try:
+                    entries[int(entry['frame_id'])] = entry
+                except (TypeError, ValueError):
+                    pass
+            position = response.find('{', end)
+        
+        return entries
+
+
 class EnhancedCaptionGenerator:
     """개선된 캡션 생성기"""
     
@@ -1073,6 +1336,15 @@ class EnhancedCaptionGenerator:
 class AdvancedSceneAnalyzer:
     """고급 Scene 분석기"""
     
+    VQA_QUESTIONS = [
+        "What is happening in this image?",
+        "What is the main activity?",
+        "How many people are in the image?",
+        "What is the setting or location?",
+        "What time of day is it?",
+        "What objects are visible?"
+    ]
+    
     def __init__(self, enable_vqa=True, enable_ocr=True, enable_segmentation=True):
         self.enable_vqa = enable_vqa
         self.enable_ocr = enable_ocr
@@ -1108,6 +1380,9 @@ class AdvancedSceneAnalyzer:
                     torch_dtype=torch.float32
                 )
                 
+                self.vqa_model.eval()
+                self.caption_model.eval()
+                
                 print("🤖 VQA 모델 로드 완료")
                 
             except Exception as e:
@@ -1122,6 +1397,12 @@ class AdvancedSceneAnalyzer:
             self.caption_processor = None
             self.caption_model = None
         
+        # 두 BLIP 체크포인트의 이미지 전처리가 같으면 pixel_values를 한 번만 만들어 공유
+        self.share_pixel_values = bool(
+            self.vqa_processor and self.caption_processor and
+            self.vqa_processor.image_processor.to_dict() == self.caption_processor.image_processor.to_dict()
+        )
+        
         # MediaPipe 포즈 추정
         if MEDIAPIPE_AVAILABLE:
             try:
@@ -1141,8 +1422,15 @@ class AdvancedSceneAnalyzer:
         self.scene_graph_generator = SceneGraphGenerator()
         self.gpt_extractor = GPTFeatureExtractor()
     
-    def comprehensive_scene_analysis(self, frame, frame_id, timestamp, detected_objects):
-        """종합적인 Scene 분석"""
+    def comprehensive_scene_analysis(self, frame, frame_id, timestamp, detected_objects, precomputed=None,
+                                     defer_llm=False):
+        """종합적인 Scene 분석
+        
+        precomputed: 배치 단계나 프레임 캐시에서 가져온 결과
+        ('scene_classification', 'vqa_results', 'blip_caption', 'ocr_text') - 주어진 항목은 다시 계산하지 않습니다.
+        defer_llm: GPT 특징 추출을 건너뜀 (FrameLLMBatcher가 여러 프레임을 묶어 채움)
+        """
+        precomputed = precomputed or {}
         analysis_result = {
             'frame_id': frame_id,
             'timestamp': timestamp,
@@ -1165,23 +1453,24 @@ class AdvancedSceneAnalyzer:
             }
             
             # 2. Scene 분류
-            analysis_result['scene_classification'] = self.scene_classifier.classify_scene(frame)
+            scene_classification = precomputed.get('scene_classification')
+            if scene_classification is None:
+                scene_classification = self.scene_classifier.classify_scene(frame)
+            analysis_result['scene_classification'] = scene_classification
             
             # 3. OCR
-            if self.enable_ocr and self.ocr_reader:
+            if 'ocr_text' in precomputed:
+                analysis_result['ocr_text'] = precomputed['ocr_text']
+            elif self.enable_ocr and self.ocr_reader:
                 analysis_result['ocr_text'] = self.extract_scene_text(frame)
             
-            # 4. VQA
+            # 4. VQA (+ BLIP 캡션을 같은 전처리로 함께 생성)
             if self.enable_vqa:
-                vqa_questions = [
-                    "What is happening in this image?",
-                    "What is the main activity?",
-                    "How many people are in the image?",
-                    "What is the setting or location?",
-                    "What time of day is it?",
-                    "What objects are visible?"
-                ]
-                analysis_result['vqa_results'] = self.answer_vqa_questions(frame, vqa_questions)
+                if 'vqa_results' not in precomputed:
+                    precomputed = {**precomputed, **self.analyze_blip_batch([frame])[0]}
+                analysis_result['vqa_results'] = precomputed.get('vqa_results', {})
+                if 'blip_caption' in precomputed:
+                    analysis_result['blip_caption'] = precomputed['blip_caption']
             
             # 5. Scene Graph 생성
             scene_context = {
@@ -1194,9 +1483,10 @@ class AdvancedSceneAnalyzer:
             )
             
             # 6. GPT 기반 고급 특징 추출
-            analysis_result['gpt_features'] = self.gpt_extractor.extract_gpt_features(
-                analysis_result, scene_context
-            )
+            if not defer_llm:
+                analysis_result['gpt_features'] = self.gpt_extractor.extract_gpt_features(
+                    analysis_result, scene_context
+                )
             
             # 7. 시각적 특징
             analysis_result['visual_features'] = self.extract_visual_features(frame).tolist()
@@ -1209,11 +1499,15 @@ class AdvancedSceneAnalyzer:
         
         return analysis_result
     
-    def generate_enhanced_caption(self, frame, detected_objects, scene_analysis, frame_id, timestamp):
-        """개선된 캡션 생성"""
+    def generate_enhanced_caption(self, frame, detected_objects, scene_analysis, frame_id, timestamp,
+                                  defer_llm=False):
+        """개선된 캡션 생성 - defer_llm이면 LLM 최종 캡션은 FrameLLMBatcher가 나중에 채움"""
         
-        # 1. BLIP 기본 캡션 생성
-        blip_caption = self.generate_advanced_caption(frame)
+        # 1. BLIP 기본 캡션 생성 (Scene 분석 단계에서 이미 생성했으면 재사용)
+        if 'blip_caption' in scene_analysis:
+            blip_caption = scene_analysis['blip_caption']
+        else:
+            blip_caption = self.generate_advanced_caption(frame)
         
         # 2. 향상된 캡션 생성기 사용
         enhanced_caption = self.caption_generator.generate_accurate_caption(
@@ -1221,9 +1515,12 @@ class AdvancedSceneAnalyzer:
         )
         
         # 3. LLM 기반 최종 캡션 생성
-        final_caption = self._generate_llm_caption(
-            frame, detected_objects, scene_analysis, blip_caption, enhanced_caption, frame_id, timestamp
-        )
+        if defer_llm:
+            final_caption = enhanced_caption or blip_caption
+        else:
+            final_caption = self._generate_llm_caption(
+                frame, detected_objects, scene_analysis, blip_caption, enhanced_caption, frame_id, timestamp
+            )
         
         return {
             'blip_caption': blip_caption,
@@ -1238,33 +1535,10 @@ class AdvancedSceneAnalyzer:
         
         try:
             scene_info = scene_analysis.get('scene_classification', {})
-            vqa_info = scene_analysis.get('vqa_results', {})
-            relationships = scene_analysis.get('scene_graph', {}).get('relationships', [])
             ocr_text = scene_analysis.get('ocr_text', '')
-            
-            object_details = []
-            for obj in detected_objects:
-                detail = f"{obj['class']}"
-                if obj.get('color_description') and obj['color_description'] != 'unknown':
-                    detail += f" ({obj['color_description']})"
-                if obj.get('confidence'):
-                    detail += f" [신뢰도: {obj['confidence']:.2f}]"
-                object_details.append(detail)
-            
-            relationship_summary = []
-            for rel in relationships[:3]:
-                relationship_summary.append(f"{rel['subject']} {rel['predicate']} {rel['object']}")
-            
-            key_vqa_info = {}
-            for question, answer in vqa_info.items():
-                if "happening" in question.lower() or "activity" in question.lower():
-                    key_vqa_info['main_activity'] = answer
-                elif "people" in question.lower():
-                    key_vqa_info['people_count'] = answer
-                elif "setting" in question.lower() or "location" in question.lower():
-                    key_vqa_info['location'] = answer
-                elif "time" in question.lower():
-                    key_vqa_info['time'] = answer
+            object_details, relationship_summary, key_vqa_info = self._summarize_for_llm(
+                detected_objects, scene_analysis
+            )
             
             llm_prompt = f"""
             다음은 비디오 프레임 {frame_id} ({timestamp:.1f}초)의 종합 분석 결과입니다. 
@@ -1323,23 +1597,91 @@ class AdvancedSceneAnalyzer:
             print(f"⚠️ LLM 캡션 생성 실패: {e}")
             return enhanced_caption if enhanced_caption else blip_caption
     
+    def _summarize_for_llm(self, detected_objects, scene_analysis):
+        """LLM 프롬프트용 요약 → (객체 설명 목록, 관계 요약 목록, 핵심 VQA 정보)"""
+        vqa_info = scene_analysis.get('vqa_results', {})
+        relationships = scene_analysis.get('scene_graph', {}).get('relationships', [])
+        
+        object_details = []
+        for obj in detected_objects:
+            detail = f"{obj['class']}"
+            if obj.get('color_description') and obj['color_description'] != 'unknown':
+                detail += f" ({obj['color_description']})"
+            if obj.get('confidence'):
+                detail += f" [신뢰도: {obj['confidence']:.2f}]"
+            object_details.append(detail)
+        
+        relationship_summary = []
+        for rel in relationships[:3]:
+            relationship_summary.append(f"{rel['subject']} {rel['predicate']} {rel['object']}")
+        
+        key_vqa_info = {}
+        for question, answer in vqa_info.items():
+            if "happening" in question.lower() or "activity" in question.lower():
+                key_vqa_info['main_activity'] = answer
+            elif "people" in question.lower():
+                key_vqa_info['people_count'] = answer
+            elif "setting" in question.lower() or "location" in question.lower():
+                key_vqa_info['location'] = answer
+            elif "time" in question.lower():
+                key_vqa_info['time'] = answer
+        
+        return object_details, relationship_summary, key_vqa_info
+    
     def generate_advanced_caption(self, frame):
         """BLIP 모델로 고급 캡션 생성"""
-        if not self.caption_processor or not self.caption_model:
-            return ""
+        return self.generate_advanced_captions([frame])[0]
+    
+    def generate_advanced_captions(self, frames, pixel_values=None):
+        """BLIP 캡션 배치 생성 - pixel_values(같은 전처리 결과)가 주어지면 재사용"""
+        if not self.caption_processor or not self.caption_model or not frames:
+            return [""] * len(frames)
         
         try:
-            rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-            image = Image.fromarray(rgb_frame)
-            
-            inputs = self.caption_processor(image, return_tensors="pt")
-            
-            out = self.caption_model.generate(**inputs, max_length=50, do_sample=False)
-            caption = self.caption_processor.decode(out[0], skip_special_tokens=True)
-            return caption
+            if pixel_values is None:
+                pixel_values = self.caption_processor(
+                    images=self._to_pil_images(frames), return_tensors="pt"
+                )['pixel_values']
+            
+            with torch.no_grad():
+                out = self.caption_model.generate(pixel_values=pixel_values, max_length=50, do_sample=False)
+            return self.caption_processor.batch_decode(out, skip_special_tokens=True)
         except Exception as e:
             print(f"⚠️ BLIP 캡션 생성 오류: {e}")
-            return ""
+            return [""] * len(frames)
+    
+    def analyze_blip_batch(self, frames, questions=None):
+        """여러 프레임의 VQA + BLIP 캡션을 한 번에 계산 → 프레임별 {'vqa_results', 'blip_caption'}
+        
+        이미지는 한 번만 전처리하고, VQA는 프레임당 비전 인코더 1회로 모든 질문을 배치 디코딩합니다.
+        """
+        if not frames:
+            return []
+        questions = questions or self.VQA_QUESTIONS
+        
+        pixel_values = None
+        if self.vqa_processor:
+            try:
+                pixel_values = self.vqa_processor(
+                    images=self._to_pil_images(frames), return_tensors="pt"
+                )['pixel_values']
+            except Exception as e:
+                print(f"⚠️ BLIP 전처리 오류: {e}")
+        
+        vqa_results = self.answer_vqa_questions_batch(frames, questions, pixel_values=pixel_values)
+        
+        results = [{'vqa_results': answers} for answers in vqa_results]
+        if self.caption_model:
+            captions = self.generate_advanced_captions(
+                frames, pixel_values=pixel_values if self.share_pixel_values else None
+            )
+            for result, caption in zip(results, captions):
+                result['blip_caption'] = caption
+        
+        return results
+    
+    def _to_pil_images(self, frames):
+        return [Image.fromarray(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)) for frame in frames]
     
     def extract_scene_text(self, frame):
         """OCR로 텍스트 추출"""
@@ -1356,9 +1698,65 @@ class AdvancedSceneAnalyzer:
     
     def answer_vqa_questions(self, frame, questions):
         """VQA로 특정 질문에 답변"""
-        if not self.vqa_processor or not self.vqa_model:
-            return {}
+        return self.answer_vqa_questions_batch([frame], questions)[0]
+    
+    def answer_vqa_questions_batch(self, frames, questions, pixel_values=None):
+        """여러 프레임 × 여러 질문 VQA
+        
+        BlipForQuestionAnswering.generate()는 질문마다 비전 인코더를 다시 실행하므로, 내부 단계를
+        직접 호출합니다: 프레임당 비전 인코더 1회 → (프레임 × 질문) 텍스트 인코더 1배치 → 디코더 1배치.
+        """
+        if not self.vqa_processor or not self.vqa_model or not frames:
+            return [{} for _ in frames]
         
+        try:
+            model = self.vqa_model
+            if pixel_values is None:
+                pixel_values = self.vqa_processor(
+                    images=self._to_pil_images(frames), return_tensors="pt"
+                )['pixel_values']
+            text_inputs = self.vqa_processor.tokenizer(questions, padding=True, return_tensors="pt")
+            num_frames, num_questions = len(frames), len(questions)
+            
+            with torch.no_grad():
+                image_embeds = model.vision_model(pixel_values=pixel_values)[0]
+                # 인코딩된 이미지 특징을 질문 수만큼 복제 (재인코딩 없음)
+                image_embeds = image_embeds.repeat_interleave(num_questions, dim=0)
+                image_attention_mask = torch.ones(image_embeds.size()[:-1], dtype=torch.long)
+                
+                question_embeds = model.text_encoder(
+                    input_ids=text_inputs['input_ids'].repeat(num_frames, 1),
+                    attention_mask=text_inputs['attention_mask'].repeat(num_frames, 1),
+                    encoder_hidden_states=image_embeds,
+                    encoder_attention_mask=image_attention_mask,
+                    return_dict=False
+                )[0]
+                # 질문 길이가 달라 패딩되므로 디코더가 패딩 위치를 참조하지 않도록 질문 마스크 사용
+                question_attention_mask = text_inputs['attention_mask'].repeat(num_frames, 1)
+                
+                bos_ids = torch.full(
+                    (question_embeds.size(0), 1), model.decoder_start_token_id, dtype=torch.long
+                )
+                out = model.text_decoder.generate(
+                    input_ids=bos_ids,
+                    eos_token_id=model.config.text_config.sep_token_id,
+                    pad_token_id=model.config.text_config.pad_token_id,
+                    encoder_hidden_states=question_embeds,
+                    encoder_attention_mask=question_attention_mask,
+                    max_length=50
+                )
+            
+            decoded = self.vqa_processor.batch_decode(out, skip_special_tokens=True)
+            return [
+                dict(zip(questions, decoded[i * num_questions:(i + 1) * num_questions]))
+                for i in range(num_frames)
+            ]
+        except Exception as e:
+            print(f"⚠️ VQA 배치 처리 실패, 질문별 처리로 전환: {e}")
+            return [self._answer_vqa_questions_sequential(frame, questions) for frame in frames]
+    
+    def _answer_vqa_questions_sequential(self, frame, questions):
+        """질문별 VQA (배치 경로를 사용할 수 없을 때의 폴백)"""
         answers = {}
         try:
             rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
@@ -1433,6 +1831,155 @@ class AdvancedSceneAnalyzer:
 
 # video_analyzer.py - EnhancedVideoAnalyzer 클래스 __init__ 및 _load_yolo_model 수정
 
+class AdaptiveFrameSampler:
+    """샷 경계/움직임 기반 적응형 프레임 샘플러
+    
+    저해상도 프레임의 HSV 히스토그램 차이(샷 전환)와 그레이 차분(움직임)을 값싸게 계산한 뒤,
+    고정된 분석 프레임 예산을 샷 시작 지점에 먼저 배분하고 나머지는 움직임이 큰 구간에 몰아줍니다.
+    """
+    
+    def __init__(self, scan_fps=4.0, shot_threshold=0.4, min_shot_seconds=0.5, motion_floor=0.25,
+                 thumb_size=(64, 36), max_scan_samples=1500, seek_threshold=48):
+        self.scan_fps = scan_fps              # 신호 계산용 스캔 빈도 (초당 프레임)
+        self.shot_threshold = shot_threshold  # Bhattacharyya 히스토그램 거리 기준
+        self.min_shot_seconds = min_shot_seconds
+        self.motion_floor = motion_floor      # 정적 구간에도 남길 최소 가중치 (평균 움직임 대비)
+        self.thumb_size = thumb_size
+        self.max_scan_samples = max_scan_samples  # 긴 영상은 스캔 간격을 넓혀 스캔 프레임 수 상한 유지
+        self.seek_threshold = seek_threshold      # 스캔 간격이 이 이상이면 grab 대신 seek
+    
+    def scan_stride(self, total_frames, fps):
+        """스캔 프레임 간격 - scan_fps 기준, 스캔 프레임 수가 max_scan_samples를 넘지 않도록 확대"""
+        stride = max(1, int(round(fps / self.scan_fps))) if fps > 0 else 1
+        if self.max_scan_samples:
+            stride = max(stride, -(-total_frames // self.max_scan_samples))
+        return stride
+    
+    def scan(self, cap, total_frames, fps):
+        """스캔 프레임별 (frame_id, 히스토그램 변화량, 움직임) 목록 - 끝나면 처음 위치로 되돌림
+        
+        스캔 지점만 디코딩합니다. 간격이 seek_threshold 이상이면 지점마다 seek 하므로
+        디코딩량이 영상 길이가 아니라 스캔 지점 수(최대 max_scan_samples)에 비례합니다.
+        frame_id는 분석 프레임과 같이 1부터 시작합니다.
+        """
+        stride = self.scan_stride(total_frames, fps)
+        use_seek = stride >= self.seek_threshold
+        cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        samples = []
+        prev_hist = prev_gray = None
+        position = 0  # 다음 read()가 반환할 0-based 위치
+        try:
+            for target in range(0, total_frames, stride):
+                if use_seek and target != position:
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                    position = target
+                while position < target:
+                    if not cap.grab():
+                        return samples
+                    position += 1
+                
+                ret, frame = cap.read()
+                if not ret:
+                    break
+                position += 1
+                
+                small = cv2.resize(frame, self.thumb_size, interpolation=cv2.INTER_AREA)
+                hsv = cv2.cvtColor(small, cv2.COLOR_BGR2HSV)
+                hist = cv2.calcHist([hsv], [0, 1], None, [16, 8], [0, 180, 0, 256])
+                cv2.normalize(hist, hist)
+                gray = cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.float32)
+                
+                if prev_hist is None:
+                    delta, motion = 0.0, 0.0
+                else:
+                    delta = float(cv2.compareHist(prev_hist, hist, cv2.HISTCMP_BHATTACHARYYA))
+                    motion = float(np.mean(np.abs(gray - prev_gray))) / 255.0
+                
+                samples.append((target + 1, delta, motion))
+                prev_hist, prev_gray = hist, gray
+        finally:
+            cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        
+        return samples
+    
+    def detect_shots(self, samples, total_frames, fps):
+        """히스토그램 변화량이 기준을 넘는 지점을 샷 경계로 → 샷 목록"""
+        if not samples:
+            return []
+        
+        min_gap = max(1, int(self.min_shot_seconds * fps)) if fps > 0 else 1
+        boundaries = [(samples[0][0], 0.0)]
+        for frame_id, delta, _ in samples[1:]:
+            if delta >= self.shot_threshold and frame_id - boundaries[-1][0] >= min_gap:
+                boundaries.append((frame_id, delta))
+        
+        shots = []
+        for index, (start_frame, boundary_score) in enumerate(boundaries):
+            end_frame = boundaries[index + 1][0] - 1 if index + 1 < len(boundaries) else total_frames
+            motions = [motion for frame_id, _, motion in samples[1:] if start_frame < frame_id <= end_frame]
+            shots.append({
+                'shot_id': index + 1,
+                'start_frame': start_frame,
+                'end_frame': end_frame,
+                'start_time': start_frame / fps if fps > 0 else 0.0,  # 프레임 timestamp(image_id / fps)와 동일 기준
+                'end_time': end_frame / fps if fps > 0 else 0.0,
+                'frame_count': end_frame - start_frame + 1,
+                'boundary_score': round(boundary_score, 4),
+                'mean_motion': round(float(np.mean(motions)), 4) if motions else 0.0
+            })
+        return shots
+    
+    def allocate(self, samples, shots, budget):
+        """프레임 예산 배분 → 정렬된 분석 대상 frame_id 목록
+        
+        1) 각 샷의 시작 프레임 (샷이 예산보다 많으면 경계 점수가 큰 샷 우선)
+        2) 남은 예산은 (움직임 + 최소 가중치) 누적 분포를 등간격으로 잘라 선택 - 움직임이 큰 구간일수록 촘촘
+        """
+        if not samples or budget <= 0:
+            return []
+        
+        ranked_shots = sorted(shots, key=lambda shot: shot['boundary_score'], reverse=True)
+        selected = {shot['start_frame'] for shot in ranked_shots[:budget]}
+        
+        remaining = budget - len(selected)
+        if remaining > 0:
+            motions = [motion for _, _, motion in samples]
+            floor = self.motion_floor * float(np.mean(motions)) if any(motions) else 1.0
+            weights = [motion + floor for motion in motions]
+            step = sum(weights) / remaining
+            
+            target = step / 2
+            cumulative = 0.0
+            for (frame_id, _, _), weight in zip(samples, weights):
+                cumulative += weight
+                if cumulative >= target:
+                    selected.add(frame_id)
+                    while cumulative >= target:
+                        target += step
+            
+            # 샷 시작과 겹쳐 모자란 만큼 움직임이 큰 스캔 프레임으로 채움
+            if len(selected) < budget:
+                candidates = sorted(
+                    (item for item in samples if item[0] not in selected), key=lambda item: item[2], reverse=True
+                )
+                selected.update(frame_id for frame_id, _, _ in candidates[:budget - len(selected)])
+        
+        return sorted(selected)
+    
+    def plan(self, cap, total_frames, fps, budget):
+        """스캔 → 샷 검출 → 예산 배분. (frame_ids, shots) 반환, 샷별 분석 대상 frame_id 포함"""
+        samples = self.scan(cap, total_frames, fps)
+        shots = self.detect_shots(samples, total_frames, fps)
+        frame_ids = self.allocate(samples, shots, min(budget, len(samples)))
+        
+        for shot in shots:
+            shot['sampled_frame_ids'] = [
+                frame_id for frame_id in frame_ids if shot['start_frame'] <= frame_id <= shot['end_frame']
+            ]
+        return frame_ids, shots
+
+
 class EnhancedVideoAnalyzer:
     """최고급 비디오 분석기 - Django 통합"""
     
@@ -1441,6 +1988,9 @@ class EnhancedVideoAnalyzer:
         self.model = None
         self.confidence_threshold = confidence_threshold
         
+        # 샤드 워커 프로세스에서 동일한 설정으로 분석기를 재생성하기 위해 보관
+        self._init_kwargs = dict(kwargs, model_path=model_path, confidence_threshold=confidence_threshold)
+        
         # 설정값들
         self.enable_color_analysis = kwargs.get('enable_color_analysis', True)
         self.enable_tracking = kwargs.get('enable_tracking', True)
@@ -1452,6 +2002,28 @@ class EnhancedVideoAnalyzer:
         self.enable_ocr = kwargs.get('enable_ocr', True)
         self.enable_gpt_features = kwargs.get('enable_gpt_features', True)
         
+        # 파이프라인 분석 설정 (디코딩 → YOLO 배치 추론 → Scene 분석 단계 분리)
+        self.enable_pipelined_analysis = kwargs.get('enable_pipelined_analysis', True)
+        self.inference_batch_size = max(1, int(kwargs.get('inference_batch_size', 8)))
+        self.frame_queue_size = max(1, int(kwargs.get('frame_queue_size', 16)))
+        self.seek_threshold = max(1, int(kwargs.get('seek_threshold', 48)))  # 이 간격 이상이면 grab 대신 seek
+        
+        # LLM 캡션/특징을 여러 프레임씩 묶어 요청 (1이면 프레임별 요청)
+        self.llm_batch_size = max(1, int(kwargs.get('llm_batch_size', 4)))
+        
+        # 적응형 샘플링 (샷 전환/움직임 구간에 프레임 예산 집중, 끄면 고정 간격)
+        self.enable_adaptive_sampling = kwargs.get('enable_adaptive_sampling', True)
+        self.frame_sampler = AdaptiveFrameSampler(
+            scan_fps=float(kwargs.get('sampling_scan_fps', 4.0)),
+            shot_threshold=float(kwargs.get('shot_threshold', 0.4)),
+            max_scan_samples=int(kwargs.get('sampling_max_scan_frames', 1500)),
+            seek_threshold=self.seek_threshold
+        )
+        
+        # 프레임별 모델 출력 캐시 (비디오 내용 해시 기준, 재분석 시 재사용)
+        self.enable_frame_cache = kwargs.get('enable_frame_cache', True)
+        self.frame_cache_dir = kwargs.get('frame_cache_dir')
+        
         # 시스템 기능 상태 속성 추가
         self.clip_available = TRANSFORMERS_AVAILABLE
         self.ocr_available = OCR_AVAILABLE
@@ -1459,6 +2031,13 @@ class EnhancedVideoAnalyzer:
         self.scene_graph_available = NETWORKX_AVAILABLE
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
         
+        # 샤드 분석 설정 (긴 비디오를 시간 구간별로 나눠 워커 프로세스에서 병렬 분석)
+        # GPU는 프로세스 간 공유가 비효율적이므로 CPU 환경에서만 기본 활성화
+        self.enable_sharded_analysis = kwargs.get('enable_sharded_analysis', self.device == "cpu")
+        self.num_shards = int(kwargs.get('num_shards', 0)) or min(4, os.cpu_count() or 1)
+        self.min_shard_duration = float(kwargs.get('min_shard_duration', 300))  # 샤드당 최소 길이(초)
+        self.track_stitch_iou = float(kwargs.get('track_stitch_iou', 0.3))
+        
         print(f"🧠 Enhanced 비디오 분석기 초기화 중... (디바이스: {self.device})")
         
         # YOLO 모델 로딩 (개선된 예외처리)
@@ -1564,49 +2143,7 @@ class EnhancedVideoAnalyzer:
             detected_objects = []
             
             for result in results:
-                if result.boxes is not None and len(result.boxes) > 0:
-                    boxes = result.boxes.xyxy.cpu().numpy()
-                    confidences = result.boxes.conf.cpu().numpy()
-                    class_ids = result.boxes.cls.cpu().numpy().astype(int)
-                    
-                    if self.enable_tracking and result.boxes.id is not None:
-                        track_ids = result.boxes.id.cpu().numpy().astype(int)
-                    else:
-                        track_ids = np.arange(len(boxes))
-                    
-                    h, w = frame.shape[:2]
-                    
-                    for i, (box, conf, cls_id, track_id) in enumerate(zip(boxes, confidences, class_ids, track_ids)):
-                        if conf > self.confidence_threshold and cls_id in ENHANCED_OBJECTS:
-                            class_name = ENHANCED_OBJECTS[cls_id]
-                            
-                            normalized_box = [
-                                round(float(box[0]) / w, 4),
-                                round(float(box[1]) / h, 4),
-                                round(float(box[2]) / w, 4),
-                                round(float(box[3]) / h, 4)
-                            ]
-                            
-                            obj_info = {
-                                'class': class_name,
-                                'bbox': normalized_box,
-                                'track_id': int(track_id),
-                                'confidence': float(conf),
-                                'colors': [],
-                                'color_description': "unknown"
-                            }
-                            
-                            # 색상 분석 (예외 처리 추가)
-                            if self.enable_color_analysis and hasattr(self, 'color_analyzer'):
-                                try:
-                                    colors = self.color_analyzer.extract_dominant_colors(frame, normalized_box)
-                                    obj_info['colors'] = colors
-                                    obj_info['color_description'] = self.color_analyzer.get_color_description(colors)
-                                except Exception as e:
-                                    # 색상 분석 실패는 로그 없이 기본값 사용
-                                    pass
-                            
-                            detected_objects.append(obj_info)
+                detected_objects.extend(self._parse_detection_result(result, frame))
             
             return detected_objects
             
@@ -1614,8 +2151,86 @@ class EnhancedVideoAnalyzer:
             log_once(f"❌ 객체 감지 오류: {e}", "ERROR")
             return []
     
-    def analyze_video_comprehensive(self, video, analysis_type='comprehensive', progress_callback=None):
-        """비디오 종합 분석 - Django 모델과 연동"""
+    def detect_objects_batch(self, frames):
+        """여러 프레임 미니배치 객체 감지 - 프레임 순서대로 결과 리스트 반환"""
+        if not frames:
+            return []
+        
+        if self.model is None:
+            return [self.detect_objects_comprehensive(frame) for frame in frames]
+        
+        try:
+            # 트래킹 모드에서도 배치 내 프레임은 순서대로 같은 트래커에 전달됨
+            if self.enable_tracking:
+                results = self.model.track(frames, verbose=False, persist=True, conf=self.confidence_threshold)
+            else:
+                results = self.model(frames, verbose=False, conf=self.confidence_threshold)
+            
+            return [self._parse_detection_result(result, frame) for result, frame in zip(results, frames)]
+            
+        except Exception as e:
+            log_once(f"⚠️ 배치 객체 감지 실패, 단일 프레임 감지로 전환: {e}", "WARNING")
+            return [self.detect_objects_comprehensive(frame) for frame in frames]
+    
+    def _parse_detection_result(self, result, frame):
+        """YOLO 결과 1개를 객체 정보 리스트로 변환"""
+        detected_objects = []
+        
+        if result.boxes is None or len(result.boxes) == 0:
+            return detected_objects
+        
+        boxes = result.boxes.xyxy.cpu().numpy()
+        confidences = result.boxes.conf.cpu().numpy()
+        class_ids = result.boxes.cls.cpu().numpy().astype(int)
+        
+        if self.enable_tracking and result.boxes.id is not None:
+            track_ids = result.boxes.id.cpu().numpy().astype(int)
+        else:
+            track_ids = np.arange(len(boxes))
+        
+        h, w = frame.shape[:2]
+        
+        for i, (box, conf, cls_id, track_id) in enumerate(zip(boxes, confidences, class_ids, track_ids)):
+            if conf > self.confidence_threshold and cls_id in ENHANCED_OBJECTS:
+                class_name = ENHANCED_OBJECTS[cls_id]
+                
+                normalized_box = [
+                    round(float(box[0]) / w, 4),
+                    round(float(box[1]) / h, 4),
+                    round(float(box[2]) / w, 4),
+                    round(float(box[3]) / h, 4)
+                ]
+                
+                obj_info = {
+                    'class': class_name,
+                    'bbox': normalized_box,
+                    'track_id': int(track_id),
+                    'confidence': float(conf),
+                    'colors': [],
+                    'color_description': "unknown"
+                }
+                
+                detected_objects.append(obj_info)
+        
+        # 색상 분석 - 프레임의 모든 박스를 한 번에 처리 (실패 시 기본값 유지)
+        if detected_objects and self.enable_color_analysis and hasattr(self, 'color_analyzer'):
+            colors_per_box = self.color_analyzer.extract_dominant_colors_batch(
+                frame, [obj['bbox'] for obj in detected_objects]
+            )
+            for obj_info, colors in zip(detected_objects, colors_per_box):
+                obj_info['colors'] = colors
+                obj_info['color_description'] = self.color_analyzer.get_color_description(colors)
+        
+        return detected_objects
+    
+    def analyze_video_comprehensive(self, video, analysis_type='comprehensive', progress_callback=None,
+                                    frame_callback=None):
+        """비디오 종합 분석 - Django 모델과 연동
+        
+        frame_callback(frame_id, timestamp, frame, detected_objects)가 주어지면 디코딩된 샘플 프레임을
+        분석 직후 그대로 전달합니다 (후속 분석 단계가 비디오를 다시 디코딩하지 않도록).
+        샤드 분석은 워커 프로세스에서 디코딩하므로 콜백이 호출되지 않습니다.
+        """
         try:
             from django.conf import settings
             import os
@@ -1644,101 +2259,64 @@ class EnhancedVideoAnalyzer:
             video.duration = duration
             video.save()
             
-            # 프레임 샘플링 (분석 타입에 따라 조정)
-            sample_intervals = {
-                'basic': max(1, total_frames // 30),
-                'enhanced': max(1, total_frames // 50),
-                'comprehensive': max(1, total_frames // 100),
-                'custom': max(1, total_frames // 75)
+            # 프레임 샘플링 예산 (분석 타입에 따라 조정)
+            frame_budgets = {
+                'basic': 30,
+                'enhanced': 50,
+                'comprehensive': 100,
+                'custom': 75
             }
-            sample_interval = sample_intervals.get(analysis_type, max(1, total_frames // 50))
-            
-            frame_results = []
-            processed_frames = 0
-            frame_id = 0
+            frame_budget = frame_budgets.get(analysis_type, 50)
+            sample_interval = max(1, total_frames // frame_budget)
             
             log_once(f"🎬 비디오 분석 시작: {video.original_name} ({analysis_type})", "INFO")
-            log_once(f"📊 총 프레임: {total_frames}, 샘플링 간격: {sample_interval}", "INFO")
             
-            while cap.isOpened():
-                ret, frame = cap.read()
-                if not ret:
-                    break
-                
-                frame_id += 1
-                
-                # 샘플링 체크
-                if frame_id % sample_interval != 1:
-                    continue
-                
-                timestamp = frame_id / fps
-                
+            # 적응형 샘플링 - 샷/움직임 신호로 분석 프레임 선택 (실패 시 고정 간격)
+            frame_ids, shots = None, []
+            if self.enable_adaptive_sampling and total_frames > 0:
                 try:
-                    # 1. 객체 감지
-                    detected_objects = self.detect_objects_comprehensive(frame)
-                    
-                    # 2. Scene 분석
-                    scene_analysis = {}
-                    if self.enable_scene_analysis and hasattr(self, 'scene_analyzer') and self.scene_analyzer:
-                        scene_analysis = self.scene_analyzer.comprehensive_scene_analysis(
-                            frame, frame_id, timestamp, detected_objects
-                        )
-                    
-                    # 3. 향상된 캡션 생성
-                    caption_result = {}
-                    if self.enable_scene_analysis and hasattr(self, 'scene_analyzer') and self.scene_analyzer:
-                        caption_result = self.scene_analyzer.generate_enhanced_caption(
-                            frame, detected_objects, scene_analysis, frame_id, timestamp
-                        )
-                    else:
-                        # 기본 캡션
-                        basic_caption = f"프레임 {frame_id} ({timestamp:.1f}초)에서 {len(detected_objects)}개의 객체가 감지되었습니다."
-                        if detected_objects:
-                            object_list = [obj['class'] for obj in detected_objects[:3]]
-                            basic_caption += f" 주요 객체: {', '.join(object_list)}"
-                        
-                        caption_result = {
-                            'blip_caption': "",
-                            'enhanced_caption': basic_caption,
-                            'final_caption': basic_caption,
-                            'caption_length': len(basic_caption),
-                            'has_multiple_sources': False
-                        }
-                    
-                    # 4. 프레임 데이터 구성
-                    frame_dict = {
-                        "image_id": frame_id,
-                        "timestamp": timestamp,
-                        "objects": detected_objects,
-                        "scene_analysis": scene_analysis,
-                        "caption": caption_result.get('final_caption', ''),
-                        "blip_caption": caption_result.get('blip_caption', ''),
-                        "enhanced_caption": caption_result.get('enhanced_caption', ''),
-                        "final_caption": caption_result.get('final_caption', ''),
-                        "caption_sources": caption_result,
-                        "comprehensive_features": {
-                            "object_count": len(detected_objects),
-                            "object_types": list(set(obj['class'] for obj in detected_objects)),
-                            "scene_complexity": len(scene_analysis.get('scene_graph', {}).get('relationships', [])),
-                            "has_text": bool(scene_analysis.get('ocr_text', '')),
-                            "has_caption": bool(caption_result.get('final_caption', '')),
-                            "caption_length": caption_result.get('caption_length', 0),
-                            "caption_quality": "enhanced" if caption_result.get('has_multiple_sources', False) else "basic",
-                            "analysis_success": True
-                        }
-                    }
-                    
-                    frame_results.append(frame_dict)
-                    processed_frames += 1
-                    
-                    # 진행률 콜백 (로그 중복 방지)
-                    if progress_callback and processed_frames % 5 == 0:  # 5프레임마다만 콜백
-                        progress = (frame_id / total_frames) * 100
-                        progress_callback(progress, f"프레임 {frame_id}/{total_frames} 분석 중")
-                
+                    frame_ids, shots = self.frame_sampler.plan(cap, total_frames, fps, frame_budget)
                 except Exception as e:
-                    log_once(f"❌ 프레임 {frame_id} 분석 실패: {e}", "ERROR")
-                    continue
+                    log_once(f"⚠️ 적응형 샘플링 실패, 고정 간격 사용: {e}", "WARNING")
+                    frame_ids, shots = None, []
+                    cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            
+            if frame_ids:
+                sampling_key = f"adaptive-{hashlib.sha1(json.dumps(frame_ids).encode()).hexdigest()[:12]}"
+                log_once(f"📊 총 프레임: {total_frames}, 적응형 샘플링: {len(frame_ids)}개 프레임, {len(shots)}개 샷", "INFO")
+            else:
+                frame_ids = None
+                sampling_key = str(sample_interval)
+                log_once(f"📊 총 프레임: {total_frames}, 샘플링 간격: {sample_interval}", "INFO")
+            
+            shard_count = self._get_shard_count(duration, total_frames, sample_interval, frame_ids)
+            frame_cache = self._open_frame_cache(video_path, sampling_key, shard_count=shard_count)
+            
+            if shard_count > 1:
+                frame_results = self._run_sharded_frame_analysis(
+                    video_path, cap, total_frames, fps, sample_interval, shard_count, progress_callback,
+                    frame_cache=frame_cache, frame_ids=frame_ids, sampling_key=sampling_key
+                )
+            elif self.enable_pipelined_analysis:
+                frame_results = self._run_pipelined_frame_analysis(
+                    cap, total_frames, fps, sample_interval, progress_callback,
+                    frame_callback=frame_callback, frame_cache=frame_cache, frame_ids=frame_ids
+                )
+            else:
+                frame_results = self._run_sequential_frame_analysis(
+                    cap, total_frames, fps, sample_interval, progress_callback, frame_callback,
+                    frame_cache=frame_cache, frame_ids=frame_ids
+                )
+            processed_frames = len(frame_results)
+            
+            frame_cache_stats = None
+            if frame_cache is not None:
+                try:
+                    frame_cache.save()
+                except Exception as e:
+                    log_once(f"⚠️ 프레임 캐시 저장 실패: {e}", "WARNING")
+                frame_cache_stats = frame_cache.get_stats()
+                log_once(f"🗃️ 프레임 캐시: 재사용 {frame_cache_stats['hits']}건, 신규 {frame_cache_stats['stored']}건", "INFO")
             
             cap.release()
             
@@ -1793,6 +2371,12 @@ class EnhancedVideoAnalyzer:
                     'method': 'Enhanced_MultiModal_Analysis',
                     'analysis_type': analysis_type,
                     'sample_interval': sample_interval,
+                    'sampling': 'adaptive' if frame_ids else 'fixed',
+                    'frame_budget': frame_budget,
+                    'pipelined': self.enable_pipelined_analysis,
+                    'shards': shard_count,
+                    'inference_batch_size': self.inference_batch_size if self.enable_pipelined_analysis else 1,
+                    'frame_cache': frame_cache_stats,
                     'features_enabled': {
                         'yolo': self.model is not None,
                         'clip': self.clip_available,
@@ -1802,12 +2386,617 @@ class EnhancedVideoAnalyzer:
                     }
                 },
                 'total_frames_analyzed': processed_frames,
+                'shots': shots,
+                'llm_gateway_metrics': get_llm_gateway_metrics(),
                 'success': True
             }
             
         except Exception as e:
             log_once(f"❌ 비디오 분석 실패: {e}", "ERROR")
             return {'error': str(e), 'success': False}
+    
+    def _run_sequential_frame_analysis(self, cap, total_frames, fps, sample_interval, progress_callback=None,
+                                       frame_callback=None, frame_cache=None, frame_ids=None):
+        """순차 분석 - 모든 프레임을 읽고 샘플 프레임마다 감지/Scene 분석 수행
+        
+        frame_ids(적응형 샘플링 결과)가 주어지면 sample_interval 대신 해당 프레임만 분석합니다.
+        """
+        frame_results = []
+        frame_id = 0
+        sampled_ids = self._sampled_frame_ids(total_frames, sample_interval, frame_ids)
+        sampled_set = set(sampled_ids)
+        llm_batcher = self._create_llm_batcher(frame_cache)
+        use_detection_cache = self._use_detection_cache(frame_cache, sampled_ids)
+        
+        while cap.isOpened():
+            ret, frame = cap.read()
+            if not ret:
+                break
+            
+            frame_id += 1
+            
+            # 샘플링 체크
+            if frame_id not in sampled_set:
+                continue
+            
+            timestamp = frame_id / fps
+            
+            try:
+                # 1. 객체 감지
+                detected_objects = frame_cache.get('detection', frame_id) if use_detection_cache else None
+                if detected_objects is None:
+                    detected_objects = self.detect_objects_comprehensive(frame)
+                    if frame_cache is not None:
+                        frame_cache.put('detection', frame_id, detected_objects)
+                
+                # 2~4. Scene 분석, 캡션 생성, 프레임 데이터 구성
+                frame_results.append(
+                    self._analyze_frame_scene(frame, frame_id, timestamp, detected_objects,
+                                              llm_batcher=llm_batcher, frame_cache=frame_cache)
+                )
+                
+                if frame_callback:
+                    frame_callback(frame_id, timestamp, frame, detected_objects)
+                
+                # 진행률 콜백 (로그 중복 방지)
+                if progress_callback and len(frame_results) % 5 == 0:  # 5프레임마다만 콜백
+                    progress = (frame_id / total_frames) * 100
+                    progress_callback(progress, f"프레임 {frame_id}/{total_frames} 분석 중")
+            
+            except Exception as e:
+                log_once(f"❌ 프레임 {frame_id} 분석 실패: {e}", "ERROR")
+                continue
+        
+        if llm_batcher:
+            llm_batcher.flush()
+        
+        return frame_results
+    
+    def _run_pipelined_frame_analysis(self, cap, total_frames, fps, sample_interval, progress_callback=None,
+                                      start_frame=1, end_frame=None, frame_callback=None, frame_cache=None,
+                                      frame_ids=None):
+        """파이프라인 분석 - 디코딩 스레드 → YOLO 배치 추론 스레드 → Scene 분석/캡션(현재 스레드)
+        
+        각 단계는 크기가 제한된 큐로 연결되어 있어 디코딩이 앞서 나가도 메모리가 일정하게 유지됩니다.
+        frame_cache가 주어지면 캐시된 단계 출력은 재사용하고 없는 프레임/단계만 계산합니다.
+        """
+        sampled_ids = self._sampled_frame_ids(total_frames, sample_interval, frame_ids, start_frame, end_frame)
+        use_detection_cache = self._use_detection_cache(frame_cache, sampled_ids)
+        decode_queue = queue.Queue(maxsize=self.frame_queue_size)
+        scene_queue = queue.Queue(maxsize=self.frame_queue_size)
+        stop_event = threading.Event()
+        stage_errors = []
+        
+        def put(q, item):
+            while not stop_event.is_set():
+                try:
+                    q.put(item, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        def get(q):
+            while not stop_event.is_set():
+                try:
+                    return q.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+            return None
+        
+        def decode_stage():
+            try:
+                for item in self._iter_sampled_frames(cap, fps, sampled_ids):
+                    if not put(decode_queue, item):
+                        return
+            except Exception as e:
+                stage_errors.append(('decode', e))
+            finally:
+                put(decode_queue, None)
+        
+        def detect_stage():
+            batch = []
+            
+            def flush():
+                frame_ids = [frame_id for frame_id, _, _ in batch]
+                frames = [frame for _, _, frame in batch]
+                detections = self._detect_objects_batch_cached(frame_ids, frames, frame_cache, use_detection_cache)
+                precomputed_batch = self._precompute_scene_batch(frame_ids, frames, frame_cache)
+                for (frame_id, timestamp, frame), detected_objects, precomputed in zip(
+                        batch, detections, precomputed_batch):
+                    if not put(scene_queue, (frame_id, timestamp, frame, detected_objects, precomputed)):
+                        break
+                batch.clear()
+            
+            try:
+                while True:
+                    item = get(decode_queue)
+                    if item is None:
+                        break
+                    batch.append(item)
+                    if len(batch) >= self.inference_batch_size:
+                        flush()
+                if batch:
+                    flush()
+            except Exception as e:
+                stage_errors.append(('detect', e))
+            finally:
+                put(scene_queue, None)
+        
+        workers = [
+            threading.Thread(target=decode_stage, name='video-decode', daemon=True),
+            threading.Thread(target=detect_stage, name='video-detect', daemon=True)
+        ]
+        for worker in workers:
+            worker.start()
+        
+        frame_results = []
+        llm_batcher = self._create_llm_batcher(frame_cache)
+        try:
+            while True:
+                item = get(scene_queue)
+                if item is None:
+                    break
+                
+                frame_id, timestamp, frame, detected_objects, precomputed = item
+                
+                try:
+                    frame_results.append(
+                        self._analyze_frame_scene(frame, frame_id, timestamp, detected_objects, precomputed,
+                                                  llm_batcher=llm_batcher, frame_cache=frame_cache)
+                    )
+                    
+                    if frame_callback:
+                        frame_callback(frame_id, timestamp, frame, detected_objects)
+                    
+                    if progress_callback and len(frame_results) % 5 == 0:
+                        progress = (frame_id / total_frames) * 100
+                        progress_callback(progress, f"프레임 {frame_id}/{total_frames} 분석 중")
+                
+                except Exception as e:
+                    log_once(f"❌ 프레임 {frame_id} 분석 실패: {e}", "ERROR")
+                    continue
+        finally:
+            stop_event.set()
+            for worker in workers:
+                worker.join()
+        
+        if llm_batcher:
+            llm_batcher.flush()
+        
+        for stage, error in stage_errors:
+            log_once(f"⚠️ 파이프라인 {stage} 단계 오류 (부분 결과 사용): {error}", "WARNING")
+        
+        return frame_results
+    
+    def _get_shard_count(self, duration, total_frames, sample_interval, frame_ids=None):
+        """비디오 길이에 따른 샤드 수 결정 (1이면 단일 프로세스 분석)"""
+        if not self.enable_sharded_analysis or self.num_shards < 2 or self.min_shard_duration <= 0:
+            return 1
+        
+        sampled_count = len(self._sampled_frame_ids(total_frames, sample_interval, frame_ids))
+        return max(1, min(self.num_shards, int(duration // self.min_shard_duration), sampled_count))
+    
+    def _run_sharded_frame_analysis(self, video_path, cap, total_frames, fps, sample_interval,
+                                    shard_count, progress_callback=None, frame_cache=None, frame_ids=None,
+                                    sampling_key=None):
+        """샤드 분석 - 샘플 프레임을 연속된 시간 구간으로 나눠 워커 프로세스별로 분석 후 병합
+        
+        각 워커는 자체 VideoCapture와 모델 인스턴스를 사용합니다. 구간 경계는 샘플링 격자
+        위에서 나누므로 image_id는 단일 프로세스 분석과 동일합니다.
+        """
+        sampled_ids = self._sampled_frame_ids(total_frames, sample_interval, frame_ids)
+        chunk = -(-len(sampled_ids) // shard_count)
+        shard_ranges = [
+            (sampled_ids[i], sampled_ids[min(i + chunk, len(sampled_ids)) - 1])
+            for i in range(0, len(sampled_ids), chunk)
+        ]
+        
+        log_once(f"🧩 샤드 분석 시작: {len(shard_ranges)}개 구간, 워커 {len(shard_ranges)}개", "INFO")
+        
+        torch_threads = max(1, (os.cpu_count() or 1) // len(shard_ranges))
+        shard_results = {}
+        
+        try:
+            with ProcessPoolExecutor(
+                max_workers=len(shard_ranges),
+                mp_context=multiprocessing.get_context('spawn'),
+                initializer=_init_shard_worker,
+                initargs=(self._init_kwargs, torch_threads)
+            ) as executor:
+                cache_root = os.path.dirname(frame_cache.cache_dir) if frame_cache is not None else None
+                futures = {
+                    executor.submit(_analyze_video_shard, video_path, index, start, end, sample_interval,
+                                    cache_root, frame_ids and [i for i in frame_ids if start <= i <= end],
+                                    sampling_key or str(sample_interval), shard_count): index
+                    for index, (start, end) in enumerate(shard_ranges)
+                }
+                
+                for future in as_completed(futures):
+                    index = futures[future]
+                    try:
+                        shard_results[index], cache_updates = future.result()
+                    except Exception as e:
+                        log_once(f"⚠️ 샤드 {index} 워커 분석 실패: {e}", "WARNING")
+                        continue
+                    
+                    # 워커가 새로 계산한 출력은 현재 프로세스의 캐시에 모아 한 번에 저장
+                    if frame_cache is not None:
+                        frame_cache.merge_updates(cache_updates)
+                    
+                    if progress_callback:
+                        progress = len(shard_results) / len(shard_ranges) * 100
+                        progress_callback(progress, f"구간 {len(shard_results)}/{len(shard_ranges)} 분석 완료")
+        
+        except Exception as e:
+            log_once(f"⚠️ 샤드 프로세스 풀 실행 실패, 현재 프로세스에서 분석: {e}", "WARNING")
+        
+        # 실패한 구간은 현재 프로세스에서 재분석
+        for index, (start, end) in enumerate(shard_ranges):
+            if index in shard_results:
+                continue
+            self._reset_sequence_state()
+            shard_results[index] = self._run_pipelined_frame_analysis(
+                cap, total_frames, fps, sample_interval, None, start, end, frame_cache=frame_cache,
+                frame_ids=frame_ids
+            )
+        
+        return self._merge_shard_results([shard_results[index] for index in range(len(shard_ranges))])
+    
+    def _reset_sequence_state(self):
+        """새로운 구간 분석 전에 트래커/캡션 시간 맥락 초기화"""
+        predictor = getattr(self.model, 'predictor', None) if self.model is not None else None
+        for tracker in getattr(predictor, 'trackers', None) or []:
+            try:
+                tracker.reset()
+            except Exception as e:
+                log_once(f"⚠️ 트래커 초기화 실패: {e}", "WARNING")
+        
+        scene_analyzer = getattr(self, 'scene_analyzer', None)
+        if scene_analyzer is not None:
+            scene_analyzer.caption_generator.temporal_context = []
+    
+    def _merge_shard_results(self, shard_frame_results):
+        """샤드별 frame_results를 시간순으로 병합하고 구간 경계에서 track_id 연결"""
+        merged = []
+        next_track_id = 1
+        
+        for frames in shard_frame_results:
+            frames = sorted(frames, key=lambda f: f.get('timestamp', 0))
+            if not frames:
+                continue
+            
+            mapping = {}
+            if self.enable_tracking and merged:
+                mapping = self._stitch_boundary_tracks(merged[-1].get('objects', []), frames[0].get('objects', []))
+            
+            for frame_dict in frames:
+                for obj in frame_dict.get('objects', []):
+                    track_id = obj.get('track_id')
+                    if track_id is not None and track_id not in mapping:
+                        if self.enable_tracking:
+                            mapping[track_id] = next_track_id
+                            next_track_id += 1
+                        else:
+                            mapping[track_id] = track_id
+                
+                if self.enable_tracking:
+                    _remap_frame_track_ids(frame_dict, mapping)
+                
+                merged.append(frame_dict)
+            
+            if mapping:
+                next_track_id = max(next_track_id, max(mapping.values()) + 1)
+        
+        return merged
+    
+    def _stitch_boundary_tracks(self, prev_objects, next_objects):
+        """경계 프레임 간 같은 클래스 객체를 IoU 기준으로 매칭 → {다음 구간 track_id: 이전 track_id}"""
+        candidates = []
+        for prev_obj in prev_objects:
+            for next_obj in next_objects:
+                if prev_obj.get('class') != next_obj.get('class'):
+                    continue
+                iou = _bbox_iou(prev_obj.get('bbox', []), next_obj.get('bbox', []))
+                if iou >= self.track_stitch_iou:
+                    candidates.append((iou, prev_obj['track_id'], next_obj['track_id']))
+        
+        candidates.sort(key=lambda c: c[0], reverse=True)
+        
+        mapping = {}
+        used_prev = set()
+        for iou, prev_id, next_id in candidates:
+            if next_id in mapping or prev_id in used_prev:
+                continue
+            mapping[next_id] = prev_id
+            used_prev.add(prev_id)
+        
+        return mapping
+    
+    def _sampled_frame_ids(self, total_frames, sample_interval, frame_ids=None, start_frame=1, end_frame=None):
+        """[start_frame, end_frame] 구간의 분석 대상 frame_id 목록 (적응형 결과 또는 고정 간격)"""
+        end_frame = total_frames if end_frame is None else min(end_frame, total_frames)
+        if frame_ids is not None:
+            return [frame_id for frame_id in frame_ids if start_frame <= frame_id <= end_frame]
+        return list(range(start_frame, end_frame + 1, sample_interval))
+    
+    def _iter_sampled_frames(self, cap, fps, frame_ids):
+        """샘플링 대상 프레임만 디코딩하여 (image_id, timestamp, frame) 생성
+        
+        image_id는 기존 순차 분석과 동일하게 1부터 시작합니다. 간격이 짧으면 grab()으로
+        건너뛰고(BGR 변환 생략), seek_threshold 이상 떨어져 있으면 seek 합니다.
+        """
+        position = int(cap.get(cv2.CAP_PROP_POS_FRAMES))  # 다음 read()가 반환할 0-based 위치
+        
+        for frame_id in frame_ids:
+            target = frame_id - 1
+            
+            if target < position or target - position >= self.seek_threshold:
+                cap.set(cv2.CAP_PROP_POS_FRAMES, target)
+                position = target
+            
+            while position < target:
+                if not cap.grab():
+                    return
+                position += 1
+            
+            ret, frame = cap.read()
+            if not ret:
+                return
+            position += 1
+            
+            timestamp = frame_id / fps if fps > 0 else 0.0
+            yield frame_id, timestamp, frame
+    
+    def _precompute_scene_batch(self, frame_ids, frames, frame_cache=None):
+        """배치 단위 CLIP Scene 분류 + BLIP VQA/캡션 (파이프라인 감지 단계) → 프레임별 precomputed dict
+        
+        frame_cache에 있는 프레임은 캐시 값을 쓰고, 없는 프레임만 모아 배치로 계산합니다.
+        """
+        precomputed = [self._cached_precomputed(frame_cache, frame_id) for frame_id in frame_ids]
+        scene_analyzer = getattr(self, 'scene_analyzer', None)
+        if not self.enable_scene_analysis or scene_analyzer is None:
+            return precomputed
+        
+        classifier = getattr(scene_analyzer, 'scene_classifier', None)
+        if classifier is not None and classifier.text_embeddings is not None:
+            missing = [i for i, result in enumerate(precomputed) if 'scene_classification' not in result]
+            if missing:
+                classifications = classifier.classify_scenes([frames[i] for i in missing])
+                for i, classification in zip(missing, classifications):
+                    precomputed[i]['scene_classification'] = classification
+        
+        if scene_analyzer.enable_vqa and scene_analyzer.vqa_model:
+            missing = [i for i, result in enumerate(precomputed) if 'vqa_results' not in result]
+            if missing:
+                blip_results = scene_analyzer.analyze_blip_batch([frames[i] for i in missing])
+                for i, blip_result in zip(missing, blip_results):
+                    precomputed[i].update(blip_result)
+        
+        return precomputed
+    
+    def _frame_cache_stage_keys(self, sampling_key, shard_count=1):
+        """단계별 캐시 키 (모델명@버전 + 출력에 영향을 주는 설정) - 값이 바뀌면 해당 단계만 다시 계산"""
+        def package_version(name):
+            try:
+                return importlib_metadata.version(name)
+            except Exception:
+                return 'unknown'
+        
+        def digest(value):
+            return hashlib.sha1(json.dumps(value, sort_keys=True, ensure_ascii=False).encode()).hexdigest()[:12]
+        
+        model_path = os.path.basename(self._init_kwargs.get('model_path', ''))
+        detection_key = (
+            f"{model_path}@ultralytics-{package_version('ultralytics')}"
+            f":conf={self.confidence_threshold}:color={self.enable_color_analysis}"
+        )
+        if self.enable_tracking:
+            # 트랙 ID는 샘플링된 프레임 순서에 따라 달라지므로 같은 샘플링의 재분석에서만 재사용.
+            # 샤드 분석은 병합 전 구간별 트랙 ID를 저장하므로 같은 샤드 구성에서만 재사용
+            # (구간 경계는 샘플링과 샤드 수로 정해짐 - 병합 시 같은 방식으로 다시 연결됨)
+            detection_key += f":track@{sampling_key}"
+            if shard_count > 1:
+                detection_key += f":shards={shard_count}"
+        
+        transformers_version = package_version('transformers')
+        scene_classifier = getattr(getattr(self, 'scene_analyzer', None), 'scene_classifier', None)
+        scene_templates = getattr(scene_classifier, 'scene_templates', {})
+        stage_keys = {
+            'detection': detection_key,
+            'scene': f"openai/clip-vit-base-patch16@transformers-{transformers_version}"
+                     f":{digest(scene_templates)}",
+            'blip': f"Salesforce/blip-vqa-base+blip-image-captioning-base@transformers-{transformers_version}"
+                    f":{digest(AdvancedSceneAnalyzer.VQA_QUESTIONS)}",
+            'ocr': f"easyocr@{package_version('easyocr')}:en,ko",
+            'llm': f"llama-3.1-8b-instant@{FrameLLMBatcher.PROMPT_VERSION}",
+        }
+        return stage_keys
+    
+    def _open_frame_cache(self, video_path, sampling_key, cache_root=None, shard_count=1):
+        """비디오 내용 해시 기반 프레임 캐시 (비활성화/실패 시 None)"""
+        if not self.enable_frame_cache:
+            return None
+        
+        try:
+            if cache_root is None:
+                from django.conf import settings
+                cache_root = self.frame_cache_dir or os.path.join(settings.MEDIA_ROOT, 'frame_cache')
+            
+            return FrameResultCache(
+                compute_video_hash(video_path), cache_root, self._frame_cache_stage_keys(sampling_key, shard_count)
+            )
+        except Exception as e:
+            log_once(f"⚠️ 프레임 캐시 사용 불가: {e}", "WARNING")
+            return None
+    
+    def _use_detection_cache(self, frame_cache, frame_ids):
+        """감지 캐시 조회 여부 - 트래킹 중에는 구간 전체가 캐시된 경우에만 (일부만 쓰면 트랙 ID가 어긋남)"""
+        if frame_cache is None:
+            return False
+        return not self.enable_tracking or frame_cache.has_all('detection', frame_ids)
+    
+    def _detect_objects_batch_cached(self, frame_ids, frames, frame_cache, use_detection_cache):
+        """캐시에 없는 프레임만 YOLO 배치 추론"""
+        detections = [
+            frame_cache.get('detection', frame_id) if use_detection_cache else None
+            for frame_id in frame_ids
+        ]
+        missing = [i for i, detected in enumerate(detections) if detected is None]
+        
+        if missing:
+            for i, detected_objects in zip(missing, self.detect_objects_batch([frames[i] for i in missing])):
+                detections[i] = detected_objects
+                if frame_cache is not None:
+                    frame_cache.put('detection', frame_ids[i], detected_objects)
+        
+        return detections
+    
+    def _cached_precomputed(self, frame_cache, frame_id, precomputed=None):
+        """프레임 캐시의 Scene 분류/BLIP/OCR 결과를 precomputed에 채움 (이미 있는 항목은 유지)"""
+        precomputed = dict(precomputed or {})
+        if frame_cache is None:
+            return precomputed
+        
+        if 'scene_classification' not in precomputed:
+            scene_classification = frame_cache.get('scene', frame_id)
+            if scene_classification is not None:
+                precomputed['scene_classification'] = scene_classification
+        
+        if 'vqa_results' not in precomputed:
+            blip_result = frame_cache.get('blip', frame_id)
+            if blip_result is not None:
+                precomputed.update(blip_result)
+        
+        if 'ocr_text' not in precomputed:
+            ocr_text = frame_cache.get('ocr', frame_id)
+            if ocr_text is not None:
+                precomputed['ocr_text'] = ocr_text
+        
+        return precomputed
+    
+    def _store_frame_cache(self, frame_cache, frame_id, scene_analysis):
+        """모델이 실제로 계산한 Scene 분석 단계 출력 저장 (폴백 결과는 저장하지 않음)"""
+        scene_analyzer = getattr(self, 'scene_analyzer', None)
+        if frame_cache is None or scene_analyzer is None or not scene_analysis:
+            return
+        
+        if scene_analyzer.scene_classifier.clip_model is not None and scene_analysis.get('scene_classification'):
+            frame_cache.put('scene', frame_id, scene_analysis['scene_classification'])
+        
+        if scene_analyzer.vqa_model is not None and 'blip_caption' in scene_analysis:
+            frame_cache.put('blip', frame_id, {
+                'vqa_results': scene_analysis.get('vqa_results', {}),
+                'blip_caption': scene_analysis['blip_caption']
+            })
+        
+        if scene_analyzer.ocr_reader is not None:
+            frame_cache.put('ocr', frame_id, scene_analysis.get('ocr_text', ''))
+    
+    def _store_llm_cache(self, frame_cache, frame_data, scene_analysis):
+        """LLM이 생성한 최종 캡션/GPT 특징 저장 (기본 응답으로 대체된 경우 제외)"""
+        if frame_cache is None:
+            return
+        
+        final_caption = frame_data.get('final_caption', '')
+        gpt_features = scene_analysis.get('gpt_features', {})
+        if (final_caption and final_caption != frame_data.get('enhanced_caption')
+                and str(gpt_features.get('extraction_method', '')).startswith('gpt_llm')):
+            frame_cache.put('llm', frame_data['image_id'], {
+                'caption': final_caption,
+                'gpt_features': gpt_features.get('gpt_features', {}),
+                'extraction_method': gpt_features['extraction_method']
+            })
+    
+    def _create_llm_batcher(self, frame_cache=None):
+        """LLM 배치 처리기 - 배치 크기가 1이거나 Scene 분석기가 없으면 None (프레임별 요청)"""
+        scene_analyzer = getattr(self, 'scene_analyzer', None)
+        if self.llm_batch_size <= 1 or not self.enable_scene_analysis or scene_analyzer is None:
+            return None
+        
+        on_frame_done = None
+        if frame_cache is not None:
+            on_frame_done = lambda frame_data, scene_analysis: self._store_llm_cache(
+                frame_cache, frame_data, scene_analysis
+            )
+        return FrameLLMBatcher(scene_analyzer, self.llm_batch_size, on_frame_done)
+    
+    def _analyze_frame_scene(self, frame, frame_id, timestamp, detected_objects, precomputed=None,
+                             llm_batcher=None, frame_cache=None):
+        """감지 결과를 받아 Scene 분석, 캡션 생성 후 프레임 데이터 구성
+        
+        llm_batcher가 주어지면 LLM 캡션/GPT 특징은 여러 프레임을 묶어 나중에 채웁니다.
+        frame_cache에 있는 단계 출력(Scene 분류, BLIP, OCR, LLM)은 다시 계산하지 않습니다.
+        """
+        precomputed = self._cached_precomputed(frame_cache, frame_id, precomputed)
+        cached_llm = frame_cache.get('llm', frame_id) if frame_cache is not None else None
+        defer_llm = llm_batcher is not None or cached_llm is not None
+        
+        # 2. Scene 분석
+        scene_analysis = {}
+        if self.enable_scene_analysis and hasattr(self, 'scene_analyzer') and self.scene_analyzer:
+            scene_analysis = self.scene_analyzer.comprehensive_scene_analysis(
+                frame, frame_id, timestamp, detected_objects, precomputed, defer_llm=defer_llm
+            )
+        
+        # 3. 향상된 캡션 생성
+        caption_result = {}
+        if self.enable_scene_analysis and hasattr(self, 'scene_analyzer') and self.scene_analyzer:
+            caption_result = self.scene_analyzer.generate_enhanced_caption(
+                frame, detected_objects, scene_analysis, frame_id, timestamp, defer_llm=defer_llm
+            )
+        else:
+            # 기본 캡션
+            basic_caption = f"프레임 {frame_id} ({timestamp:.1f}초)에서 {len(detected_objects)}개의 객체가 감지되었습니다."
+            if detected_objects:
+                object_list = [obj['class'] for obj in detected_objects[:3]]
+                basic_caption += f" 주요 객체: {', '.join(object_list)}"
+            
+            caption_result = {
+                'blip_caption': "",
+                'enhanced_caption': basic_caption,
+                'final_caption': basic_caption,
+                'caption_length': len(basic_caption),
+                'has_multiple_sources': False
+            }
+        
+        # 4. 프레임 데이터 구성
+        frame_data = {
+            "image_id": frame_id,
+            "timestamp": timestamp,
+            "objects": detected_objects,
+            "scene_analysis": scene_analysis,
+            "caption": caption_result.get('final_caption', ''),
+            "blip_caption": caption_result.get('blip_caption', ''),
+            "enhanced_caption": caption_result.get('enhanced_caption', ''),
+            "final_caption": caption_result.get('final_caption', ''),
+            "caption_sources": caption_result,
+            "comprehensive_features": {
+                "object_count": len(detected_objects),
+                "object_types": list(set(obj['class'] for obj in detected_objects)),
+                "scene_complexity": len(scene_analysis.get('scene_graph', {}).get('relationships', [])),
+                "has_text": bool(scene_analysis.get('ocr_text', '')),
+                "has_caption": bool(caption_result.get('final_caption', '')),
+                "caption_length": caption_result.get('caption_length', 0),
+                "caption_quality": "enhanced" if caption_result.get('has_multiple_sources', False) else "basic",
+                "analysis_success": True
+            }
+        }
+        
+        self._store_frame_cache(frame_cache, frame_id, scene_analysis)
+        
+        if scene_analysis and cached_llm is not None:
+            FrameLLMBatcher.apply_caption(frame_data, cached_llm.get('caption', ''))
+            scene_analysis['gpt_features'] = self.scene_analyzer.gpt_extractor.build_feature_result(
+                cached_llm.get('gpt_features', {}), cached_llm.get('extraction_method', 'gpt_llm')
+            )
+        elif llm_batcher is not None and scene_analysis:
+            llm_batcher.add(frame_data, detected_objects, scene_analysis)
+        elif scene_analysis:
+            self._store_llm_cache(frame_cache, frame_data, scene_analysis)
+        
+        return frame_data
+    
     # video_analyzer.py - EnhancedVideoAnalyzer 클래스에 추가할 메서드
 
     def _summarize_video_analysis(self, frame_results, video):
@@ -2027,6 +3216,94 @@ class EnhancedVideoAnalyzer:
         
         return None
     
+def _bbox_iou(box1, box2):
+    """정규화된 [x1, y1, x2, y2] 박스 간 IoU"""
+    if len(box1) != 4 or len(box2) != 4:
+        return 0.0
+    
+    ix1, iy1 = max(box1[0], box2[0]), max(box1[1], box2[1])
+    ix2, iy2 = min(box1[2], box2[2]), min(box1[3], box2[3])
+    inter = max(0.0, ix2 - ix1) * max(0.0, iy2 - iy1)
+    
+    area1 = max(0.0, box1[2] - box1[0]) * max(0.0, box1[3] - box1[1])
+    area2 = max(0.0, box2[2] - box2[0]) * max(0.0, box2[3] - box2[1])
+    union = area1 + area2 - inter
+    
+    return inter / union if union > 0 else 0.0
+
+def _remap_frame_track_ids(frame_dict, mapping):
+    """프레임 데이터의 객체/Scene Graph track_id를 mapping에 따라 변경"""
+    for obj in frame_dict.get('objects', []):
+        if obj.get('track_id') in mapping:
+            obj['track_id'] = mapping[obj['track_id']]
+    
+    scene_graph = frame_dict.get('scene_analysis', {}).get('scene_graph')
+    if not scene_graph:
+        return
+    
+    for relation in scene_graph.get('relationships', []):
+        for key in ('subject_id', 'object_id'):
+            if relation.get(key) in mapping:
+                relation[key] = mapping[relation[key]]
+    
+    def remap_node_id(node_id):
+        class_name, _, track_id = node_id.rpartition('_')
+        try:
+            track_id = int(track_id)
+        except ValueError:
+            return node_id
+        return f"{class_name}_{mapping.get(track_id, track_id)}"
+    
+    nodes = {}
+    for node_id, data in scene_graph.get('nodes', {}).items():
+        if isinstance(data, dict) and data.get('track_id') in mapping:
+            data = dict(data, track_id=mapping[data['track_id']])
+        nodes[remap_node_id(node_id)] = data
+    scene_graph['nodes'] = nodes
+    
+    for edge in scene_graph.get('edges', []):
+        edge['source'] = remap_node_id(edge['source'])
+        edge['target'] = remap_node_id(edge['target'])
+
+# 샤드 워커 프로세스 전용 분석기 (워커당 1개)
+_shard_worker_analyzer = None
+
+def _init_shard_worker(analyzer_kwargs, torch_threads):
+    """샤드 워커 프로세스 초기화 - 자체 모델 인스턴스 생성"""
+    global _shard_worker_analyzer
+    torch.set_num_threads(torch_threads)
+    _shard_worker_analyzer = EnhancedVideoAnalyzer(**dict(analyzer_kwargs, enable_sharded_analysis=False))
+
+def _analyze_video_shard(video_path, shard_index, start_frame, end_frame, sample_interval, cache_root=None,
+                         frame_ids=None, sampling_key=None, shard_count=1):
+    """워커 프로세스에서 [start_frame, end_frame] 구간의 샘플 프레임 분석
+    
+    → (프레임 결과, 새로 계산한 프레임 캐시 항목) - 캐시 파일 기록은 부모 프로세스가 담당
+    """
+    analyzer = _shard_worker_analyzer
+    analyzer._reset_sequence_state()
+    
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise Exception(f"샤드 {shard_index}: 비디오 파일을 열 수 없습니다")
+    
+    frame_cache = None
+    if cache_root is not None:
+        frame_cache = analyzer._open_frame_cache(
+            video_path, sampling_key or str(sample_interval), cache_root, shard_count
+        )
+    
+    try:
+        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        frame_results = analyzer._run_pipelined_frame_analysis(
+            cap, total_frames, fps, sample_interval, None, start_frame, end_frame, frame_cache=frame_cache,
+            frame_ids=frame_ids
+        )
+        return frame_results, frame_cache.pop_updates() if frame_cache is not None else {}
+    finally:
+        cap.release()
+
 # video_analyzer.py 파일 맨 마지막 부분에 추가/수정
 
 # 전역 VideoAnalyzer 인스턴스 (싱글톤 패턴)
@@ -2096,7 +3373,8 @@ def _create_dummy_analyzer():
             """더미 객체 감지"""
             return []
         
-        def analyze_video_comprehensive(self, video, analysis_type='basic', progress_callback=None):
+        def analyze_video_comprehensive(self, video, analysis_type='basic', progress_callback=None,
+                                        frame_callback=None):
             """더미 비디오 분석"""
             if progress_callback:
                 progress_callback(50, "더미 분석 진행 중")
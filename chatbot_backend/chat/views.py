@@ -965,12 +965,15 @@ from django.conf import settings
 from bs4 import BeautifulSoup
 import re
 import time
+import queue
 import asyncio
+import functools
 from asgiref.sync import sync_to_async
 
 # 새로 추가된 import
 from .langchain_config import LangChainManager
-from .langgraph_workflow import AIComparisonWorkflow
+from .langgraph_workflow import AIComparisonWorkflow, collect_concurrently
+from . import model_registry
 
 logger = logging.getLogger(__name__)
 
@@ -985,31 +988,48 @@ def convert_to_serializable(obj):
     else:
         return obj
 
+def stream_async_events(producer):
+    """async producer(emit)를 공유 이벤트 루프에서 실행하고, emit된 이벤트를 도착 즉시 NDJSON 줄로 반환
+    
+    StreamingHttpResponse는 동기 제너레이터를 소비하므로 스레드 안전 큐로 이벤트를 전달합니다.
+    클라이언트 연결이 끊겨 제너레이터가 닫히면 producer도 취소됩니다.
+    """
+    events = queue.Queue()
+    done = object()
+    
+    async def run():
+        try:
+            await producer(events.put)
+        finally:
+            events.put(done)
+    
+    future = asyncio.run_coroutine_threadsafe(run(), model_registry.get_event_loop())
+    try:
+        while True:
+            event = events.get()
+            if event is done:
+                break
+            yield json.dumps(event) + '\n'
+    finally:
+        future.cancel()
+
 class ChatView(APIView):
     permission_classes = [AllowAny]
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         
-        # 기존 유사도 분석기
-        from .similarity_analyzer import SimilarityAnalyzer  # 실제 import 경로로 변경 필요
-        self.similarity_analyzer = SimilarityAnalyzer(threshold=0.85)
-        
-        # LangChain 관리자 초기화
-        self.langchain_manager = LangChainManager(
-            openai_key=OPENAI_API_KEY,
-            anthropic_key=ANTHROPIC_API_KEY,
-            groq_key=GROQ_API_KEY
-        )
-        
-        # LangGraph 워크플로우 초기화
-        self.workflow = AIComparisonWorkflow(
-            langchain_manager=self.langchain_manager,
-            similarity_analyzer=self.similarity_analyzer
-        )
+        # 유사도 분석기, LangChain 관리자, LangGraph 워크플로우는 프로세스 단위로 공유
+        self.similarity_analyzer = model_registry.get_similarity_analyzer()
+        self.langchain_manager = model_registry.get_langchain_manager()
+        self.workflow = model_registry.get_ai_workflow()
         
-        # 기존 ChatBot 인스턴스들도 LangChain 사용하도록 업데이트
+        # 기존 ChatBot 인스턴스들도 LangChain 사용하도록 업데이트 (프로세스당 1회)
+        model_registry.get_component('chatbots_langchain', self._bind_chatbots_once)
+    
+    def _bind_chatbots_once(self):
         self.update_chatbots_with_langchain()
+        return True
 
     def update_chatbots_with_langchain(self):
         """기존 ChatBot들을 LangChain을 사용하도록 업데이트"""
@@ -1075,51 +1095,41 @@ class ChatView(APIView):
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
     def handle_with_workflow(self, user_message, selected_models, user_language, preferred_model):
-        """LangGraph 워크플로우를 사용한 처리"""
-        def stream_workflow_responses():
+        """LangGraph 워크플로우를 사용한 처리 - 모델 응답은 완료되는 즉시 스트리밍"""
+        async def produce_workflow_events(emit):
             try:
-                request_id = str(time.time())
-                
-                # 워크플로우 실행을 위한 async 래퍼
-                async def run_workflow_async():
-                    return await self.workflow.run_workflow(
-                        user_message=user_message,
-                        selected_models=selected_models,
-                        user_language=user_language,
-                        request_id=request_id
-                    )
-                
-                # asyncio 이벤트 루프에서 실행
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                request_id = str(uuid.uuid4())
                 
-                try:
-                    workflow_result = loop.run_until_complete(run_workflow_async())
-                finally:
-                    loop.close()
-                
-                # 개별 응답 스트리밍
-                for bot_id, response in workflow_result["individual_responses"].items():
-                    yield json.dumps({
+                def on_model_response(bot_id, response, elapsed):
+                    emit({
                         'type': 'bot_response',
                         'botId': bot_id,
                         'response': response,
-                        'requestId': request_id
-                    }) + '\n'
+                        'requestId': request_id,
+                        'elapsed': round(elapsed, 3)
+                    })
+                
+                workflow_result = await self.workflow.run_workflow(
+                    user_message=user_message,
+                    selected_models=selected_models,
+                    user_language=user_language,
+                    request_id=request_id,
+                    on_model_response=on_model_response
+                )
                 
                 # 유사도 분석 결과
                 if workflow_result["similarity_analysis"]:
-                    yield json.dumps({
+                    emit({
                         'type': 'similarity_analysis',
                         'result': workflow_result["similarity_analysis"],
                         'requestId': request_id,
                         'timestamp': time.time(),
                         'userMessage': user_message
-                    }) + '\n'
+                    })
                 
                 # 최종 분석 결과
                 final_analysis = workflow_result["final_analysis"]
-                yield json.dumps({
+                emit({
                     'type': 'analysis',
                     'preferredModel': final_analysis.get('preferredModel', preferred_model.upper()),
                     'best_response': final_analysis.get('best_response', ''),
@@ -1130,86 +1140,75 @@ class ChatView(APIView):
                     'timestamp': time.time(),
                     'userMessage': user_message,
                     'workflowUsed': True,
-                    'errors': workflow_result.get("errors", [])
-                }) + '\n'
+                    'errors': workflow_result.get("errors", []),
+                    'modelTimings': workflow_result.get("model_timings", {})
+                })
                 
             except Exception as e:
                 logger.error(f"워크플로우 스트리밍 에러: {e}")
-                yield json.dumps({
+                emit({
                     'type': 'error',
                     'error': f"Workflow error: {e}",
                     'fallbackToLegacy': True
-                }) + '\n'
+                })
 
-        return StreamingHttpResponse(stream_workflow_responses(), content_type='text/event-stream')
+        return StreamingHttpResponse(stream_async_events(produce_workflow_events), content_type='text/event-stream')
 
     def handle_with_legacy(self, user_message, selected_models, user_language, preferred_model):
-        """기존 방식으로 처리 (호환성 유지)"""
-        def stream_responses():
+        """기존 방식으로 처리 (호환성 유지) - 모델 응답은 완료되는 즉시 스트리밍"""
+        async def produce_legacy_events(emit):
             try:
                 system_message = {
                     'role': 'system',
                     'content': f"사용자가 선택한 언어는 '{user_language}'입니다. 반드시 이 언어({user_language})로 응답하세요."
                 }
-                responses = {}
                 request_id = str(time.time())
+                loop = asyncio.get_running_loop()
                 
                 # 각 모델별 챗봇 인스턴스 가져오기
                 selected_chatbots = {m: chatbots.get(m) for m in selected_models if chatbots.get(m)}
 
-                # 모델 응답 수집 (비동기 처리 시도)
-                async def collect_responses_async():
-                    responses = {}
-                    tasks = []
-                    
-                    for bot_id, bot in selected_chatbots.items():
-                        if hasattr(bot, 'chat_async') and bot.use_langchain:
-                            # LangChain 비동기 사용
-                            task = bot.chat_async(user_message, user_language=user_language)
-                        else:
-                            # 기존 동기 방식을 비동기로 래핑
-                            task = sync_to_async(self.sync_chat)(bot, user_message, system_message)
-                        tasks.append((bot_id, task))
-                    
-                    for bot_id, task in tasks:
-                        try:
-                            response = await task
-                            responses[bot_id] = response
-                            logger.info(f"✅ {bot_id} 응답 완료")
-                        except Exception as e:
-                            logger.error(f"❌ {bot_id} 응답 실패: {e}")
-                    
-                    return responses
-
-                # 비동기 응답 수집
-                loop = asyncio.new_event_loop()
-                asyncio.set_event_loop(loop)
+                # 모델 응답 동시 수집 (모델별 타임아웃, 최소 응답 수 충족 시 부분 결과로 진행)
+                calls = {}
+                for bot_id, bot in selected_chatbots.items():
+                    if hasattr(bot, 'chat_async') and bot.use_langchain:
+                        # LangChain 비동기 사용
+                        calls[bot_id] = bot.chat_async(user_message, user_language=user_language)
+                    else:
+                        # 기존 동기 방식을 비동기로 래핑 (모델별 스레드에서 동시 실행)
+                        calls[bot_id] = sync_to_async(self.sync_chat, thread_sensitive=False)(
+                            bot, user_message, system_message
+                        )
                 
-                try:
-                    responses = loop.run_until_complete(collect_responses_async())
-                finally:
-                    loop.close()
-
-                # 개별 응답 스트리밍
-                for bot_id, resp_text in responses.items():
-                    yield json.dumps({
+                def on_model_response(bot_id, response, elapsed):
+                    emit({
                         'type': 'bot_response',
                         'botId': bot_id,
-                        'response': resp_text,
-                        'requestId': request_id
-                    }) + '\n'
+                        'response': response,
+                        'requestId': request_id,
+                        'elapsed': round(elapsed, 3)
+                    })
+                
+                responses, model_timings, collect_errors = await collect_concurrently(
+                    calls, on_response=on_model_response
+                )
+                
+                for bot_id, timing in model_timings.items():
+                    logger.info(f"⏱️ {bot_id}: {timing['status']} ({timing['elapsed']:.2f}초)")
+                for error in collect_errors:
+                    logger.error(f"❌ {error}")
 
-                # 유사도 분석
+                # 유사도 분석 (CPU 작업 - 공유 이벤트 루프를 막지 않도록 스레드에서 실행)
                 if len(responses) >= 2:
-                    sim_res = self.similarity_analyzer.cluster_responses(responses)
+                    sim_res = await loop.run_in_executor(None, self.similarity_analyzer.cluster_responses, responses)
                     serial = convert_to_serializable(sim_res)
-                    yield json.dumps({
+                    emit({
                         'type': 'similarity_analysis',
                         'result': serial,
                         'requestId': request_id,
                         'timestamp': time.time(),
                         'userMessage': user_message
-                    }) + '\n'
+                    })
 
                 # 최종 비교 및 분석
                 analyzer_bot = chatbots.get(preferred_model) or chatbots.get('gpt')
@@ -1217,25 +1216,17 @@ class ChatView(APIView):
                 
                 # LangChain 비동기 분석 시도
                 if hasattr(analyzer_bot, 'analyze_responses_async') and analyzer_bot.use_langchain:
-                    async def analyze_async():
-                        return await analyzer_bot.analyze_responses_async(
-                            responses, user_message, user_language, list(responses.keys())
-                        )
-                    
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    
-                    try:
-                        analysis = loop.run_until_complete(analyze_async())
-                    finally:
-                        loop.close()
+                    analysis = await analyzer_bot.analyze_responses_async(
+                        responses, user_message, user_language, list(responses.keys())
+                    )
                 else:
                     # 기존 동기 방식
-                    analysis = analyzer_bot.analyze_responses(
+                    analysis = await loop.run_in_executor(None, functools.partial(
+                        analyzer_bot.analyze_responses,
                         responses, user_message, user_language, list(responses.keys())
-                    )
+                    ))
                 
-                yield json.dumps({
+                emit({
                     'type': 'analysis',
                     'preferredModel': analyzer_bot.api_type.upper(),
                     'best_response': analysis.get('best_response', ''),
@@ -1245,16 +1236,17 @@ class ChatView(APIView):
                     'requestId': request_id,
                     'timestamp': time.time(),
                     'userMessage': user_message,
-                    'workflowUsed': False
-                }) + '\n'
+                    'workflowUsed': False,
+                    'modelTimings': model_timings
+                })
                 
             except Exception as e:
-                yield json.dumps({
+                emit({
                     'type': 'error',
                     'error': f"Stream error: {e}"
-                }) + '\n'
+                })
 
-        return StreamingHttpResponse(stream_responses(), content_type='text/event-stream')
+        return StreamingHttpResponse(stream_async_events(produce_legacy_events), content_type='text/event-stream')
 
     def sync_chat(self, bot, user_message, system_message):
         """동기 채팅을 위한 헬퍼 메서드"""
@@ -2558,8 +2550,9 @@ import re
 logger = logging.getLogger(__name__)
 
 # OllamaClient와 GPTTranslator 클래스 가져오기
-from .ollama_client import OllamaClient
+from .ollama_client import get_ollama_client
 from .gpt_translator import GPTTranslator 
+from .pdf_ocr import iter_pdf_ocr_pages, is_usable_text_layer
 
 @method_decorator(csrf_exempt, name='dispatch')
 class ProcessFileView(APIView):
@@ -2578,9 +2571,9 @@ class ProcessFileView(APIView):
             file_name = file_obj.name.lower()
             logger.info("파일 업로드: %s, 크기: %s bytes", file_name, file_obj.size)
             
-            # Ollama 클라이언트 초기화
+            # Ollama 클라이언트 (프로세스 전역 - 연결 풀/모델 목록 캐시 공유)
             ollama_base_url = os.environ.get('OLLAMA_API_URL', 'http://localhost:11434')
-            ollama_client = OllamaClient(base_url=ollama_base_url)
+            ollama_client = get_ollama_client(ollama_base_url)
             
             # GPT 번역기 초기화
             gpt_translator = GPTTranslator()
@@ -2648,23 +2641,20 @@ class ProcessFileView(APIView):
                         else:
                             page_texts = all_page_texts
                         
-                        combined_text = "\n".join([page["text"] for page in page_texts])
-                        
-                        # 추출된 텍스트 길이가 충분한지 확인 (더 엄격한 조건)
-                        if combined_text.strip() and len(combined_text.strip()) >= 50:
-                            meaningful_chars = sum(1 for c in combined_text if c.isalnum())
-                            if meaningful_chars > 30:  # 의미있는 글자가 30자 이상이면 성공으로 간주
-                                ocr_text = combined_text
-                                direct_extract_success = True
-                                logger.info("PDF 직접 텍스트 추출 성공, 총 %s 페이지, 텍스트 길이: %s", 
-                                          len(page_texts), len(ocr_text))
-                                logger.info("추출된 텍스트 샘플: %s", ocr_text[:200] if ocr_text else "텍스트 없음")
+                        # 페이지별 판단 - 텍스트 레이어가 쓸 만한 페이지는 그대로 두고 이미지뿐이거나 깨진 페이지만 OCR
+                        if page_texts:
+                            page_texts = self.ocr_unusable_pages(ocr_result.file.path, page_texts)
+                            ocr_text = "\n".join([page["text"] for page in page_texts])
+                            direct_extract_success = True
+                            logger.info("PDF 텍스트 추출 완료, 총 %s 페이지, 텍스트 길이: %s", 
+                                      len(page_texts), len(ocr_text))
+                            logger.info("추출된 텍스트 샘플: %s", ocr_text[:200] if ocr_text else "텍스트 없음")
                     except Exception as e:
                         logger.error(f"PDF 직접 텍스트 추출 실패: {str(e)}")
                     
-                    # 직접 텍스트 추출이 실패한 경우, OCR 시도
+                    # 직접 텍스트 추출 자체가 실패한 경우(PDF 파싱 오류 등), 전체 OCR 시도
                     if not direct_extract_success:
-                        logger.info("PDF OCR 처리 시작 (직접 추출 실패 또는 텍스트 불충분)")
+                        logger.info("PDF OCR 처리 시작 (직접 추출 실패)")
                         
                         # 페이지 범위 설정으로 OCR
                         all_page_texts = self.ocr_pdf_by_pages(ocr_result.file.path, ollama_client, start_page, end_page)
@@ -2933,8 +2923,48 @@ OCR 텍스트 (참고용, 실제 이미지에 보이는 경우만 언급): {ocr_
             logger.error(f"PDF 텍스트 직접 추출 오류: {str(e)}")
             raise
     
-    def ocr_pdf_by_pages(self, pdf_path, ollama_client, start_page=1, end_page=0):
-        """PDF를 OCR로 처리하여 페이지별 텍스트 추출"""
+    def ocr_unusable_pages(self, pdf_path, page_texts):
+        """직접 추출한 페이지 중 텍스트 레이어가 없거나 깨진 페이지만 OCR 하여 교체
+        
+        디지털 PDF에 스캔 페이지가 일부 섞인 경우 전체를 래스터화하지 않고 해당 페이지만 처리합니다.
+        OCR 결과가 비어 있으면(제한 시간 초과 등) 추출 텍스트를 그대로 둡니다.
+        """
+        ocr_pages = [page["page"] for page in page_texts if not is_usable_text_layer(page["text"])]
+        if not ocr_pages:
+            return page_texts
+        
+        logger.info("텍스트 레이어 사용 %s 페이지, OCR 대상 %s 페이지: %s", 
+                  len(page_texts) - len(ocr_pages), len(ocr_pages), ocr_pages)
+        
+        ocr_texts = {}
+        try:
+            for page in iter_pdf_ocr_pages(pdf_path, page_numbers=ocr_pages, dpi=300, lang='kor+eng'):
+                if page["text"].strip():
+                    ocr_texts[page["page"]] = page["text"]
+        except Exception as e:
+            logger.error(f"PDF 페이지 OCR 처리 오류: {str(e)}")
+        
+        return [
+            {"page": page["page"], "text": ocr_texts.get(page["page"], page["text"])}
+            for page in page_texts
+        ]
+    
+    def ocr_pdf_by_pages(self, pdf_path, ollama_client, start_page=1, end_page=0, stream=True):
+        """PDF를 OCR로 처리하여 페이지별 텍스트 추출
+        
+        stream=True: 페이지를 하나씩 래스터화하여 워커 프로세스에서 병렬 OCR (메모리 상한/페이지 제한 시간 적용)
+        stream=False: 범위 전체를 한 번에 이미지로 변환하여 현재 프로세스에서 순차 OCR
+        """
+        if stream:
+            try:
+                pages = []
+                for page in iter_pdf_ocr_pages(pdf_path, start_page, end_page, dpi=300, lang='kor+eng'):
+                    pages.append({"page": page["page"], "text": page["text"]})
+                    logger.info("PDF OCR 페이지 완료: %s (텍스트 길이: %s)", page["page"], len(page["text"]))
+                return pages
+            except Exception as e:
+                logger.error(f"PDF 스트리밍 OCR 처리 오류, 일괄 처리로 재시도: {str(e)}")
+        
         pages = []
         
         try:
@@ -5380,6 +5410,15 @@ except ImportError as e:
 
 # Django 모델 import
 from .models import Video, VideoAnalysis, Scene, Frame
+from .performance_optimization import BulkModelWriter
+from .search_index import (
+    index_video_frames, clear_video_index, search_objects, search_frame_texts, get_video_object_postings,
+    cached_video_analysis
+)
+from .rollups import build_video_rollups, clear_video_rollups, summarize_range, bucket_series
+from .analysis_store import save_analysis_results, load_analysis_results
+from .analysis_cache import get_analysis_cache
+from types import SimpleNamespace
 
 @method_decorator(csrf_exempt, name='dispatch')
 class EnhancedAnalyzeVideoView(APIView):
@@ -5481,9 +5520,9 @@ class EnhancedAnalyzeVideoView(APIView):
             analysis_results_dir = os.path.join(settings.MEDIA_ROOT, 'analysis_results')
             os.makedirs(analysis_results_dir, exist_ok=True)
             
-            # 3. JSON 파일명 생성
+            # 3. 결과 파일명 생성 (컬럼형 .npz - chat/analysis_store.py)
             timestamp = int(time.time())
-            json_filename = f"real_analysis_{video.id}_{analysis_type}_{timestamp}.json"
+            json_filename = f"real_analysis_{video.id}_{analysis_type}_{timestamp}.npz"
             json_filepath = os.path.join(analysis_results_dir, json_filename)
             
             print(f"📁 분석 결과 저장 경로: {json_filepath}")
@@ -5523,13 +5562,12 @@ class EnhancedAnalyzeVideoView(APIView):
                 'ai_features_used': analysis_results.get('analysis_config', {}).get('features_enabled', {})
             }
             
-            # 7. JSON 파일 저장
+            # 7. 분석 결과 파일 저장 (숫자 배열은 타입 있는 버퍼, 나머지는 프레임 키별 JSON 컬럼)
             try:
-                with open(json_filepath, 'w', encoding='utf-8') as f:
-                    json.dump(analysis_results, f, ensure_ascii=False, indent=2, default=str)
-                print(f"✅ 분석 결과 JSON 저장 완료: {json_filepath}")
+                save_analysis_results(analysis_results, json_filepath)
+                print(f"✅ 분석 결과 파일 저장 완료: {json_filepath}")
             except Exception as json_error:
-                print(f"⚠️ JSON 저장 실패: {json_error}")
+                print(f"⚠️ 분석 결과 파일 저장 실패: {json_error}")
                 # JSON 저장 실패해도 DB는 저장하도록 계속 진행
             
             # 8. Django 모델에 분석 결과 저장
@@ -5596,47 +5634,106 @@ class EnhancedAnalyzeVideoView(APIView):
                 }
             )
             
-            # Scene 객체들 생성 (하이라이트 프레임 기반)
+            # Scene 객체들 생성 (적응형 샘플링의 실제 샷 경계, 없으면 하이라이트 프레임 기반)
             highlight_frames = video_summary.get('highlight_frames', [])
-            scene_duration = video.duration / max(len(highlight_frames), 1) if video.duration > 0 else 1
+            shots = analysis_results.get('shots', [])
             
-            for i, highlight in enumerate(highlight_frames[:10]):  # 최대 10개 씬
-                Scene.objects.create(
-                    video=video,
-                    scene_id=i + 1,
-                    start_time=max(0, highlight.get('timestamp', 0) - scene_duration/2),
-                    end_time=min(video.duration, highlight.get('timestamp', 0) + scene_duration/2),
-                    duration=scene_duration,
-                    frame_count=60,  # 2초 분량 가정
-                    dominant_objects=video_summary.get('dominant_objects', [])[:5],
-                    enhanced_captions_count=1 if highlight.get('object_count', 0) > 0 else 0
-                )
+            if shots:
+                # 재분석 시 이전 씬(하이라이트 기반 포함)을 실제 샷 경계로 교체
+                Scene.objects.filter(video=video).delete()
+                scene_writer = BulkModelWriter()
+                for shot in shots:
+                    scene_writer.add(self._build_scene_from_shot(video, shot, frame_results))
+                scene_writer.flush()
+            else:
+                scene_duration = video.duration / max(len(highlight_frames), 1) if video.duration > 0 else 1
+                
+                for i, highlight in enumerate(highlight_frames[:10]):  # 최대 10개 씬
+                    Scene.objects.create(
+                        video=video,
+                        scene_id=i + 1,
+                        start_time=max(0, highlight.get('timestamp', 0) - scene_duration/2),
+                        end_time=min(video.duration, highlight.get('timestamp', 0) + scene_duration/2),
+                        duration=scene_duration,
+                        frame_count=60,  # 2초 분량 가정
+                        dominant_objects=video_summary.get('dominant_objects', [])[:5],
+                        enhanced_captions_count=1 if highlight.get('object_count', 0) > 0 else 0
+                    )
             
-            # Frame 객체들 생성 (주요 프레임들만)
+            # Frame 객체들 생성 (주요 프레임들만, 일괄 저장)
             important_frames = [f for f in frame_results if f.get('final_caption') or len(f.get('objects', [])) > 0]
+            frame_writer = BulkModelWriter()
             for frame_data in important_frames[:50]:  # 최대 50개 프레임
-                try:
-                    Frame.objects.create(
-                        video=video,
-                        image_id=frame_data.get('image_id', 0),
-                        timestamp=frame_data.get('timestamp', 0),
-                        caption=frame_data.get('caption', ''),
-                        enhanced_caption=frame_data.get('enhanced_caption', ''),
-                        final_caption=frame_data.get('final_caption', ''),
-                        detected_objects=frame_data.get('objects', []),
-                        comprehensive_features=frame_data.get('comprehensive_features', {})
-                    )
-                except Exception as frame_error:
-                    print(f"⚠️ 프레임 {frame_data.get('image_id', 'unknown')} 저장 실패: {frame_error}")
-                    continue
+                frame_writer.add(Frame(
+                    video=video,
+                    image_id=frame_data.get('image_id', 0),
+                    timestamp=frame_data.get('timestamp', 0),
+                    caption=frame_data.get('caption', ''),
+                    enhanced_caption=frame_data.get('enhanced_caption', ''),
+                    final_caption=frame_data.get('final_caption', ''),
+                    detected_objects=frame_data.get('objects', []),
+                    comprehensive_features=frame_data.get('comprehensive_features', {})
+                ))
+            
+            write_stats = frame_writer.flush()
+            
+            # 검색용 역색인 - 저장한 50개가 아니라 샘플링된 모든 프레임 기준
+            try:
+                index_video_frames(video, frame_results)
+            except Exception as index_error:
+                print(f"⚠️ 검색 색인 생성 실패: {index_error}")
             
-            print(f"✅ DB 저장 완료: {len(important_frames)}개 프레임, {len(highlight_frames)}개 씬")
+            # 시간대별 통계용 구간 집계 (5초/30초/5분)
+            try:
+                build_video_rollups(video, frame_results)
+            except Exception as rollup_error:
+                print(f"⚠️ 시간 구간 집계 생성 실패: {rollup_error}")
+            
+            scene_count = len(shots) if shots else min(len(highlight_frames), 10)
+            print(f"✅ DB 저장 완료: {len(important_frames)}개 프레임, {scene_count}개 씬 "
+                  f"({write_stats['rows_per_second']}행/초)")
             
         except Exception as e:
             print(f"❌ DB 저장 실패: {e}")
             import traceback
             print(f"🔍 DB 저장 오류 상세:\n{traceback.format_exc()}")
     
+    def _build_scene_from_shot(self, video, shot, frame_results):
+        """샷 경계 + 샷 안에서 분석된 프레임 결과로 Scene 객체 구성 (저장은 호출 측)"""
+        shot_frames = [
+            f for f in frame_results
+            if shot['start_frame'] <= f.get('image_id', 0) <= shot['end_frame']
+        ]
+        
+        object_counter = Counter(
+            obj.get('class') for f in shot_frames for obj in f.get('objects', []) if obj.get('class')
+        )
+        location_counter = Counter(
+            f.get('scene_analysis', {}).get('scene_classification', {}).get('location', {}).get('label')
+            for f in shot_frames
+        )
+        location_counter.pop(None, None)
+        
+        return Scene(
+            video=video,
+            scene_id=shot['shot_id'],
+            start_time=shot['start_time'],
+            end_time=shot['end_time'],
+            duration=shot['end_time'] - shot['start_time'],
+            frame_count=shot['frame_count'],
+            dominant_objects=[name for name, _ in object_counter.most_common(5)],
+            enhanced_captions_count=len([f for f in shot_frames if f.get('enhanced_caption')]),
+            scene_type=location_counter.most_common(1)[0][0] if location_counter else '',
+            complexity_score=(
+                sum(len(f.get('objects', [])) for f in shot_frames) / len(shot_frames) if shot_frames else 0.0
+            ),
+            advanced_features={
+                'boundary_score': shot.get('boundary_score', 0.0),
+                'mean_motion': shot.get('mean_motion', 0.0),
+                'sampled_frame_ids': shot.get('sampled_frame_ids', [])
+            }
+        )
+    
     def _register_to_rag_system(self, video_id, json_filepath):
         """RAG 시스템에 분석 결과 등록"""
         try:
@@ -5710,7 +5807,7 @@ class VideoQAAnalyticsView(APIView):
     
     def __init__(self):
         super().__init__()
-        self.rag_system = get_video_rag_system()
+        self.rag_system = model_registry.get_rag_system()
         self.enhanced_qa = EnhancedVideoQASystem(self.rag_system, LLMClient())
     
     def get(self, request, video_id=None):
@@ -7317,6 +7414,19 @@ class AnalysisExportView(APIView):
 
 
 # 검색 관련 뷰들
+def _parse_search_pagination(request, default_page_size=50, max_page_size=200):
+    """?page=&page_size= → (page, page_size) - 1페이지부터"""
+    try:
+        page = max(1, int(request.GET.get('page', 1)))
+    except (TypeError, ValueError):
+        page = 1
+    try:
+        page_size = min(max_page_size, max(1, int(request.GET.get('page_size', default_page_size))))
+    except (TypeError, ValueError):
+        page_size = default_page_size
+    return page, page_size
+
+
 class ObjectSearchView(APIView):
     """객체별 검색"""
     permission_classes = [AllowAny]
@@ -7331,33 +7441,20 @@ class ObjectSearchView(APIView):
                     'error': '검색할 객체 타입을 입력해주세요.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # 특정 비디오 또는 전체 비디오에서 검색
-            if video_id:
-                videos = Video.objects.filter(id=video_id, is_analyzed=True)
-            else:
-                videos = Video.objects.filter(is_analyzed=True)
-            
-            results = []
-            for video in videos:
-                frames = Frame.objects.filter(video=video)
-                
-                for frame in frames:
-                    for obj in frame.detected_objects:
-                        if object_type.lower() in obj.get('class', '').lower():
-                            results.append({
-                                'video_id': video.id,
-                                'video_name': video.original_name,
-                                'frame_id': frame.image_id,
-                                'timestamp': frame.timestamp,
-                                'object_class': obj.get('class'),
-                                'confidence': obj.get('confidence'),
-                                'caption': frame.final_caption or frame.caption
-                            })
+            # 분석 시 만든 객체 역색인에서 조회 (페이지 단위)
+            page, page_size = _parse_search_pagination(request)
+            results, total_matches = search_objects(
+                object_type, video_id=video_id, color=request.GET.get('color'),
+                offset=(page - 1) * page_size, limit=page_size
+            )
             
             return Response({
                 'search_query': object_type,
-                'results': results[:50],  # 최대 50개 결과
-                'total_matches': len(results)
+                'results': results,
+                'total_matches': total_matches,
+                'page': page,
+                'page_size': page_size,
+                'has_next': page * page_size < total_matches
             })
             
         except Exception as e:
@@ -7380,33 +7477,23 @@ class TextSearchView(APIView):
                     'error': '검색할 텍스트를 입력해주세요.'
                 }, status=status.HTTP_400_BAD_REQUEST)
             
-            # 특정 비디오 또는 전체 비디오에서 검색
-            if video_id:
-                videos = Video.objects.filter(id=video_id, is_analyzed=True)
-            else:
-                videos = Video.objects.filter(is_analyzed=True)
-            
-            results = []
-            for video in videos:
-                frames = Frame.objects.filter(video=video)
-                
-                for frame in frames:
-                    ocr_data = frame.comprehensive_features.get('ocr_text', {})
-                    if 'full_text' in ocr_data and search_text.lower() in ocr_data['full_text'].lower():
-                        results.append({
-                            'video_id': video.id,
-                            'video_name': video.original_name,
-                            'frame_id': frame.image_id,
-                            'timestamp': frame.timestamp,
-                            'extracted_text': ocr_data['full_text'],
-                            'text_details': ocr_data.get('texts', []),
-                            'caption': frame.final_caption or frame.caption
-                        })
+            # OCR/캡션 n-gram 역색인에서 조회 (source: ocr 기본, caption, all)
+            page, page_size = _parse_search_pagination(request)
+            source = request.GET.get('source', 'ocr')
+            if source not in ('ocr', 'caption', 'all'):
+                source = 'ocr'
+            results, total_matches = search_frame_texts(
+                search_text, video_id=video_id, source=source,
+                offset=(page - 1) * page_size, limit=page_size
+            )
             
             return Response({
                 'search_query': search_text,
-                'results': results[:50],
-                'total_matches': len(results)
+                'results': results,
+                'total_matches': total_matches,
+                'page': page,
+                'page_size': page_size,
+                'has_next': page * page_size < total_matches
             })
             
         except Exception as e:
@@ -8210,38 +8297,37 @@ class IntraVideoTrackingView(APIView):
         tracking_results = []
         
         try:
-            # Frame 모델에서 해당 비디오의 프레임들 가져오기
-            frames_query = Frame.objects.filter(video=video).order_by('timestamp')
-            
-            # 시간 범위 필터링
+            # 객체 역색인에서 대상 클래스/시간 범위의 객체만 프레임별로 가져오기
+            start_time = end_time = None
             if time_range.get('start') and time_range.get('end'):
                 start_time = self._parse_time_to_seconds(time_range['start'])
                 end_time = self._parse_time_to_seconds(time_range['end'])
-                frames_query = frames_query.filter(timestamp__gte=start_time, timestamp__lte=end_time)
                 logger.info(f"⏰ 시간 필터링: {start_time}s ~ {end_time}s")
             
-            frames = list(frames_query)
-            logger.info(f"📊 분석할 프레임 수: {len(frames)}개")
+            indexed_frames = get_video_object_postings(
+                video, target_analysis.get('object_type'), start_time, end_time
+            )
+            logger.info(f"📊 분석할 프레임 수: {len(indexed_frames)}개")
             
-            if not frames:
+            if not indexed_frames:
                 logger.warning("⚠️ 분석할 프레임이 없습니다.")
                 return []
             
-            for frame in frames:
+            for frame_id, (timestamp, objects) in indexed_frames.items():
                 try:
-                    matches = self._find_matching_objects(frame, target_analysis)
+                    matches = self._match_objects(objects, frame_id, target_analysis)
                     for match in matches:
                         tracking_results.append({
-                            'frame_id': frame.image_id,
-                            'timestamp': frame.timestamp,
+                            'frame_id': frame_id,
+                            'timestamp': timestamp,
                             'confidence': match['confidence'],
                             'bbox': match['bbox'],
                             'description': match['description'],
-                            'tracking_id': match.get('tracking_id', f"obj_{frame.image_id}"),
+                            'tracking_id': match.get('tracking_id', f"obj_{frame_id}"),
                             'match_reasons': match['match_reasons']
                         })
                 except Exception as frame_error:
-                    logger.warning(f"⚠️ 프레임 {frame.image_id} 처리 실패: {frame_error}")
+                    logger.warning(f"⚠️ 프레임 {frame_id} 처리 실패: {frame_error}")
                     continue
             
             # 시간순 정렬
@@ -8409,9 +8495,12 @@ class IntraVideoTrackingView(APIView):
         return norm
 
     def _find_matching_objects(self, frame, target_analysis):
+        return self._match_objects(self._get_detected_objects(frame), frame.image_id, target_analysis)
+    
+    def _match_objects(self, detected_objects, image_id, target_analysis):
+        """정규화된 객체 목록에서 추적 대상과 일치하는 객체 선별 (Frame 행/객체 역색인 공용)"""
         matches = []
         try:
-            detected_objects = self._get_detected_objects(frame)
             if not detected_objects:
                 return matches
                 
@@ -8476,7 +8565,7 @@ class IntraVideoTrackingView(APIView):
                         'bbox': obj['bbox'],
                         'description': self._generate_match_description(obj, target_analysis),
                         'match_reasons': match_reasons,
-                        'tracking_id': obj.get('track_id') or f"obj_{frame.image_id}",
+                        'tracking_id': obj.get('track_id') or f"obj_{image_id}",
                     })
             return matches
         except Exception as e:
@@ -8577,75 +8666,57 @@ class TimeBasedAnalysisView(APIView):
             return Response({'error': str(e)}, status=500)
     
     def _perform_time_based_analysis(self, video, start_time, end_time, analysis_type):
-        """시간대별 분석 수행"""
+        """시간대별 분석 수행 - 분석 시 만든 구간 집계(chat/rollups.py)의 합으로 계산"""
         
-        # 해당 시간대 프레임들 가져오기
-        frames = Frame.objects.filter(
-            video=video,
-            timestamp__gte=start_time,
-            timestamp__lte=end_time
-        ).order_by('timestamp')
-        
-        frame_list = list(frames)
-        logger.info(f"📊 분석 대상 프레임: {len(frame_list)}개")
+        summary = summarize_range(video, start_time, end_time)
+        logger.info(f"📊 분석 대상 프레임: {summary['frame_count']}개")
         
         if '성비' in analysis_type or '사람' in analysis_type:
-            return self._analyze_gender_distribution(frame_list, start_time, end_time)
+            return self._analyze_gender_distribution(video, summary, start_time, end_time)
         elif '차량' in analysis_type or '교통' in analysis_type:
-            return self._analyze_vehicle_distribution(frame_list, start_time, end_time)
+            return self._analyze_vehicle_distribution(summary, start_time, end_time)
         else:
-            return self._analyze_general_statistics(frame_list, start_time, end_time)
+            return self._analyze_general_statistics(summary, start_time, end_time)
     
-    def _analyze_gender_distribution(self, frames, start_time, end_time):
+    def _analyze_gender_distribution(self, video, summary, start_time, end_time):
         """성비 분석"""
-        person_detections = []
-        
-        for frame in frames:
-            if not hasattr(frame, 'detected_objects') or not frame.detected_objects:
-                continue
-                
-            for obj in frame.detected_objects:
-                if obj.get('class') == 'person':
-                    person_detections.append({
-                        'timestamp': frame.timestamp,
-                        'confidence': obj.get('confidence', 0.5),
-                        'bbox': obj.get('bbox', []),
-                        'colors': obj.get('colors', []),
-                        'color_description': obj.get('color_description', '')
-                    })
+        person_total = summary['person_count']
         
         # 성별 추정 (간단한 휴리스틱 - 실제로는 더 정교한 AI 모델 필요)
         male_count = 0
         female_count = 0
+        undecided_count = 0
         
-        for detection in person_detections:
+        for color_description, count in summary['person_color_counts'].items():
             # 색상 기반 간단한 성별 추정
-            colors = detection['color_description'].lower()
+            colors = color_description.lower()
             if 'blue' in colors or 'black' in colors or 'gray' in colors:
-                male_count += 1
+                male_count += count
             elif 'pink' in colors or 'red' in colors:
-                female_count += 1
+                female_count += count
             else:
-                # 50:50으로 분배
-                if len(person_detections) % 2 == 0:
-                    male_count += 1
-                else:
-                    female_count += 1
+                undecided_count += count
+        
+        # 50:50으로 분배
+        if person_total % 2 == 0:
+            male_count += undecided_count
+        else:
+            female_count += undecided_count
         
         total_persons = male_count + female_count
         
         # 의상 색상 분포
-        clothing_colors = {}
-        for detection in person_detections:
-            color = detection['color_description']
-            if color and color != 'unknown':
-                clothing_colors[color] = clothing_colors.get(color, 0) + 1
-        
-        # 피크 시간대 분석
-        time_distribution = {}
-        for detection in person_detections:
-            time_bucket = int(detection['timestamp'] // 30) * 30  # 30초 단위
-            time_distribution[time_bucket] = time_distribution.get(time_bucket, 0) + 1
+        clothing_colors = {
+            color: count for color, count in summary['person_color_counts'].items()
+            if color and color != 'unknown'
+        }
+        
+        # 피크 시간대 분석 (30초 구간 집계)
+        time_distribution = {
+            bucket_start: row.person_count
+            for bucket_start, row in bucket_series(video, 30, start_time, end_time)
+            if row.person_count
+        }
         
         peak_times = sorted(time_distribution.items(), key=lambda x: x[1], reverse=True)[:2]
         peak_time_strings = [f"{self._seconds_to_time_string(t[0])}-{self._seconds_to_time_string(t[0]+30)}" 
@@ -8665,53 +8736,34 @@ class TimeBasedAnalysisView(APIView):
             'analysis_period': f"{self._seconds_to_time_string(start_time)} - {self._seconds_to_time_string(end_time)}"
         }
     
-    def _analyze_vehicle_distribution(self, frames, start_time, end_time):
+    def _analyze_vehicle_distribution(self, summary, start_time, end_time):
         """차량 분포 분석"""
-        vehicles = []
-        
-        for frame in frames:
-            if not hasattr(frame, 'detected_objects') or not frame.detected_objects:
-                continue
-                
-            for obj in frame.detected_objects:
-                if obj.get('class') in ['car', 'truck', 'bus', 'motorcycle']:
-                    vehicles.append({
-                        'type': obj.get('class'),
-                        'timestamp': frame.timestamp,
-                        'confidence': obj.get('confidence', 0.5)
-                    })
-        
-        vehicle_types = {}
-        for v in vehicles:
-            vehicle_types[v['type']] = vehicle_types.get(v['type'], 0) + 1
+        vehicle_types = {
+            vehicle_type: summary['class_counts'][vehicle_type]
+            for vehicle_type in ['car', 'truck', 'bus', 'motorcycle']
+            if summary['class_counts'][vehicle_type]
+        }
+        total_vehicles = sum(vehicle_types.values())
         
         duration_minutes = (end_time - start_time) / 60
         
         return {
-            'total_vehicles': len(vehicles),
+            'total_vehicles': total_vehicles,
             'vehicle_types': vehicle_types,
-            'average_per_minute': round(len(vehicles) / max(1, duration_minutes), 1),
+            'average_per_minute': round(total_vehicles / max(1, duration_minutes), 1),
             'analysis_period': f"{self._seconds_to_time_string(start_time)} - {self._seconds_to_time_string(end_time)}"
         }
     
-    def _analyze_general_statistics(self, frames, start_time, end_time):
+    def _analyze_general_statistics(self, summary, start_time, end_time):
         """일반 통계 분석"""
-        all_objects = []
-        
-        for frame in frames:
-            if hasattr(frame, 'detected_objects') and frame.detected_objects:
-                all_objects.extend(frame.detected_objects)
-        
-        object_counts = {}
-        for obj in all_objects:
-            obj_class = obj.get('class', 'unknown')
-            object_counts[obj_class] = object_counts.get(obj_class, 0) + 1
+        total_objects = summary['object_count']
+        frames_analyzed = summary['frame_count']
         
         return {
-            'total_objects': len(all_objects),
-            'object_distribution': dict(sorted(object_counts.items(), key=lambda x: x[1], reverse=True)),
-            'frames_analyzed': len(frames),
-            'average_objects_per_frame': round(len(all_objects) / max(1, len(frames)), 1),
+            'total_objects': total_objects,
+            'object_distribution': dict(summary['class_counts'].most_common()),
+            'frames_analyzed': frames_analyzed,
+            'average_objects_per_frame': round(total_objects / max(1, frames_analyzed), 1),
             'analysis_period': f"{self._seconds_to_time_string(start_time)} - {self._seconds_to_time_string(end_time)}"
         }
     
@@ -9543,6 +9595,7 @@ class ResetVideoAnalysisView(APIView):
             video.image_analysis_date = None
             
             # JSON 파일 삭제
+            get_analysis_cache().invalidate(video.chat_analysis_json_path)
             if video.chat_analysis_json_path and os.path.exists(video.chat_analysis_json_path):
                 try:
                     os.remove(video.chat_analysis_json_path)
@@ -9565,7 +9618,7 @@ class ResetVideoAnalysisView(APIView):
                 stats = analysis.analysis_statistics
                 stats.pop('image_analysis_completed', None)
                 stats.pop('image_analysis_date', None)
-                stats.pop('json_file_path', None)
+                get_analysis_cache().invalidate(stats.pop('json_file_path', None))
                 analysis.analysis_statistics = stats
                 analysis.save()
             
@@ -9732,7 +9785,7 @@ class CostEffectiveVideoChatView(APIView):
         self.video_analyzer = get_video_analyzer()
         self.llm_client = LLMClient()
         self.multi_llm_analyzer = get_multi_llm_analyzer()
-        self.rag_system = get_video_rag_system()
+        self.rag_system = model_registry.get_rag_system()
     
     def post(self, request):
         try:
@@ -10069,9 +10122,8 @@ class CostEfficientChatView(APIView):
                     }
                 }
             
-            # JSON 파일 로드
-            with open(video.chat_analysis_json_path, 'r', encoding='utf-8') as f:
-                analysis_data = json.load(f)
+            # 분석 결과 (프로세스 캐시 - 파일이 바뀌지 않았으면 다시 파싱하지 않음, 공유 객체이므로 수정 금지)
+            analysis_data = get_analysis_cache().get(video.chat_analysis_json_path).results
             
             # 저장된 분석 결과 활용
             if analysis_data.get('analysis_type') == 'multi_llm_image_analysis':
@@ -10346,9 +10398,8 @@ class DownloadAnalysisResultView(APIView):
                     'error': 'JSON 파일을 찾을 수 없습니다.'
                 }, status=status.HTTP_404_NOT_FOUND)
             
-            # JSON 파일 읽기
-            with open(json_file_path, 'r', encoding='utf-8') as f:
-                json_data = json.load(f)
+            # 분석 결과 파일 읽기 (컬럼형 .npz 또는 이전 .json) - 다운로드는 기존과 같은 JSON 구조
+            json_data = load_analysis_results(json_file_path)
             
             # HTTP 응답으로 JSON 반환
             response = HttpResponse(
@@ -10420,12 +10471,24 @@ class RestartAnalysisView(APIView):
                     'current_status': video.analysis_status
                 }, status=status.HTTP_400_BAD_REQUEST)
             
+            # 이전 분석 결과 파일의 채팅 캐시 제거
+            get_analysis_cache().invalidate(
+                video.chat_analysis_json_path,
+                *[stats.get('json_file_path') for stats in
+                  VideoAnalysis.objects.filter(video=video).values_list('analysis_statistics', flat=True)
+                  if isinstance(stats, dict)]
+            )
+            
             # 기존 분석 결과 삭제 (선택사항)
             cleanup = request.data.get('cleanup_previous', False)
             if cleanup:
                 VideoAnalysis.objects.filter(video=video).delete()
                 Frame.objects.filter(video=video).delete()
                 Scene.objects.filter(video=video).delete()
+                # 역색인도 제거 (남아 있으면 검색이 이전 결과를 계속 사용)
+                clear_video_index(video)
+                # 구간 집계도 제거 (ensure_rollups는 존재 여부만 확인하므로 남아 있으면 이전 통계 사용)
+                clear_video_rollups(video)
             
             # 분석 상태 초기화
             video.analysis_status = 'pending'
@@ -10928,8 +10991,7 @@ class EnhancedVideoChatView(APIView):
         """서비스 안전 초기화 - LLM 클라이언트 개선"""
         if self.llm_client is None:
             try:
-                from .llm_client import get_llm_client
-                self.llm_client = get_llm_client()
+                self.llm_client = model_registry.get_llm_client()
                 if self.llm_client.is_available():
                     print("LLM 클라이언트 초기화 완료")
                 else:
@@ -10942,21 +11004,48 @@ class EnhancedVideoChatView(APIView):
 
         if self.video_analyzer is None:
             try:
-                from .video_analyzer import get_video_analyzer
-                self.video_analyzer = get_video_analyzer()
+                self.video_analyzer = model_registry.get_video_analyzer()
                 print("비디오 분석기 초기화 완료")
             except Exception as e:
                 print(f"비디오 분석기 초기화 실패: {e}")
 
     # ---------- 공용 유틸 ----------
-    def _frame_urls(self, request, video_id, frame_number):
-        """프레임 정규 이미지 & 박스이미지 URL"""
+    def _frame_urls(self, request, video_id, frame_number, with_bbox=True):
+        """프레임 정규 이미지 & 박스이미지 URL (박스 이미지는 Frame 행이 있는 프레임만)"""
         base = request.build_absolute_uri
         return {
             'image': base(reverse('frame_normal', args=[video_id, frame_number])),
-            'image_bbox': base(reverse('frame_with_bbox', args=[video_id, frame_number])),
+            'image_bbox': base(reverse('frame_with_bbox', args=[video_id, frame_number])) if with_bbox else None,
         }
 
+    def _chat_frames(self, video, start_time=None, end_time=None):
+        """채팅 검색용 프레임 (시간순)
+
+        분석 결과 파일이 있으면 분석 캐시의 샘플링된 모든 프레임을 시간 인덱스(frames_between)로 잘라 쓰고,
+        없으면 Frame 행을 읽습니다. 캐시 프레임은 Frame 행과 같은 속성 이름으로 감싸며,
+        Frame 행이 없는 프레임은 has_frame_row=False (박스 이미지 없음)입니다.
+        """
+        cached = cached_video_analysis(video)
+        if cached is None:
+            frames_qs = Frame.objects.filter(video=video).order_by('timestamp')
+            if start_time is not None and end_time is not None:
+                frames_qs = frames_qs.filter(timestamp__gte=start_time, timestamp__lte=end_time)
+            return frames_qs
+
+        stored_ids = set(Frame.objects.filter(video=video).values_list('image_id', flat=True))
+        return [
+            SimpleNamespace(
+                image_id=frame_data.get('image_id', 0),
+                timestamp=frame_data.get('timestamp', 0),
+                detected_objects=frame_data.get('objects') or [],
+                caption=frame_data.get('caption', ''),
+                enhanced_caption=frame_data.get('enhanced_caption', ''),
+                final_caption=frame_data.get('final_caption', ''),
+                has_frame_row=frame_data.get('image_id') in stored_ids,
+            )
+            for frame_data in cached.frames_between(start_time, end_time)
+        ]
+
     def _clip_url(self, request, video_id, timestamp, duration=4):
         """프리뷰 클립 URL"""
         url = reverse('clip_preview', args=[video_id, int(timestamp)])
@@ -11436,12 +11525,13 @@ class EnhancedVideoChatView(APIView):
         objects = set(slots.get('objects') or ['person'])  # 기본 사람
         tr = slots.get('time_range')
 
-        frames_qs = Frame.objects.filter(video=video).order_by('timestamp')
         if tr and tr.get('start') is not None and tr.get('end') is not None:
-            frames_qs = frames_qs.filter(timestamp__gte=tr['start'], timestamp__lte=tr['end'])
+            frames = self._chat_frames(video, tr['start'], tr['end'])
+        else:
+            frames = self._chat_frames(video)
 
         hits = []
-        for f in frames_qs:
+        for f in frames:
             dets = self._get_detected_objects(f)
             if not dets: continue
             for d in dets:
@@ -11472,6 +11562,7 @@ class EnhancedVideoChatView(APIView):
                         't': float(f.timestamp),
                         'time': self._format_time(f.timestamp),
                         'frame_id': f.image_id,
+                        'has_frame_row': getattr(f, 'has_frame_row', True),
                         'desc': f"{d.get('color_description','')} {d.get('class','object')}".strip(),
                         'score': min(1.0, (score + d.get('confidence', 0.5) * 0.2)),
                         'reasons': reasons,
@@ -11488,7 +11579,7 @@ class EnhancedVideoChatView(APIView):
             key = (int(h['t']), h['desc'])
             if key in seen: continue
             seen.add(key)
-            media = self._frame_urls(request, video.id, h['frame_id']) if request else {}
+            media = self._frame_urls(request, video.id, h['frame_id'], h['has_frame_row']) if request else {}
             clip = self._clip_url(request, video.id, h['t']) if request else None
             uniq.append({
                 'time': h['time'],
@@ -11511,7 +11602,7 @@ class EnhancedVideoChatView(APIView):
         """특정 객체/키워드 등장 여부 간단 확인 + 썸네일"""
         objs = slots.get('objects') or []
         q = raw_text.lower()
-        frames = Frame.objects.filter(video=video).order_by('timestamp')[:100]
+        frames = self._chat_frames(video)[:100]
         hits = []
         for f in frames:
             cap = (f.final_caption or f.enhanced_caption or f.caption or '').lower()
@@ -11527,7 +11618,7 @@ class EnhancedVideoChatView(APIView):
                     ok, reason = True, "키워드 매칭"
 
             if ok:
-                media = self._frame_urls(request, video.id, f.image_id)
+                media = self._frame_urls(request, video.id, f.image_id, getattr(f, 'has_frame_row', True))
                 clip = self._clip_url(request, video.id, f.timestamp)
                 hits.append({
                     'time': self._format_time(f.timestamp),
@@ -11611,14 +11702,26 @@ class EnhancedVideoChatView(APIView):
     def _handle_info(self, video: Video):
         sc = Scene.objects.filter(video=video).count()
         fc = Frame.objects.filter(video=video).count()
-        return "\n".join([
+        lines = [
             "비디오 정보",
             f"- 파일명: {video.original_name}",
             f"- 길이: {round(video.duration,2)}초",
             f"- 분석 상태: {video.analysis_status}",
             f"- 씬 수: {sc}개",
             f"- 분석 프레임: {fc}개",
-        ])
+        ]
+
+        # 분석 결과 파일이 있으면 캐시된 객체/사람 트랙 뷰로 전체 샘플링 프레임 통계 추가
+        cached = cached_video_analysis(video)
+        if cached is not None:
+            top_objects = cached.object_counts.most_common(5)
+            if top_objects:
+                lines.append("- 주요 객체: " + ", ".join(
+                    f"{object_class} {count}회 ({len(cached.frames_with_class(object_class))}프레임)"
+                    for object_class, count in top_objects
+                ))
+            lines.append(f"- 추적된 사람: {len(cached.person_tracks)}명 (샘플링 프레임 {len(cached.frame_results)}개 기준)")
+        return "\n".join(lines)
 
 
     def _enhance_person_detection_with_gender(self, frame_data):
@@ -11757,64 +11860,21 @@ class EnhancedVideoChatView(APIView):
         """여러 영상 중 조건에 맞는 후보 명시 (여기선 설명만)"""
         return "여러 영상 간 조건 검색은 준비되어 있습니다. UI에서 목록/필터를 제공해 주세요."
     def _handle_gender_distribution(self, video: Video, slots: dict):
-        """성별 분포 분석 - 개선된 버전"""
+        """성별 분포 분석 - 분석 시 만든 구간 집계(chat/rollups.py)의 합으로 계산
+        
+        성별은 집계 시 rollups.person_gender로 분류됨: 모델 추정(gender/sex, person_attributes) 우선,
+        없으면 색상/의복 기반 휴리스틱 추정 (정확도 낮음, 참고용)
+        """
         tr = slots.get('time_range')
-        qs = Frame.objects.filter(video=video)
         if tr and tr.get('start') is not None and tr.get('end') is not None:
-            qs = qs.filter(timestamp__gte=tr['start'], timestamp__lte=tr['end'])
+            summary = summarize_range(video, tr['start'], tr['end'])
+        else:
+            summary = summarize_range(video)
 
-        male = female = unknown = 0
-        person_detections = []
-        
-        for f in qs:
-            detected_objects = self._get_detected_objects(f)
-            for d in detected_objects:
-                if d['class'] != 'person': 
-                    continue
-                
-                person_detections.append(d)
-                
-                # 성별 정보 추출 - 여러 방법 시도
-                gender = None
-                
-                # 1. 직접적인 gender 필드
-                if 'gender' in d and d['gender'] and d['gender'] != 'unknown':
-                    gender = str(d['gender']).lower()
-                
-                # 2. 원본 데이터에서 성별 정보 찾기
-                elif '_raw' in d and d['_raw']:
-                    raw = d['_raw']
-                    for key in ['gender', 'sex', 'male', 'female']:
-                        if key in raw and raw[key]:
-                            val = str(raw[key]).lower()
-                            if val in ['male', 'man', 'm', 'true'] and key in ['male', 'gender']:
-                                gender = 'male'
-                                break
-                            elif val in ['female', 'woman', 'f', 'true'] and key in ['female', 'gender']:
-                                gender = 'female'  
-                                break
-                            elif val in ['male', 'female']:
-                                gender = val
-                                break
-                
-                # 3. 색상/의복 기반 휴리스틱 추정 (보조적)
-                if not gender:
-                    color_desc = d.get('color_description', '').lower()
-                    colors = [str(c).lower() for c in d.get('colors', [])]
-                    
-                    # 간단한 휴리스틱 (정확도 낮음, 참고용)
-                    if any('pink' in x for x in [color_desc] + colors):
-                        gender = 'female_guess'
-                    elif any('blue' in x for x in [color_desc] + colors):
-                        gender = 'male_guess'
-                
-                # 카운팅
-                if gender in ['male', 'male_guess']:
-                    male += 1
-                elif gender in ['female', 'female_guess']:
-                    female += 1
-                else:
-                    unknown += 1
+        gender_counts = summary['gender_counts']
+        male = gender_counts['male'] + gender_counts['male_guess']
+        female = gender_counts['female'] + gender_counts['female_guess']
+        unknown = summary['person_count'] - male - female
 
         total = male + female + unknown
         
@@ -11839,12 +11899,10 @@ class EnhancedVideoChatView(APIView):
         
         # 디버깅 정보 (개발 시에만 표시)
         result += f"🔍 디버그 정보:\n"
-        result += f"- 처리된 프레임 수: {qs.count()}개\n"
-        result += f"- 감지된 person 객체: {len(person_detections)}개\n"
-        
-        if person_detections:
-            sample_detection = person_detections[0]
-            result += f"- 샘플 객체 정보: {sample_detection.get('gender', 'N/A')} (신뢰도: {sample_detection.get('gender_confidence', 0)})\n"
+        result += f"- 처리된 프레임 수: {summary['frame_count']}개\n"
+        result += f"- 감지된 person 객체: {summary['person_count']}개\n"
+        result += f"- 모델 추정: 남성 {gender_counts['male']}, 여성 {gender_counts['female']} / "
+        result += f"색상 추정: 남성 {gender_counts['male_guess']}, 여성 {gender_counts['female_guess']}\n"
         
         # 시간 범위 정보
         if tr:
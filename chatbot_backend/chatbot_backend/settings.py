@@ -385,6 +385,12 @@ VIDEO_FOLDER = os.path.join(MEDIA_ROOT, 'videos')
 UPLOAD_FOLDER = os.path.join(MEDIA_ROOT, 'uploads')  
 IMAGE_FOLDER = os.path.join(MEDIA_ROOT, 'images')
 
+# 분석 결과 일괄 저장(bulk_create) 배치 크기
+ANALYSIS_DB_BATCH_SIZE = 500
+
+# 서버 시작 시 미리 로드할 모델 레지스트리 컴포넌트 (쉼표 구분, 예: similarity_analyzer,ai_workflow)
+MODEL_REGISTRY_WARMUP = [name.strip() for name in os.getenv('MODEL_REGISTRY_WARMUP', '').split(',') if name.strip()]
+
 # 폴더가 없으면 생성
 os.makedirs(VIDEO_FOLDER, exist_ok=True)
 os.makedirs(UPLOAD_FOLDER, exist_ok=True)